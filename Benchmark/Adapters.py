@@ -0,0 +1,868 @@
+"""
+Backend adapters shared by every benchmark harness
+Each adapter wraps one engine behind the same small interface, so one
+workload runs the same logical operations everywhere:
+
+  connect()                       open this adapter's own connection
+  bulk_load(dataset, rows)        load employee tuples (COLUMNS order)
+  point_update(dataset, key)      update one row (by employeeid, or the
+                                  first Finance row when key is None)
+  range_read(dataset, start, n)   n rows (from employeeid >= start)
+  filtered_query(dataset, dept)   up to 50 rows of one department
+  insert_batch(dataset, rows)     insert a list of employee tuples at once;
+                                  method picks one of INSERT_METHODS and
+                                  transaction=True wraps it in BEGIN/COMMIT
+  fetch_columns(dataset, ...)     the rows range_read / filtered_query
+                                  return, as one NumPy array per column
+                                  (see Columnar.py)
+  stream_rows(dataset, fetch_size)
+                                  iterate over the whole table, fetch_size
+                                  rows per round trip (server-side cursor);
+                                  fetch_size=None materializes everything
+                                  client-side first, like fetchall()
+  increment_keys(dataset, keys)   one transaction that reads traininghours
+                                  of each key and writes it back + 1;
+                                  is_retryable(error) says whether a failed
+                                  attempt may simply be run again
+  index_employeeid(dataset)       add an index on employeeid unless it is
+                                  the key already, so keyed operations do
+                                  not scan the table (kept afterwards)
+  cleanup(dataset)                delete the rows the benchmarks wrote
+  create_table(dataset)           (re)create the table / collection with
+                                  the dataset's 'key' strategy, one of
+                                  KEY_STRATEGIES (first one is the default)
+  drop_table(dataset)
+  range_count(dataset)            ranges / chunks holding the data, or None
+  close()
+
+The drivers are imported in connect(), so a machine with only one driver
+installed can still benchmark that engine, and the SQLite adapter needs
+nothing outside the standard library for offline runs.
+"""
+
+import io
+import os
+import re
+import sqlite3
+import sys
+import threading
+import uuid
+
+COCKROACH_URL = "postgresql://root@localhost:26257/latencyscalabilitytest?sslmode=disable"
+MONGO_URL = "mongodb://localhost:27017/"
+MONGO_DATABASE = "LatencyScalabilityTest"
+SQLITE_URL = "file:latencyscalabilitytest?mode=memory&cache=shared"
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Datasets')
+
+# Typed single-pass CSV reading shared with the importers
+sys.path.insert(0, DATASET_DIR)
+from CsvLoader import copy_buffer, iter_rows  # noqa: E402
+
+# Rows written by the benchmarks start here, so cleanup can find them; well
+# above the employeeids of any generated dataset (GenerateDataset.py)
+TEST_ID_BASE = 1_000_000_000
+
+# The same three datasets under their table / collection names and source files
+# (employeeids run from 1 to rows)
+DATASETS = [
+    {"data_size": "10K", "table": "dbms", "collection": "DBMS",
+     "file": "employee_performance_10000.csv", "rows": 10000},
+    {"data_size": "100K", "table": "dbms01", "collection": "DBMS01",
+     "file": "employee_performance_100000__1_.csv", "rows": 100000},
+    {"data_size": "500K", "table": "dbms02", "collection": "DBMS02",
+     "file": "employee_performance_500000.csv", "rows": 500000},
+]
+
+COLUMNS = [
+    'employeeid', 'age', 'department', 'yearsexperience',
+    'performancescore', 'monthlysalary', 'traininghours', 'promotionlast5years'
+]
+
+# MongoDB field names, in the same order as COLUMNS
+FIELDS = [
+    'EmployeeID', 'Age', 'Department', 'YearsExperience',
+    'PerformanceScore', 'MonthlySalary', 'TrainingHours', 'PromotionLast5Years'
+]
+
+# Short operation names used on the command line -> adapter methods
+OPERATIONS = {
+    'update': 'point_update',
+    'read': 'range_read',
+    'query': 'filtered_query',
+    'write': 'insert_batch',
+}
+
+# Each worker writes its rows into its own id range
+WORKER_ID_SPAN = 10_000_000
+
+# Largest number of connections a process-wide CockroachDB pool will open
+POOL_MAX_CONNECTIONS = 1024
+
+# PostgreSQL-protocol limit on parameters in one prepared statement
+MAX_PREPARED_PARAMETERS = 65535
+
+# Commits of a MongoDB transaction whose outcome is unknown are retried
+# this many times before increment_keys gives up
+MONGO_COMMIT_ATTEMPTS = 3
+
+# Filter / update documents reused by MongoAdapter(prepared=True)
+FINANCE_FILTER = {"Department": "Finance"}
+TRAINING_UPDATE = {"$set": {"TrainingHours": 5}}
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def cockroach_pool(url=COCKROACH_URL):
+    """Process-wide psycopg2 pool for `url`, created on first use.
+
+    Pools are keyed by process id too, so a forked worker never reuses a
+    socket its parent opened.
+    """
+    key = ('cockroachdb', os.getpid(), url)
+    with _pool_lock:
+        if key not in _pools:
+            from psycopg2.pool import ThreadedConnectionPool
+            _pools[key] = ThreadedConnectionPool(0, POOL_MAX_CONNECTIONS, url)
+        return _pools[key]
+
+
+def mongo_client(url=MONGO_URL):
+    """Process-wide MongoClient for `url`; its own pool serves every thread"""
+    key = ('mongodb', os.getpid(), url)
+    with _pool_lock:
+        if key not in _pools:
+            from pymongo import MongoClient
+            _pools[key] = MongoClient(url, maxPoolSize=POOL_MAX_CONNECTIONS)
+        return _pools[key]
+
+
+def sqlite_write_lock(url=SQLITE_URL):
+    """Process-wide lock that SQLiteAdapters on `url` hold while writing"""
+    key = ('sqlite-write', os.getpid(), url)
+    with _pool_lock:
+        if key not in _pools:
+            _pools[key] = threading.RLock()
+        return _pools[key]
+
+
+def test_rows(first_id, count=10):
+    """The fixed row the scalability tests insert, with consecutive ids"""
+    return [(first_id + i, 25, 'TestDept', 5, 3, 50000, 40, 'No') for i in range(count)]
+
+
+def read_rows(filename):
+    """Yield typed employee tuples from one of the Datasets CSV files"""
+    if not os.path.exists(filename):
+        filename = os.path.join(DATASET_DIR, os.path.basename(filename))
+    return iter_rows(filename)
+
+
+class BackendAdapter:
+    """Interface every engine implements; see the module docstring"""
+    name = "base"
+
+    # Ways insert_batch can send a batch; the first one is the default
+    INSERT_METHODS = []
+
+    # Primary key / _id layouts create_table knows; the first one is the default
+    KEY_STRATEGIES = []
+
+    def connect(self):
+        raise NotImplementedError
+
+    def bulk_load(self, dataset, rows, batch_size=10000):
+        raise NotImplementedError
+
+    def point_update(self, dataset, key=None):
+        raise NotImplementedError
+
+    def range_read(self, dataset, start=None, limit=100):
+        raise NotImplementedError
+
+    def filtered_query(self, dataset, department='Finance', limit=50):
+        raise NotImplementedError
+
+    def insert_batch(self, dataset, rows, method=None, transaction=False):
+        raise NotImplementedError
+
+    def fetch_columns(self, dataset, start=None, department=None, limit=100):
+        """Rows from employeeid >= start, or of one department, as column arrays"""
+        raise NotImplementedError
+
+    def stream_rows(self, dataset, fetch_size=None):
+        raise NotImplementedError
+
+    def increment_keys(self, dataset, keys):
+        raise NotImplementedError
+
+    @staticmethod
+    def is_retryable(error):
+        return False
+
+    def index_employeeid(self, dataset):
+        raise NotImplementedError
+
+    def cleanup(self, dataset):
+        raise NotImplementedError
+
+    def create_table(self, dataset):
+        raise NotImplementedError
+
+    def drop_table(self, dataset):
+        raise NotImplementedError
+
+    def range_count(self, dataset):
+        return None
+
+    def close(self):
+        raise NotImplementedError
+
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CockroachAdapter(BackendAdapter):
+    """CockroachDB through psycopg2.
+
+    pooled   - borrow the connection from a process-wide pool instead of
+               opening a new one, and give it back on close()
+    prepared - run each statement through PREPARE / EXECUTE, so the server
+               parses and plans it once per connection instead of per call
+    """
+    name = "CockroachDB"
+    INSERT_METHODS = ['values', 'copy']
+    # Same strategies as CockroachDB/ImportingData.py
+    KEY_STRATEGIES = ['rowid', 'employeeid', 'hash', 'uuid']
+
+    def __init__(self, url=COCKROACH_URL, pooled=True, prepared=True):
+        self.url = url
+        self.pooled = pooled
+        self.prepared = prepared
+        self.statements = set()
+
+    def connect(self):
+        import psycopg2
+        import psycopg2.extras
+        self.extras = psycopg2.extras
+        if self.pooled:
+            self.conn = cockroach_pool(self.url).getconn()
+        else:
+            self.conn = psycopg2.connect(self.url)
+        self.conn.autocommit = True
+        self.cur = self.conn.cursor()
+        if self.pooled and self.prepared:
+            # A pooled connection may still hold another adapter's statements
+            self.cur.execute("DEALLOCATE ALL")
+        return self
+
+    def _run(self, name, sql, params=()):
+        """Execute sql written with $1..$n placeholders.
+
+        With prepared=True the statement is prepared under `name` the first
+        time and EXECUTEd afterwards; otherwise it is sent as ordinary
+        parameterized SQL.
+        """
+        if not self.prepared:
+            self.cur.execute(re.sub(r'\$\d+', '%s', sql), params)
+            return
+        if name not in self.statements:
+            self.cur.execute(f"PREPARE {name} AS {sql}")
+            self.statements.add(name)
+        if params:
+            self.cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            self.cur.execute(f"EXECUTE {name}")
+
+    def _copy(self, table, rows):
+        self.cur.copy_expert(f"COPY {table} ({', '.join(COLUMNS)}) FROM STDIN WITH CSV", copy_buffer(rows))
+
+    def bulk_load(self, dataset, rows, batch_size=10000):
+        count = 0
+        for batch in _batches(rows, batch_size):
+            self._copy(dataset['table'], batch)
+            count += len(batch)
+        return count
+
+    def point_update(self, dataset, key=None):
+        table = dataset['table']
+        if key is None:
+            self._run(f"{table}_update_finance", f"""
+                UPDATE {table}
+                SET traininghours = 5
+                WHERE department = 'Finance'
+                LIMIT 1
+            """)
+        else:
+            self._run(f"{table}_update_key",
+                      f"UPDATE {table} SET traininghours = 5 WHERE employeeid = $1", (key,))
+
+    def range_read(self, dataset, start=None, limit=100):
+        table = dataset['table']
+        if start is None:
+            self._run(f"{table}_read", f"SELECT * FROM {table} LIMIT $1", (limit,))
+        else:
+            self._run(f"{table}_read_range",
+                      f"SELECT * FROM {table} WHERE employeeid >= $1 ORDER BY employeeid LIMIT $2",
+                      (start, limit))
+        return self.cur.fetchall()
+
+    def filtered_query(self, dataset, department='Finance', limit=50):
+        table = dataset['table']
+        self._run(f"{table}_query", f"SELECT * FROM {table} WHERE department = $1 LIMIT $2",
+                  (department, limit))
+        return self.cur.fetchall()
+
+    def insert_batch(self, dataset, rows, method=None, transaction=False):
+        if transaction:
+            self.cur.execute("BEGIN")
+        try:
+            if method == 'copy':
+                self._copy(dataset['table'], rows)
+            else:
+                self._insert_values(dataset['table'], rows)
+            if transaction:
+                self.cur.execute("COMMIT")
+        except Exception:
+            if transaction and not self.conn.closed:
+                self.cur.execute("ROLLBACK")
+            raise
+
+    def _insert_values(self, table, rows):
+        """One multi-row INSERT ... VALUES statement"""
+        width = len(COLUMNS)
+        if not self.prepared or len(rows) * width > MAX_PREPARED_PARAMETERS:
+            self.extras.execute_values(
+                self.cur, f"INSERT INTO {table} ({', '.join(COLUMNS)}) VALUES %s",
+                rows, page_size=len(rows)
+            )
+            return
+        placeholders = ', '.join(
+            '(' + ', '.join(f"${i * width + j + 1}" for j in range(width)) + ')'
+            for i in range(len(rows))
+        )
+        self._run(f"{table}_insert_{len(rows)}",
+                  f"INSERT INTO {table} ({', '.join(COLUMNS)}) VALUES {placeholders}",
+                  [value for row in rows for value in row])
+
+    def fetch_columns(self, dataset, start=None, department=None, limit=100):
+        from Columnar import csv_to_columns
+        sql = f"SELECT {', '.join(COLUMNS)} FROM {dataset['table']}"
+        params = []
+        if department is not None:
+            sql += " WHERE department = %s"
+            params.append(department)
+        elif start is not None:
+            sql += " WHERE employeeid >= %s ORDER BY employeeid"
+            params.append(start)
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
+        # COPY takes no parameters, so inline them client-side
+        query = self.cur.mogrify(sql, params).decode()
+        buf = io.BytesIO()
+        self.cur.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV", buf)
+        return csv_to_columns(buf.getvalue())
+
+    def stream_rows(self, dataset, fetch_size=None):
+        if fetch_size is None:
+            self.cur.execute(f"SELECT * FROM {dataset['table']}")
+            yield from self.cur.fetchall()
+            return
+        # Named (server-side) cursors only live inside a transaction
+        self.conn.autocommit = False
+        try:
+            cur = self.conn.cursor(name=f"{dataset['table']}_scan")
+            cur.itersize = fetch_size
+            cur.execute(f"SELECT * FROM {dataset['table']}")
+            yield from cur
+            cur.close()
+        finally:
+            if not self.conn.closed:
+                self.conn.rollback()
+                self.conn.autocommit = True
+
+    def increment_keys(self, dataset, keys):
+        table = dataset['table']
+        self.cur.execute("BEGIN")
+        try:
+            for key in keys:
+                self._run(f"{table}_read_training",
+                          f"SELECT traininghours FROM {table} WHERE employeeid = $1", (key,))
+                row = self.cur.fetchone()
+                if row is not None:
+                    self._run(f"{table}_set_training",
+                              f"UPDATE {table} SET traininghours = $1 WHERE employeeid = $2",
+                              (row[0] + 1, key))
+            self.cur.execute("COMMIT")
+        except Exception:
+            if not self.conn.closed:
+                self.cur.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def is_retryable(error):
+        # SQLSTATE 40001: serialization failure, the client must retry
+        return getattr(error, 'pgcode', None) == '40001'
+
+    def index_employeeid(self, dataset):
+        if dataset.get('key') in ('employeeid', 'hash'):
+            return
+        table = dataset['table']
+        self.cur.execute(f"CREATE INDEX IF NOT EXISTS {table}_employeeid_idx ON {table} (employeeid)")
+
+    def cleanup(self, dataset):
+        self.cur.execute(f"DELETE FROM {dataset['table']} WHERE employeeid >= %s", (TEST_ID_BASE,))
+
+    def create_table(self, dataset):
+        key = dataset.get('key', self.KEY_STRATEGIES[0])
+        columns = [
+            'employeeid INT', 'age INT', 'department STRING', 'yearsexperience INT',
+            'performancescore INT', 'monthlysalary INT', 'traininghours INT',
+            'promotionlast5years STRING'
+        ]
+        if key == 'employeeid':
+            columns[0] = 'employeeid INT PRIMARY KEY'
+        elif key == 'hash':
+            columns[0] = 'employeeid INT NOT NULL'
+            columns.append('PRIMARY KEY (employeeid) USING HASH')
+        elif key == 'uuid':
+            columns.insert(0, 'id UUID PRIMARY KEY DEFAULT gen_random_uuid()')
+        self.drop_table(dataset)
+        self.cur.execute(f"CREATE TABLE {dataset['table']} ({', '.join(columns)})")
+
+    def drop_table(self, dataset):
+        self.cur.execute(f"DROP TABLE IF EXISTS {dataset['table']}")
+
+    def range_count(self, dataset):
+        self.cur.execute(f"SELECT count(*) FROM [SHOW RANGES FROM TABLE {dataset['table']}]")
+        return self.cur.fetchone()[0]
+
+    def close(self):
+        self.cur.close()
+        if self.pooled:
+            cockroach_pool(self.url).putconn(self.conn, close=bool(self.conn.closed))
+        else:
+            self.conn.close()
+
+
+class MongoAdapter(BackendAdapter):
+    """MongoDB through pymongo.
+
+    pooled   - share one MongoClient (and its connection pool) per process
+               instead of creating a client per adapter
+    prepared - MongoDB has no client-side statement preparation, so this
+               caches the Collection handles and the filter / update
+               documents instead of rebuilding them on every call
+    """
+    name = "MongoDB"
+    INSERT_METHODS = ['insert_many', 'bulk_write']
+    # Same strategies as MongoDB/ImportingData.py
+    KEY_STRATEGIES = ['objectid', 'employeeid', 'hashed', 'uuid']
+
+    def __init__(self, url=MONGO_URL, pooled=True, prepared=True):
+        self.url = url
+        self.pooled = pooled
+        self.prepared = prepared
+        self.collections = {}
+
+    def connect(self):
+        if self.pooled:
+            self.client = mongo_client(self.url)
+        else:
+            from pymongo import MongoClient
+            self.client = MongoClient(self.url)
+        self.db = self.client[MONGO_DATABASE]
+        return self
+
+    def _collection(self, dataset):
+        if not self.prepared:
+            return self.db[dataset['collection']]
+        name = dataset['collection']
+        if name not in self.collections:
+            self.collections[name] = self.db[name]
+        return self.collections[name]
+
+    @staticmethod
+    def to_document(row, key=None):
+        doc = dict(zip(FIELDS, row))
+        if key in ('employeeid', 'hashed'):
+            doc['_id'] = row[0]
+        elif key == 'uuid':
+            from bson import Binary
+            doc['_id'] = Binary.from_uuid(uuid.uuid4())
+        return doc
+
+    def bulk_load(self, dataset, rows, batch_size=10000):
+        count = 0
+        for batch in _batches(rows, batch_size):
+            self._collection(dataset).insert_many(
+                [self.to_document(r, dataset.get('key')) for r in batch], ordered=False
+            )
+            count += len(batch)
+        return count
+
+    def point_update(self, dataset, key=None):
+        if key is None:
+            match = FINANCE_FILTER if self.prepared else {"Department": "Finance"}
+        else:
+            match = {"EmployeeID": key}
+        update = TRAINING_UPDATE if self.prepared else {"$set": {"TrainingHours": 5}}
+        self._collection(dataset).update_one(match, update)
+
+    def range_read(self, dataset, start=None, limit=100):
+        collection = self._collection(dataset)
+        if start is None:
+            return list(collection.find().limit(limit))
+        return list(collection.find({'EmployeeID': {'$gte': start}}).sort('EmployeeID', 1).limit(limit))
+
+    def filtered_query(self, dataset, department='Finance', limit=50):
+        if self.prepared and department == 'Finance':
+            match = FINANCE_FILTER
+        else:
+            match = {'Department': department}
+        return list(self._collection(dataset).find(match).limit(limit))
+
+    def insert_batch(self, dataset, rows, method=None, transaction=False):
+        """transaction=True needs a replica set or sharded cluster"""
+        collection = self._collection(dataset)
+        documents = [self.to_document(r, dataset.get('key')) for r in rows]
+        if not transaction:
+            self._write(collection, documents, method)
+            return
+        with self.client.start_session() as session:
+            with session.start_transaction():
+                self._write(collection, documents, method, session)
+
+    @staticmethod
+    def _write(collection, documents, method, session=None):
+        if method == 'bulk_write':
+            from pymongo import InsertOne
+            collection.bulk_write([InsertOne(d) for d in documents], session=session)
+        else:
+            collection.insert_many(documents, session=session)
+
+    def fetch_columns(self, dataset, start=None, department=None, limit=100):
+        from Columnar import bson_to_columns
+        match = {}
+        sort = None
+        if department is not None:
+            match = {'Department': department}
+        elif start is not None:
+            match = {'EmployeeID': {'$gte': start}}
+            sort = [('EmployeeID', 1)]
+        projection = {'_id': 0, **{field: 1 for field in FIELDS}}
+        # Undecoded BSON, one bytes object per server batch
+        batches = self._collection(dataset).find_raw_batches(match, projection, sort=sort,
+                                                             limit=limit or 0)
+        return bson_to_columns(batches)
+
+    def stream_rows(self, dataset, fetch_size=None):
+        collection = self._collection(dataset)
+        if fetch_size is None:
+            yield from list(collection.find())
+            return
+        yield from collection.find(batch_size=fetch_size)
+
+    @staticmethod
+    def _has_label(error, label):
+        has_label = getattr(error, 'has_error_label', None)
+        return bool(has_label) and has_label(label)
+
+    def increment_keys(self, dataset, keys):
+        """Needs a replica set or sharded cluster, like transaction=True writes.
+
+        A commit with an unknown outcome is retried on its own, as
+        with_transaction does: running the body again could increment the
+        keys twice.
+        """
+        collection = self._collection(dataset)
+        with self.client.start_session() as session:
+            session.start_transaction()
+            try:
+                for key in keys:
+                    doc = collection.find_one({'EmployeeID': key}, {'TrainingHours': 1}, session=session)
+                    if doc is not None:
+                        collection.update_one({'_id': doc['_id']},
+                                              {'$set': {'TrainingHours': doc['TrainingHours'] + 1}},
+                                              session=session)
+            except Exception:
+                session.abort_transaction()
+                raise
+            for attempt in range(1, MONGO_COMMIT_ATTEMPTS + 1):
+                try:
+                    session.commit_transaction()
+                    return
+                except Exception as e:
+                    if attempt == MONGO_COMMIT_ATTEMPTS or not self._has_label(e, 'UnknownTransactionCommitResult'):
+                        raise
+
+    @staticmethod
+    def is_retryable(error):
+        # Write conflicts carry TransientTransactionError; an unknown commit
+        # result is retried inside increment_keys instead
+        return MongoAdapter._has_label(error, 'TransientTransactionError')
+
+    def index_employeeid(self, dataset):
+        # Keyed operations filter on the EmployeeID field, even when _id holds it too
+        self._collection(dataset).create_index('EmployeeID')
+
+    def cleanup(self, dataset):
+        self._collection(dataset).delete_many({'EmployeeID': {'$gte': TEST_ID_BASE}})
+
+    def _is_mongos(self):
+        return self.client.admin.command('hello').get('msg') == 'isdbgrid'
+
+    def create_table(self, dataset):
+        """Behind a mongos the collection is sharded on _id (hashed for 'hashed')"""
+        key = dataset.get('key', self.KEY_STRATEGIES[0])
+        self.drop_table(dataset)
+        self.db.create_collection(dataset['collection'])
+        if key != 'objectid' and self._is_mongos():
+            shard_key = {'_id': 'hashed'} if key == 'hashed' else {'_id': 1}
+            self.client.admin.command('enableSharding', MONGO_DATABASE)
+            self.client.admin.command('shardCollection', f"{MONGO_DATABASE}.{dataset['collection']}",
+                                      key=shard_key)
+
+    def drop_table(self, dataset):
+        self.db.drop_collection(dataset['collection'])
+        self.collections.pop(dataset['collection'], None)
+
+    def range_count(self, dataset):
+        """Chunks of a sharded collection; None on a replica set / standalone"""
+        if not self._is_mongos():
+            return None
+        config = self.client['config']
+        namespace = f"{MONGO_DATABASE}.{dataset['collection']}"
+        entry = config['collections'].find_one({'_id': namespace})
+        if entry is None:
+            return None
+        # 5.0+ chunks reference the collection uuid, older ones the namespace
+        query = {'ns': namespace}
+        if entry.get('uuid') is not None:
+            query = {'$or': [{'uuid': entry['uuid']}, query]}
+        return config['chunks'].count_documents(query)
+
+    def close(self):
+        # The shared client stays open for the next adapter in this process
+        if not self.pooled:
+            self.client.close()
+
+
+class SQLiteAdapter(BackendAdapter):
+    """Offline stand-in: a shared in-memory SQLite database.
+
+    Every SQLiteAdapter in the process sees the same tables while at least
+    one of them is connected, so multi-worker harnesses work too. A shared
+    cache has table-level locks that fail at once instead of waiting, so
+    readers use read_uncommitted (they take no table locks) and writers in
+    the process take turns on sqlite_write_lock().
+    """
+    name = "SQLite"
+    INSERT_METHODS = ['executemany']
+    # uuid is a random 16-byte blob key
+    KEY_STRATEGIES = ['rowid', 'employeeid', 'uuid']
+
+    def __init__(self, url=SQLITE_URL, pooled=True, prepared=True):
+        # sqlite3 has no server connection to pool; prepared=False turns off
+        # its compiled statement cache instead
+        self.url = url
+        self.prepared = prepared
+        self.write_lock = sqlite_write_lock(url)
+
+    def connect(self):
+        self.conn = sqlite3.connect(self.url, uri=True, isolation_level=None,
+                                    check_same_thread=False,
+                                    cached_statements=128 if self.prepared else 0)
+        self.cur = self.conn.cursor()
+        self.cur.execute("PRAGMA read_uncommitted = true")
+        with self.write_lock:
+            for dataset in DATASETS:
+                self.cur.execute(self._table_ddl(dataset['table']))
+        return self
+
+    @staticmethod
+    def _table_ddl(table, key='rowid', exists_ok=True):
+        columns = [
+            'employeeid INTEGER', 'age INTEGER', 'department TEXT', 'yearsexperience INTEGER',
+            'performancescore INTEGER', 'monthlysalary INTEGER', 'traininghours INTEGER',
+            'promotionlast5years TEXT'
+        ]
+        if key == 'employeeid':
+            columns[0] = 'employeeid INTEGER PRIMARY KEY'
+        elif key == 'uuid':
+            columns.insert(0, 'id BLOB PRIMARY KEY DEFAULT (randomblob(16))')
+        return f"CREATE TABLE {'IF NOT EXISTS ' if exists_ok else ''}{table} ({', '.join(columns)})"
+
+    @staticmethod
+    def _insert_sql(table):
+        return f"INSERT INTO {table} ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+    def bulk_load(self, dataset, rows, batch_size=10000):
+        count = 0
+        for batch in _batches(rows, batch_size):
+            with self.write_lock:
+                self.cur.execute("BEGIN")
+                self.cur.executemany(self._insert_sql(dataset['table']), batch)
+                self.cur.execute("COMMIT")
+            count += len(batch)
+        return count
+
+    def point_update(self, dataset, key=None):
+        table = dataset['table']
+        with self.write_lock:
+            if key is None:
+                self.cur.execute(f"""
+                    UPDATE {table} SET traininghours = 5
+                    WHERE rowid = (SELECT rowid FROM {table} WHERE department = 'Finance' LIMIT 1)
+                """)
+            else:
+                self.cur.execute(f"UPDATE {table} SET traininghours = 5 WHERE employeeid = ?", (key,))
+
+    def range_read(self, dataset, start=None, limit=100):
+        if start is None:
+            self.cur.execute(f"SELECT * FROM {dataset['table']} LIMIT ?", (limit,))
+        else:
+            self.cur.execute(
+                f"SELECT * FROM {dataset['table']} WHERE employeeid >= ? ORDER BY employeeid LIMIT ?",
+                (start, limit)
+            )
+        return self.cur.fetchall()
+
+    def filtered_query(self, dataset, department='Finance', limit=50):
+        self.cur.execute(
+            f"SELECT * FROM {dataset['table']} WHERE department = ? LIMIT ?", (department, limit)
+        )
+        return self.cur.fetchall()
+
+    def insert_batch(self, dataset, rows, method=None, transaction=False):
+        with self.write_lock:
+            if not transaction:
+                self.cur.executemany(self._insert_sql(dataset['table']), rows)
+                return
+            self.cur.execute("BEGIN")
+            try:
+                self.cur.executemany(self._insert_sql(dataset['table']), rows)
+                self.cur.execute("COMMIT")
+            except Exception:
+                self.cur.execute("ROLLBACK")
+                raise
+
+    def fetch_columns(self, dataset, start=None, department=None, limit=100):
+        """sqlite3 has no bulk export, so this still goes through row tuples"""
+        from Columnar import rows_to_columns
+        sql = f"SELECT {', '.join(COLUMNS)} FROM {dataset['table']}"
+        params = []
+        if department is not None:
+            sql += " WHERE department = ?"
+            params.append(department)
+        elif start is not None:
+            sql += " WHERE employeeid >= ? ORDER BY employeeid"
+            params.append(start)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        self.cur.execute(sql, params)
+        return rows_to_columns(self.cur.fetchall())
+
+    def stream_rows(self, dataset, fetch_size=None):
+        cur = self.conn.cursor()
+        try:
+            cur.execute(f"SELECT * FROM {dataset['table']}")
+            if fetch_size is None:
+                yield from cur.fetchall()
+                return
+            while True:
+                rows = cur.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cur.close()
+
+    def increment_keys(self, dataset, keys):
+        table = dataset['table']
+        with self.write_lock:
+            self.cur.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys:
+                    self.cur.execute(f"SELECT traininghours FROM {table} WHERE employeeid = ?", (key,))
+                    row = self.cur.fetchone()
+                    if row is not None:
+                        self.cur.execute(f"UPDATE {table} SET traininghours = ? WHERE employeeid = ?",
+                                         (row[0] + 1, key))
+                self.cur.execute("COMMIT")
+            except Exception:
+                if self.conn.in_transaction:
+                    self.cur.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def is_retryable(error):
+        # Another process holds the database file's write lock
+        return isinstance(error, sqlite3.OperationalError) and 'locked' in str(error)
+
+    def index_employeeid(self, dataset):
+        # An INTEGER PRIMARY KEY employeeid is the rowid already
+        if dataset.get('key') == 'employeeid':
+            return
+        table = dataset['table']
+        with self.write_lock:
+            self.cur.execute(f"CREATE INDEX IF NOT EXISTS {table}_employeeid_idx ON {table} (employeeid)")
+
+    def cleanup(self, dataset):
+        with self.write_lock:
+            self.cur.execute(f"DELETE FROM {dataset['table']} WHERE employeeid >= ?", (TEST_ID_BASE,))
+
+    def create_table(self, dataset):
+        with self.write_lock:
+            self.drop_table(dataset)
+            self.cur.execute(self._table_ddl(dataset['table'], dataset.get('key', 'rowid'), exists_ok=False))
+
+    def drop_table(self, dataset):
+        with self.write_lock:
+            self.cur.execute(f"DROP TABLE IF EXISTS {dataset['table']}")
+
+    def close(self):
+        self.cur.close()
+        self.conn.close()
+
+
+ADAPTERS = {
+    'cockroachdb': CockroachAdapter,
+    'mongodb': MongoAdapter,
+    'sqlite': SQLiteAdapter,
+}
+
+
+def open_adapter(name, **options):
+    """Create and connect the adapter registered under `name`.
+
+    `options` go to the adapter's constructor, e.g. pooled=False.
+    """
+    return ADAPTERS[name](**options).connect()
+
+
+def make_operation(adapter, name, dataset, worker_id=0):
+    """Return a zero-argument callable running one named operation.
+
+    'write' inserts the 10-row test batch, each worker into its own id range.
+    """
+    if name == 'write':
+        next_id = [TEST_ID_BASE + worker_id * WORKER_ID_SPAN]
+
+        def write():
+            adapter.insert_batch(dataset, test_rows(next_id[0]))
+            next_id[0] += 10
+        return write
+    method = getattr(adapter, OPERATIONS[name])
+    return lambda: method(dataset)
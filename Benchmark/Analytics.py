@@ -0,0 +1,239 @@
+"""
+Server-side aggregation vs. client-side analytics
+Runs the dashboard group-bys three ways on every dataset size:
+
+  sql       GROUP BY on CockroachDB (or SQLite offline)
+  pipeline  the aggregation pipeline on MongoDB
+  numpy     vectorized NumPy over the source CSV, with the CSV parsed once
+            up front (its load time is printed separately)
+
+Aggregations:
+  salary_by_department     rows, avg MonthlySalary, avg PerformanceScore
+                           per Department
+  promotion_by_experience  rows and promotion rate per 5-year
+                           YearsExperience band
+
+Every engine's result is checked against the NumPy result before timing,
+and --plot charts p50 time vs. dataset size.
+
+Usage:
+  python Analytics.py --engines cockroachdb mongodb --plot analytics.png
+  python Analytics.py --engines sqlite --load
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from Adapters import ADAPTERS, DATASET_DIR, DATASETS, MongoAdapter, open_adapter
+from LatencyHarness import measure
+from RunBenchmark import load_dataset
+
+sys.path.insert(0, DATASET_DIR)
+from CsvLoader import COLUMNS, read_columns  # noqa: E402
+
+AGGREGATIONS = ['salary_by_department', 'promotion_by_experience']
+
+BAND_WIDTH = 5
+
+SQL = {
+    'salary_by_department': """
+        SELECT department, count(*), avg(monthlysalary), avg(performancescore)
+        FROM {table}
+        GROUP BY department
+        ORDER BY department
+    """,
+    'promotion_by_experience': """
+        SELECT {band} AS band, count(*),
+               avg(CASE WHEN promotionlast5years = 'Yes' THEN 1.0 ELSE 0.0 END)
+        FROM {table}
+        GROUP BY band
+        ORDER BY band
+    """,
+}
+
+# Integer division is // on CockroachDB and / on SQLite
+BAND_SQL = {
+    'cockroachdb': f"(yearsexperience // {BAND_WIDTH}) * {BAND_WIDTH}",
+    'sqlite': f"(yearsexperience / {BAND_WIDTH}) * {BAND_WIDTH}",
+}
+
+PIPELINES = {
+    'salary_by_department': [
+        {'$group': {'_id': '$Department', 'count': {'$sum': 1},
+                    'salary': {'$avg': '$MonthlySalary'}, 'score': {'$avg': '$PerformanceScore'}}},
+        {'$sort': {'_id': 1}},
+    ],
+    'promotion_by_experience': [
+        {'$group': {'_id': {'$multiply': [{'$floor': {'$divide': ['$YearsExperience', BAND_WIDTH]}},
+                                          BAND_WIDTH]},
+                    'count': {'$sum': 1},
+                    'rate': {'$avg': {'$cond': [{'$eq': ['$PromotionLast5Years', 'Yes']}, 1, 0]}}}},
+        {'$sort': {'_id': 1}},
+    ],
+}
+
+
+def normalise(rows):
+    """[(group, count, value, ...)] with str / int groups and float values"""
+    result = []
+    for group, count, *values in rows:
+        if isinstance(group, bytes):
+            group = group.decode()
+        elif not isinstance(group, str):
+            group = int(group)
+        result.append((group, int(count), *(float(v) for v in values)))
+    return sorted(result)
+
+
+def sql_aggregate(adapter, engine_name, dataset, name):
+    adapter.cur.execute(SQL[name].format(table=dataset['table'], band=BAND_SQL[engine_name]))
+    return normalise(adapter.cur.fetchall())
+
+
+def pipeline_aggregate(adapter, dataset, name):
+    collection = adapter.db[dataset['collection']]
+    rows = [tuple(doc.values()) for doc in collection.aggregate(PIPELINES[name])]
+    return normalise(rows)
+
+
+def numpy_aggregate(columns, name):
+    if name == 'salary_by_department':
+        groups, inverse = np.unique(columns['department'], return_inverse=True)
+        counts = np.bincount(inverse)
+        salary = np.bincount(inverse, weights=columns['monthlysalary']) / counts
+        score = np.bincount(inverse, weights=columns['performancescore']) / counts
+        rows = zip(groups.tolist(), counts.tolist(), salary.tolist(), score.tolist())
+    else:
+        bands = (columns['yearsexperience'] // BAND_WIDTH) * BAND_WIDTH
+        groups, inverse = np.unique(bands, return_inverse=True)
+        counts = np.bincount(inverse)
+        promoted = columns['promotionlast5years'] == 'Yes'
+        rate = np.bincount(inverse, weights=promoted) / counts
+        rows = zip(groups.tolist(), counts.tolist(), rate.tolist())
+    return normalise(rows)
+
+
+def make_aggregate(engine_name, adapter, dataset, name):
+    if isinstance(adapter, MongoAdapter):
+        return lambda: pipeline_aggregate(adapter, dataset, name)
+    return lambda: sql_aggregate(adapter, engine_name, dataset, name)
+
+
+def same_result(expected, actual, rel_tol=1e-9):
+    if len(expected) != len(actual):
+        return False
+    for e, a in zip(expected, actual):
+        if e[:2] != a[:2]:
+            return False
+        if not all(math.isclose(x, y, rel_tol=rel_tol, abs_tol=1e-12) for x, y in zip(e[2:], a[2:])):
+            return False
+    return True
+
+
+def load_columns(dataset):
+    """The dataset's CSV as one typed array per column, parsed like the importers do"""
+    path = os.path.join(DATASET_DIR, dataset['file'])
+    start = time.perf_counter()
+    blocks = list(read_columns(path))
+    columns = {column: np.concatenate([block[column] for block in blocks]) for column in COLUMNS}
+    print(f"  numpy: parsed {dataset['file']} in {time.perf_counter() - start:.2f}s")
+    return columns
+
+
+def run(engine_names, datasets, warmup, iterations, load=False):
+    """Return {(label, aggregation): {data_size: p50 ms}}"""
+    timings = {}
+    adapters = {name: open_adapter(name) for name in engine_names}
+    try:
+        for dataset in datasets:
+            if not os.path.exists(os.path.join(DATASET_DIR, dataset['file'])):
+                print(f"  ✗ {dataset['file']} not found, skipping {dataset['data_size']}")
+                continue
+            columns = load_columns(dataset)
+            for engine_name, adapter in adapters.items():
+                if load:
+                    load_dataset(adapter, dataset)
+
+            for name in AGGREGATIONS:
+                expected = numpy_aggregate(columns, name)
+                histogram = measure(lambda: numpy_aggregate(columns, name), warmup, iterations)
+                timings.setdefault(('NumPy', name), {})[dataset['data_size']] = histogram.percentile(50) / 1e6
+
+                for engine_name, adapter in adapters.items():
+                    aggregate = make_aggregate(engine_name, adapter, dataset, name)
+                    if not same_result(expected, aggregate()):
+                        print(f"  ✗ {adapter.name} {dataset['data_size']} {name}: result differs from NumPy")
+                    print(f"  {adapter.name} {dataset['data_size']} {name}...")
+                    histogram = measure(aggregate, warmup, iterations)
+                    timings.setdefault((adapter.name, name), {})[dataset['data_size']] = \
+                        histogram.percentile(50) / 1e6
+    finally:
+        for adapter in adapters.values():
+            adapter.close()
+    return timings
+
+
+def print_results(timings, datasets):
+    sizes = [d['data_size'] for d in datasets]
+    print(f"\n  {'aggregation':<26} {'engine':<12}" + ''.join(f"{s + ' ms':>12}" for s in sizes))
+    for name in AGGREGATIONS:
+        for (label, aggregation), by_size in timings.items():
+            if aggregation != name:
+                continue
+            print(f"  {name:<26} {label:<12}"
+                  + ''.join(f"{by_size[s]:>12.3f}" if s in by_size else f"{'-':>12}" for s in sizes))
+
+
+def plot(path, timings, datasets):
+    import matplotlib.pyplot as plt
+
+    sizes = [d['data_size'] for d in datasets]
+    rows = {d['data_size']: d['rows'] for d in datasets}
+    fig, axes = plt.subplots(1, len(AGGREGATIONS), figsize=(7 * len(AGGREGATIONS), 5), squeeze=False)
+    for ax, name in zip(axes[0], AGGREGATIONS):
+        for (label, aggregation), by_size in timings.items():
+            if aggregation != name:
+                continue
+            present = [s for s in sizes if s in by_size]
+            ax.plot([rows[s] for s in present], [by_size[s] for s in present], 'o-', label=label)
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('rows')
+        ax.set_ylabel('p50 time (ms)')
+        ax.set_title(name)
+        ax.grid(alpha=0.3, linestyle='--')
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    print(f"\nChart saved to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GROUP BY vs. aggregation pipeline vs. NumPy")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    parser.add_argument('--plot', metavar='PNG', help="save a time vs. dataset size chart")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Analytics Benchmark")
+    print("=" * 60)
+
+    timings = run(args.engines, datasets, args.warmup, args.iterations, args.load)
+    print_results(timings, datasets)
+    if args.plot:
+        plot(args.plot, timings, datasets)
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,221 @@
+"""
+asyncio benchmark engine
+Drives thousands of concurrent clients from one process with async drivers
+(asyncpg for CockroachDB, pymongo's AsyncMongoClient or motor for MongoDB)
+instead of one blocking thread per client. Each simulated client runs the same
+read / write / query / update operations as the threaded load generator and
+every operation's latency is recorded.
+
+With --compare the threaded runner from LoadGenerator.py is run at the same
+concurrency, and both are printed side by side together with the client CPU
+time spent per operation, which shows how much of the cost is the client.
+
+Install the async drivers first:
+  pip install asyncpg pymongo   (pymongo >= 4.9 ships AsyncMongoClient)
+
+Usage:
+  python AsyncRunner.py --engines cockroachdb --concurrency 100 1000 5000
+  python AsyncRunner.py --concurrency 64 256 --compare
+"""
+
+import argparse
+import asyncio
+import time
+
+from Adapters import (
+    COCKROACH_URL, COLUMNS, DATASETS, FIELDS, MONGO_DATABASE, MONGO_URL, OPERATIONS as ADAPTER_METHODS,
+    TEST_ID_BASE, WORKER_ID_SPAN, test_rows
+)
+from Histogram import LatencyHistogram
+from LoadGenerator import OPERATIONS, run_level
+
+DEFAULT_CONCURRENCY = [10, 100, 1000]
+
+# Above this many clients the threaded comparison is skipped
+MAX_THREADS = 512
+
+
+class AsyncCockroachEngine:
+    name = "CockroachDB"
+
+    async def connect(self, pool_size):
+        import asyncpg
+        self.pool = await asyncpg.create_pool(COCKROACH_URL, min_size=1, max_size=pool_size)
+
+    async def point_update(self, dataset):
+        await self.pool.execute(f"""
+            UPDATE {dataset['table']}
+            SET traininghours = 5
+            WHERE department = 'Finance'
+            LIMIT 1
+        """)
+
+    async def range_read(self, dataset):
+        return await self.pool.fetch(f"SELECT * FROM {dataset['table']} LIMIT 100")
+
+    async def insert_batch(self, dataset, rows):
+        placeholders = ', '.join(
+            '(' + ', '.join(f"${i * len(COLUMNS) + j + 1}" for j in range(len(COLUMNS))) + ')'
+            for i in range(len(rows))
+        )
+        await self.pool.execute(
+            f"INSERT INTO {dataset['table']} ({', '.join(COLUMNS)}) VALUES {placeholders}",
+            *[value for row in rows for value in row]
+        )
+
+    async def filtered_query(self, dataset):
+        return await self.pool.fetch(
+            f"SELECT * FROM {dataset['table']} WHERE department = 'Finance' LIMIT 50"
+        )
+
+    async def cleanup(self, dataset):
+        await self.pool.execute(f"DELETE FROM {dataset['table']} WHERE employeeid >= {TEST_ID_BASE}")
+
+    async def close(self):
+        await self.pool.close()
+
+
+class AsyncMongoEngine:
+    name = "MongoDB"
+
+    async def connect(self, pool_size):
+        try:
+            from pymongo import AsyncMongoClient
+        except ImportError:
+            from motor.motor_asyncio import AsyncIOMotorClient as AsyncMongoClient
+        self.client = AsyncMongoClient(MONGO_URL, maxPoolSize=pool_size)
+        self.db = self.client[MONGO_DATABASE]
+
+    async def point_update(self, dataset):
+        await self.db[dataset['collection']].update_one(
+            {"Department": "Finance"}, {"$set": {"TrainingHours": 5}}
+        )
+
+    async def range_read(self, dataset):
+        return await self.db[dataset['collection']].find().limit(100).to_list(None)
+
+    async def insert_batch(self, dataset, rows):
+        await self.db[dataset['collection']].insert_many([dict(zip(FIELDS, row)) for row in rows])
+
+    async def filtered_query(self, dataset):
+        return await self.db[dataset['collection']].find({'Department': 'Finance'}).limit(50).to_list(None)
+
+    async def cleanup(self, dataset):
+        await self.db[dataset['collection']].delete_many({'EmployeeID': {'$gte': TEST_ID_BASE}})
+
+    async def close(self):
+        result = self.client.close()
+        if asyncio.iscoroutine(result):
+            await result
+
+
+ASYNC_ENGINES = {
+    'cockroachdb': AsyncCockroachEngine,
+    'mongodb': AsyncMongoEngine,
+}
+
+
+async def run_async_level(engine_name, operation, dataset, concurrency, duration, pool_size=None):
+    """Run `concurrency` client tasks for `duration` seconds on one event loop.
+
+    Returns (ops_per_sec, errors, histogram, cpu_seconds).
+    """
+    engine = ASYNC_ENGINES[engine_name]()
+    await engine.connect(pool_size or concurrency)
+
+    histogram = LatencyHistogram()
+    errors = 0
+    clock = time.perf_counter_ns
+    deadline = 0
+
+    async def client(k):
+        nonlocal errors
+        next_id = TEST_ID_BASE + k * WORKER_ID_SPAN
+        op = getattr(engine, ADAPTER_METHODS[operation])
+        while True:
+            start = clock()
+            if start >= deadline:
+                return
+            try:
+                if operation == 'write':
+                    await op(dataset, test_rows(next_id))
+                    next_id += 10
+                else:
+                    await op(dataset)
+            except Exception:
+                errors += 1
+                continue
+            histogram.record(clock() - start)
+
+    try:
+        cpu_start = time.process_time()
+        deadline = clock() + int(duration * 1e9)
+        await asyncio.gather(*(client(k) for k in range(concurrency)))
+        cpu = time.process_time() - cpu_start
+    finally:
+        await engine.close()
+
+    return histogram.total / duration, errors, histogram, cpu
+
+
+async def async_cleanup(engine_name, dataset):
+    engine = ASYNC_ENGINES[engine_name]()
+    await engine.connect(1)
+    await engine.cleanup(dataset)
+    await engine.close()
+
+
+def run_threaded_level(engine_name, operation, dataset, concurrency, duration):
+    """The LoadGenerator.py runner, with the client CPU it used"""
+    cpu_start = time.process_time()
+    ops_per_sec, errors, histogram = run_level(engine_name, operation, dataset, concurrency, duration)
+    return ops_per_sec, errors, histogram, time.process_time() - cpu_start
+
+
+def print_row(runner, concurrency, result):
+    ops_per_sec, errors, histogram, cpu = result
+    s = histogram.summary()
+    cpu_per_op = cpu / histogram.total * 1e6 if histogram.total else 0
+    print(f"  {runner:<8} {concurrency:>7} {ops_per_sec:>11,.1f} {s['p50']:>9.3f} {s['p99']:>9.3f} "
+          f"{s['p99.9']:>9.3f} {cpu_per_op:>12.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="asyncio high-concurrency benchmark")
+    parser.add_argument('--engines', nargs='+', choices=list(ASYNC_ENGINES), default=list(ASYNC_ENGINES))
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS + ['update'], default=OPERATIONS)
+    parser.add_argument('--concurrency', nargs='+', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per level")
+    parser.add_argument('--pool-size', type=int, default=None,
+                        help="max connections (default: one per client)")
+    parser.add_argument('--compare', action='store_true',
+                        help="also run the threaded runner at each concurrency")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("asyncio Benchmark Engine")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        for dataset in datasets:
+            for operation in args.operations:
+                print(f"\n{engine_name} {dataset['data_size']} - {operation}")
+                print(f"  {'runner':<8} {'clients':>7} {'ops/sec':>11} {'p50 ms':>9} {'p99 ms':>9} "
+                      f"{'p99.9 ms':>9} {'cpu us/op':>12} {'errors':>7}")
+                for concurrency in args.concurrency:
+                    result = asyncio.run(run_async_level(
+                        engine_name, operation, dataset, concurrency, args.duration, args.pool_size
+                    ))
+                    print_row('asyncio', concurrency, result)
+                    if args.compare and concurrency <= MAX_THREADS:
+                        result = run_threaded_level(engine_name, operation, dataset,
+                                                    concurrency, args.duration)
+                        print_row('threads', concurrency, result)
+            asyncio.run(async_cleanup(engine_name, dataset))
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,325 @@
+"""
+Latency attribution: client, wire and server time
+A measured 8 ms UPDATE could be driver overhead, network or server work.
+This runs each operation like LatencyHarness.py and splits its mean
+latency into three parts from three clocks:
+
+  total       perf_counter_ns around the whole adapter call
+  round trip  time spent inside the driver waiting for the engine:
+                CockroachDB  psycopg2 cursor execute / copy_expert, timed by
+                             a cursor subclass
+                MongoDB      pymongo command monitoring (CommandListener
+                             duration of every command the call sent)
+                SQLite       sqlite3 cursor execute (in-process, no wire;
+                             rows after the first are stepped in fetchall,
+                             so they count as client time)
+  server      what the engine says it spent:
+                CockroachDB  service latency from
+                             crdb_internal.node_statement_statistics, for
+                             the statements sent under a unique
+                             application_name during the measured run
+                MongoDB      system.profile 'millis' of every operation on
+                             the collection while profiling level 2 was on
+                SQLite       the round trip itself
+
+  client = total - round trip   encode / decode, adapter and Python overhead
+  wire   = round trip - server  network, protocol framing, driver socket I/O
+  server = server
+
+The server numbers are aggregates, so the split is of the mean latency;
+the percentiles of the total are printed alongside. MongoDB's profiler
+reports whole milliseconds (sub-millisecond operations show up as 0) and
+adds a write per operation, and it is not available through mongos. Only
+the read / query rows are decoded outside the round trip, so for them
+'client' includes result decoding.
+
+Usage:
+  python Attribution.py --engines cockroachdb mongodb --datasets 500K
+  python Attribution.py --engines sqlite --load --operations update read
+"""
+
+import argparse
+import datetime
+import time
+import uuid
+
+from Adapters import ADAPTERS, DATASETS, MONGO_DATABASE, make_operation, open_adapter
+from LatencyHarness import measure
+from RunBenchmark import load_dataset
+
+OPERATIONS = ['update', 'read', 'query', 'write']
+
+# Room for every profiled operation of one run (the default is 1 MB)
+PROFILE_COLLECTION_BYTES = 256 * 2 ** 20
+
+
+class RoundTripTimer:
+    """Driver time in ns, summed over every call while active"""
+
+    def __init__(self):
+        self.active = False
+        self.ns = 0
+        self.calls = 0
+
+    def add(self, ns):
+        if self.active:
+            self.ns += ns
+            self.calls += 1
+
+    def reset(self):
+        self.ns = 0
+        self.calls = 0
+
+
+class Probe:
+    """Instruments one adapter; start() / stop() bracket the measured run.
+
+    stop() returns the server time in ns the engine reports for the run.
+    """
+
+    def __init__(self, adapter, dataset):
+        self.adapter = adapter
+        self.dataset = dataset
+        self.timer = RoundTripTimer()
+
+    def start(self):
+        self.timer.reset()
+        self.timer.active = True
+
+    def stop(self):
+        self.timer.active = False
+        return 0
+
+
+class SQLiteProbe(Probe):
+    def __init__(self, adapter, dataset):
+        super().__init__(adapter, dataset)
+        import sqlite3
+        timer = self.timer
+        clock = time.perf_counter_ns
+
+        class TimingCursor(sqlite3.Cursor):
+            def execute(self, *args):
+                start = clock()
+                try:
+                    return super().execute(*args)
+                finally:
+                    timer.add(clock() - start)
+
+            def executemany(self, *args):
+                start = clock()
+                try:
+                    return super().executemany(*args)
+                finally:
+                    timer.add(clock() - start)
+
+        adapter.cur.close()
+        adapter.cur = adapter.conn.cursor(TimingCursor)
+
+    def stop(self):
+        super().stop()
+        # In-process engine: the whole call into the library is server time
+        return self.timer.ns
+
+
+class CockroachProbe(Probe):
+    def __init__(self, adapter, dataset):
+        super().__init__(adapter, dataset)
+        import psycopg2.extensions
+        timer = self.timer
+        clock = time.perf_counter_ns
+
+        class TimingCursor(psycopg2.extensions.cursor):
+            def execute(self, *args, **kwargs):
+                start = clock()
+                try:
+                    return super().execute(*args, **kwargs)
+                finally:
+                    timer.add(clock() - start)
+
+            def copy_expert(self, *args, **kwargs):
+                start = clock()
+                try:
+                    return super().copy_expert(*args, **kwargs)
+                finally:
+                    timer.add(clock() - start)
+
+        adapter.cur.close()
+        adapter.cur = adapter.conn.cursor(cursor_factory=TimingCursor)
+        self.application_name = None
+
+    def start(self):
+        # Statement statistics are kept per application_name, so a fresh one
+        # isolates this run's statements
+        self.application_name = f"attribution_{uuid.uuid4().hex[:12]}"
+        self.adapter.cur.execute("SET application_name = %s", (self.application_name,))
+        super().start()
+
+    def stop(self):
+        super().stop()
+        # Runs under the probe's application_name too, so it is excluded below
+        self.adapter.cur.execute("RESET application_name")
+        import psycopg2
+        # Read from another connection, so the query is not counted itself
+        conn = psycopg2.connect(self.adapter.url)
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT coalesce(sum(count * service_lat_avg), 0)
+                    FROM crdb_internal.node_statement_statistics
+                    WHERE application_name = %s AND key NOT LIKE 'SET %%' AND key NOT LIKE 'RESET %%'
+                """, (self.application_name,))
+                seconds = cur.fetchone()[0]
+        finally:
+            conn.close()
+        return float(seconds) * 1e9
+
+
+def _register_mongo_listener():
+    """Register one CommandListener feeding MongoProbe.timer (idempotent)"""
+    if MongoProbe.registered:
+        return
+    from pymongo import monitoring
+    timer = MongoProbe.timer
+
+    class RoundTrips(monitoring.CommandListener):
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            timer.add(event.duration_micros * 1000)
+
+        def failed(self, event):
+            timer.add(event.duration_micros * 1000)
+
+    monitoring.register(RoundTrips())
+    MongoProbe.registered = True
+
+
+class MongoProbe(Probe):
+    """Needs a MongoClient created after the listener is registered, see open_instrumented"""
+    # pymongo listeners are process-wide, so every probe shares one timer
+    timer = RoundTripTimer()
+    registered = False
+
+    def __init__(self, adapter, dataset):
+        self.adapter = adapter
+        self.dataset = dataset
+        self.since = None
+
+    def start(self):
+        db = self.adapter.db
+        db.command('profile', 0)
+        db.drop_collection('system.profile')
+        db.create_collection('system.profile', capped=True, size=PROFILE_COLLECTION_BYTES)
+        db.command('profile', 2)
+        self.since = datetime.datetime.now(datetime.timezone.utc)
+        super().start()
+
+    def stop(self):
+        super().stop()
+        db = self.adapter.db
+        db.command('profile', 0)
+        totals = list(db['system.profile'].aggregate([
+            {'$match': {'ns': f"{MONGO_DATABASE}.{self.dataset['collection']}", 'ts': {'$gte': self.since}}},
+            {'$group': {'_id': None, 'millis': {'$sum': '$millis'}}},
+        ]))
+        return totals[0]['millis'] * 1e6 if totals else 0
+
+
+PROBES = {
+    'cockroachdb': CockroachProbe,
+    'mongodb': MongoProbe,
+    'sqlite': SQLiteProbe,
+}
+
+
+def open_instrumented(engine_name, dataset):
+    """Return (adapter, probe) on a new, unpooled connection"""
+    probe_class = PROBES[engine_name]
+    if probe_class is MongoProbe:
+        # Listeners only apply to clients created after registration
+        _register_mongo_listener()
+    adapter = open_adapter(engine_name, pooled=False)
+    return adapter, probe_class(adapter, dataset)
+
+
+def attribute(engine_name, dataset, operation, warmup, iterations):
+    """Measure one operation and split its mean latency"""
+    adapter, probe = open_instrumented(engine_name, dataset)
+    try:
+        op = make_operation(adapter, operation, dataset)
+        for _ in range(warmup):
+            op()
+        probe.start()
+        histogram = measure(op, 0, iterations)
+        server_ns = probe.stop()
+        round_trip_ns = probe.timer.ns
+        adapter.cleanup(dataset)
+    finally:
+        adapter.close()
+
+    total = histogram.sum / iterations
+    round_trip = round_trip_ns / iterations
+    server = min(server_ns / iterations, round_trip)
+    return {
+        'operation': operation,
+        'histogram': histogram,
+        'round_trips': probe.timer.calls / iterations,
+        'client': max(0.0, total - round_trip),
+        'wire': round_trip - server,
+        'server': server,
+        'total': total,
+    }
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"  {'operation':<10} {'mean ms':>9} {'client ms':>10} {'wire ms':>9} {'server ms':>10} "
+          f"{'trips/op':>9} {'p50 ms':>9} {'p99 ms':>9}  largest")
+    for r in results:
+        summary = r['histogram'].summary()
+        parts = {'client': r['client'], 'wire': r['wire'], 'server': r['server']}
+        largest = max(parts, key=parts.get)
+        share = parts[largest] / r['total'] if r['total'] else 0
+        print(f"  {r['operation']:<10} {r['total'] / 1e6:>9.3f} {r['client'] / 1e6:>10.3f} "
+              f"{r['wire'] / 1e6:>9.3f} {r['server'] / 1e6:>10.3f} {r['round_trips']:>9.1f} "
+              f"{summary['p50']:>9.3f} {summary['p99']:>9.3f}  {largest} {share:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split operation latency into client, wire and server time")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Latency Attribution")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        # Keeps a shared SQLite in-memory database alive between adapters
+        anchor = open_adapter(engine_name, pooled=False) if engine_name == 'sqlite' else None
+        for dataset in datasets:
+            if args.load:
+                loader = anchor or open_adapter(engine_name, pooled=False)
+                load_dataset(loader, dataset)
+                if loader is not anchor:
+                    loader.close()
+            results = []
+            for operation in args.operations:
+                print(f"  {engine_name} {dataset['data_size']} {operation}...")
+                results.append(attribute(engine_name, dataset, operation, args.warmup, args.iterations))
+            print_results(f"{ADAPTERS[engine_name].name} {dataset['data_size']}", results)
+        if anchor is not None:
+            anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
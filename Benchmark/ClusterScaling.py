@@ -0,0 +1,388 @@
+"""
+Local multi-node scaling test
+The other harnesses all talk to one localhost:26257 / localhost:27017 node,
+so they never exercise horizontal scaling. This one starts throwaway local
+topologies as child processes, each on its own ports and data directories:
+
+  cockroach:N       N-node insecure CockroachDB cluster (start-single-node
+                    for N=1, start --join + init otherwise)
+  mongo-replica:N   N-member MongoDB replica set
+  mongo-sharded:N   N single-member shard replica sets, a config server
+                    replica set and one mongos router per shard
+
+For every topology the datasets are reloaded (collections are sharded on a
+hashed _id behind mongos), then each operation runs closed-loop (see
+LoadGenerator.py) with --clients-per-node clients per node, spread
+round-robin over the nodes' / routers' addresses. The report shows total
+and per-node throughput and the scaling efficiency against the smallest
+topology of the same kind:
+
+  efficiency = (ops/sec per node) / (ops/sec per node of the smallest)
+
+so 100% means linear scaling. Every node runs on this one machine, which
+caps what adding nodes can gain; the numbers show coordination overhead
+rather than the capacity of a real multi-machine cluster.
+
+Needs the cockroach, mongod and mongos binaries on PATH (or --cockroach-bin,
+--mongod-bin, --mongos-bin); topologies whose binaries are missing are
+skipped.
+
+Usage:
+  python ClusterScaling.py --topologies cockroach:1 cockroach:3 cockroach:5
+  python ClusterScaling.py --topologies mongo-sharded:1 mongo-sharded:3 --datasets 100K
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from Adapters import COCKROACH_URL, DATASETS, open_adapter
+from LoadGenerator import OPERATIONS, run_level
+from RunBenchmark import load_dataset
+
+DEFAULT_TOPOLOGIES = ['cockroach:1', 'cockroach:3', 'cockroach:5',
+                      'mongo-replica:1', 'mongo-replica:3',
+                      'mongo-sharded:1', 'mongo-sharded:3']
+
+# Well clear of the default single-node ports, so a running server is left alone
+COCKROACH_BASE_PORT = 26300
+COCKROACH_HTTP_BASE_PORT = 8300
+MONGO_BASE_PORT = 27100
+
+READY_TIMEOUT = 120
+STOP_TIMEOUT = 30
+
+COCKROACH_DATABASE = urlsplit(COCKROACH_URL).path.lstrip('/')
+
+
+class LocalCluster:
+    """Server child processes under one work directory.
+
+    Subclasses start() their servers and return the adapter options clients
+    should use, one entry per address to spread them over.
+    """
+    engine = None
+    # Dataset key the tables / collections are created with
+    key = None
+
+    def __init__(self, nodes, workdir, binaries, base_port):
+        self.nodes = nodes
+        self.workdir = workdir
+        self.binaries = binaries
+        self.base_port = base_port
+        self.processes = []
+
+    def directory(self, name):
+        path = os.path.join(self.workdir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def spawn(self, name, command):
+        """Start one server, its output going to <workdir>/<name>.log"""
+        with open(os.path.join(self.workdir, f"{name}.log"), 'wb') as log:
+            self.processes.append(subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT,
+                                                   stdin=subprocess.DEVNULL))
+
+    def wait_for(self, check, what, timeout=READY_TIMEOUT):
+        """Call check() until it returns true, failing early if a server exits"""
+        deadline = time.monotonic() + timeout
+        while True:
+            for process in self.processes:
+                if process.poll() is not None:
+                    raise RuntimeError(f"{what}: {process.args[0]} exited with code "
+                                       f"{process.returncode}, see the logs in {self.workdir}")
+            try:
+                if check():
+                    return
+            except Exception:
+                if time.monotonic() >= deadline:
+                    raise
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{what}: not ready after {timeout}s")
+            time.sleep(0.5)
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self):
+        for process in reversed(self.processes):
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class CockroachCluster(LocalCluster):
+    engine = 'cockroachdb'
+
+    def ports(self):
+        return [self.base_port + i for i in range(self.nodes)]
+
+    def url(self, port, database=COCKROACH_DATABASE):
+        return f"postgresql://root@localhost:{port}/{database}?sslmode=disable"
+
+    def start(self):
+        binary = self.binaries['cockroach']
+        ports = self.ports()
+        join = ','.join(f"localhost:{port}" for port in ports)
+        for i, port in enumerate(ports):
+            store = self.directory(f"cockroach{i}")
+            command = [binary, 'start' if self.nodes > 1 else 'start-single-node', '--insecure',
+                       f"--store={store}", f"--listen-addr=localhost:{port}",
+                       f"--http-addr=localhost:{COCKROACH_HTTP_BASE_PORT + i}"]
+            if self.nodes > 1:
+                command.append(f"--join={join}")
+            self.spawn(f"cockroach{i}", command)
+
+        if self.nodes > 1:
+            def init():
+                result = subprocess.run([binary, 'init', '--insecure', f"--host=localhost:{ports[0]}"],
+                                        capture_output=True, text=True)
+                return result.returncode == 0 or 'already been initialized' in result.stderr
+            self.wait_for(init, "cockroach init")
+
+        import psycopg2
+
+        def accepts_sql(port):
+            conn = psycopg2.connect(self.url(port, 'defaultdb'), connect_timeout=2)
+            conn.close()
+            return True
+        for port in ports:
+            self.wait_for(lambda: accepts_sql(port), f"CockroachDB node on {port}")
+
+        conn = psycopg2.connect(self.url(ports[0], 'defaultdb'))
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE DATABASE IF NOT EXISTS {COCKROACH_DATABASE}")
+        conn.close()
+        return [{'url': self.url(port)} for port in ports]
+
+
+def mongod_command(binary, port, dbpath, replica_set, role=None):
+    command = [binary, '--port', str(port), '--dbpath', dbpath, '--bind_ip', 'localhost',
+               '--replSet', replica_set]
+    if role is not None:
+        command.append(f"--{role}")
+    return command
+
+
+def ping(port):
+    from pymongo import MongoClient
+    client = MongoClient(f"mongodb://localhost:{port}/?directConnection=true",
+                         serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command('ping')
+        return True
+    finally:
+        client.close()
+
+
+def initiate(cluster, replica_set, ports, configsvr=False):
+    """replSetInitiate on the first member, then wait for a primary"""
+    from pymongo import MongoClient
+    config = {'_id': replica_set, 'members': [{'_id': i, 'host': f"localhost:{port}"}
+                                              for i, port in enumerate(ports)]}
+    if configsvr:
+        config['configsvr'] = True
+    for port in ports:
+        cluster.wait_for(lambda: ping(port), f"mongod on {port}")
+
+    client = MongoClient(f"mongodb://localhost:{ports[0]}/?directConnection=true")
+    try:
+        client.admin.command('replSetInitiate', config)
+        cluster.wait_for(lambda: client.admin.command('hello').get('isWritablePrimary'),
+                         f"{replica_set} primary")
+    finally:
+        client.close()
+
+
+class MongoReplicaSet(LocalCluster):
+    engine = 'mongodb'
+    replica_set = 'scaling'
+
+    def __init__(self, nodes, workdir, binaries, base_port, read_preference='primary'):
+        super().__init__(nodes, workdir, binaries, base_port)
+        self.read_preference = read_preference
+
+    def start(self):
+        ports = [self.base_port + i for i in range(self.nodes)]
+        for i, port in enumerate(ports):
+            self.spawn(f"mongod{i}", mongod_command(self.binaries['mongod'], port,
+                                                    self.directory(f"mongod{i}"), self.replica_set))
+        initiate(self, self.replica_set, ports)
+        hosts = ','.join(f"localhost:{port}" for port in ports)
+        return [{'url': f"mongodb://{hosts}/?replicaSet={self.replica_set}"
+                        f"&readPreference={self.read_preference}"}]
+
+
+class MongoShardedCluster(LocalCluster):
+    """One config server, `nodes` single-member shards and a mongos per shard"""
+    engine = 'mongodb'
+    # Sharded on a hashed _id, so inserts spread over every shard
+    key = 'hashed'
+
+    def start(self):
+        mongod = self.binaries['mongod']
+        config_port = self.base_port
+        shard_ports = [self.base_port + 1 + i for i in range(self.nodes)]
+        router_ports = [self.base_port + 1 + self.nodes + i for i in range(self.nodes)]
+
+        self.spawn('config', mongod_command(mongod, config_port, self.directory('config'), 'config',
+                                            'configsvr'))
+        for i, port in enumerate(shard_ports):
+            self.spawn(f"shard{i}", mongod_command(mongod, port, self.directory(f"shard{i}"),
+                                                   f"shard{i}", 'shardsvr'))
+        initiate(self, 'config', [config_port], configsvr=True)
+        for i, port in enumerate(shard_ports):
+            initiate(self, f"shard{i}", [port])
+
+        for i, port in enumerate(router_ports):
+            self.spawn(f"mongos{i}", [self.binaries['mongos'], '--port', str(port), '--bind_ip', 'localhost',
+                                      '--configdb', f"config/localhost:{config_port}"])
+        for port in router_ports:
+            self.wait_for(lambda: ping(port), f"mongos on {port}")
+
+        from pymongo import MongoClient
+        client = MongoClient(f"mongodb://localhost:{router_ports[0]}/")
+        try:
+            for i, port in enumerate(shard_ports):
+                client.admin.command('addShard', f"shard{i}/localhost:{port}")
+        finally:
+            client.close()
+        return [{'url': f"mongodb://localhost:{port}/"} for port in router_ports]
+
+
+TOPOLOGIES = {
+    'cockroach': (CockroachCluster, ['cockroach'], COCKROACH_BASE_PORT),
+    'mongo-replica': (MongoReplicaSet, ['mongod'], MONGO_BASE_PORT),
+    'mongo-sharded': (MongoShardedCluster, ['mongod', 'mongos'], MONGO_BASE_PORT),
+}
+
+
+def parse_topology(text):
+    """'cockroach:3' -> ('cockroach', 3)"""
+    kind, _, nodes = text.partition(':')
+    if kind not in TOPOLOGIES or not nodes.isdigit() or int(nodes) < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected KIND:NODES with KIND one of {', '.join(TOPOLOGIES)}, got {text!r}")
+    return kind, int(nodes)
+
+
+def run_topology(cluster, datasets, operations, clients_per_node, duration):
+    """Start the cluster, reload every dataset and run each operation on it"""
+    results = []
+    # Every topology reuses the same ports, so pooled connections would
+    # outlive the previous cluster; each worker connects on its own instead
+    options = [dict(node, pooled=False) for node in cluster.start()]
+    clients = clients_per_node * cluster.nodes
+    for dataset in datasets:
+        if cluster.key is not None:
+            dataset = dict(dataset, key=cluster.key)
+        loader = open_adapter(cluster.engine, pooled=False, **options[0])
+        try:
+            loader.create_table(dataset)
+            if not load_dataset(loader, dataset):
+                continue
+            for operation in operations:
+                print(f"  {dataset['data_size']} {operation}: {clients} clients for {duration:g}s...")
+                ops_per_sec, errors, histogram = run_level(cluster.engine, operation, dataset, clients,
+                                                           duration, options=options)
+                results.append({'dataset': dataset['data_size'], 'operation': operation,
+                                'clients': clients, 'ops_per_sec': ops_per_sec,
+                                'errors': errors, 'histogram': histogram})
+            loader.cleanup(dataset)
+        finally:
+            loader.close()
+    return results
+
+
+def print_results(results):
+    """One table per (kind, dataset, operation), efficiency against the smallest topology"""
+    groups = {}
+    for r in results:
+        groups.setdefault((r['kind'], r['dataset'], r['operation']), []).append(r)
+
+    for (kind, data_size, operation), rows in groups.items():
+        rows.sort(key=lambda r: r['nodes'])
+        base = rows[0]['ops_per_sec'] / rows[0]['nodes']
+        print(f"\n{kind} {data_size} - {operation}")
+        print(f"  {'nodes':>5} {'clients':>7} {'ops/sec':>11} {'per node':>11} {'efficiency':>10} "
+              f"{'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for r in rows:
+            per_node = r['ops_per_sec'] / r['nodes']
+            efficiency = per_node / base if base else 0
+            summary = r['histogram'].summary()
+            print(f"  {r['nodes']:>5} {r['clients']:>7} {r['ops_per_sec']:>11,.1f} {per_node:>11,.1f} "
+                  f"{efficiency:>9.0%} {summary['p50']:>9.3f} {summary['p99']:>9.3f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput and scaling efficiency on local multi-node clusters")
+    parser.add_argument('--topologies', nargs='+', type=parse_topology,
+                        default=[parse_topology(t) for t in DEFAULT_TOPOLOGIES], metavar='KIND:NODES',
+                        help=f"kinds: {', '.join(TOPOLOGIES)}")
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--clients-per-node', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per operation")
+    parser.add_argument('--mongo-read-preference', default='primary',
+                        help="replica set read preference, e.g. secondaryPreferred to read from every member")
+    parser.add_argument('--workdir', help="data directories and logs (default: a temporary directory)")
+    parser.add_argument('--keep', action='store_true', help="keep the data directories and logs")
+    parser.add_argument('--cockroach-bin', default='cockroach')
+    parser.add_argument('--mongod-bin', default='mongod')
+    parser.add_argument('--mongos-bin', default='mongos')
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+    binaries = {'cockroach': args.cockroach_bin, 'mongod': args.mongod_bin, 'mongos': args.mongos_bin}
+    root = args.workdir or tempfile.mkdtemp(prefix='cluster-scaling-')
+
+    print("=" * 60)
+    print("Local Cluster Scaling Test")
+    print("=" * 60)
+
+    results = []
+    for kind, nodes in args.topologies:
+        cls, needs, base_port = TOPOLOGIES[kind]
+        missing = [name for name in needs if shutil.which(binaries[name]) is None]
+        if missing:
+            print(f"\n✗ {kind}:{nodes} skipped, {', '.join(missing)} not found")
+            continue
+
+        print(f"\n{kind}:{nodes}")
+        workdir = os.path.join(root, f"{kind}-{nodes}")
+        shutil.rmtree(workdir, ignore_errors=True)
+        os.makedirs(workdir)
+        options = {'read_preference': args.mongo_read_preference} if cls is MongoReplicaSet else {}
+        try:
+            with cls(nodes, workdir, binaries, base_port, **options) as cluster:
+                for r in run_topology(cluster, datasets, args.operations, args.clients_per_node, args.duration):
+                    results.append(dict(r, kind=kind, nodes=nodes))
+        except Exception as e:
+            print(f"  ✗ {kind}:{nodes} failed: {e}")
+
+    print_results(results)
+    if args.keep:
+        print(f"\nData directories and logs kept in {root}")
+    else:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
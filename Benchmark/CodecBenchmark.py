@@ -0,0 +1,300 @@
+"""
+Offline codec microbenchmark
+Part of every operation is client-side serialization: pymongo encodes the
+employee dicts to BSON, psycopg2 quotes the parameter tuples, COPY
+buffers are rendered as CSV, and results are decoded on the way back.
+These cases time just that, for the employee row shape, with no server:
+
+  to_document            tuple -> dict (MongoAdapter.to_document)
+  bson encode / decode   bson.encode per document / bson.decode_all
+  RawBSONDocument        lazy documents, reading one field each
+  bson -> numpy          Columnar.bson_to_columns on one raw batch
+  psycopg2 adapt         adapt(row).getquoted() per row, the per-parameter
+                         work of mogrify / execute_values (mogrify itself
+                         needs a live connection)
+  psycopg2 typecast      the INTEGER typecaster over the text result fields
+  copy text encode       csv.writer into a StringIO (ImportingData.copy_buffer)
+  copy text decode       csv.reader + int() back to tuples
+  copy text -> numpy     Columnar.csv_to_columns
+  copy binary encode     PGCOPY binary format via struct
+  copy binary decode     PGCOPY binary back to tuples
+
+Each case reports rows/sec and, for encoders, bytes per row, so text and
+binary formats can be compared. Cases whose module is not installed are
+skipped.
+
+For CI, save a baseline on a known-good commit and compare later runs:
+
+  python CodecBenchmark.py --save-baseline codec-baseline.json
+  python CodecBenchmark.py --baseline codec-baseline.json --tolerance 0.25
+
+Every case is measured --repeats times. Each repetition runs a pure-Python
+calibration loop just before and just after the case and scores the case
+by its throughput over theirs, so a slower or busier CI machine does not
+read as a regression; a case's score is the median over the repetitions,
+and 'spread' is how far the repetitions were apart. On an idle machine the
+scores of one commit stayed within about 15% from run to run with the
+defaults, hence the 25% default tolerance. The exit status is 1 when any
+case's score drops by more than --tolerance, and 2 when the baseline was
+measured with a different --rows.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import statistics
+import struct
+import sys
+
+from Adapters import DATASET_DIR, DATASETS, MongoAdapter, read_rows, test_rows
+from Columnar import bson_to_columns, csv_to_columns
+from LatencyHarness import measure
+
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\0' + struct.pack('>ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('>h', -1)
+
+STRING_FIELDS = (2, 7)
+
+
+def sample_rows(count):
+    """The first `count` rows of the 10K dataset, or synthetic rows without it"""
+    path = os.path.join(DATASET_DIR, DATASETS[0]['file'])
+    if os.path.exists(path):
+        rows = []
+        for row in read_rows(path):
+            rows.append(row)
+            if len(rows) == count:
+                return rows
+        if len(rows) == count:
+            return rows
+    return test_rows(1, count)
+
+
+def copy_text(rows):
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue()
+
+
+def parse_copy_text(text):
+    return [(int(r[0]), int(r[1]), r[2], int(r[3]), int(r[4]), int(r[5]), int(r[6]), r[7])
+            for r in csv.reader(io.StringIO(text))]
+
+
+def copy_binary(rows):
+    """PGCOPY binary: int8 for the integer columns, UTF-8 text for the strings"""
+    out = [PGCOPY_HEADER]
+    pack_ints = struct.Struct('>iq').pack
+    for row in rows:
+        out.append(b'\0\x08')
+        for i, value in enumerate(row):
+            if i in STRING_FIELDS:
+                data = value.encode()
+                out.append(struct.pack('>i', len(data)) + data)
+            else:
+                out.append(pack_ints(8, value))
+    out.append(PGCOPY_TRAILER)
+    return b''.join(out)
+
+
+def parse_copy_binary(data):
+    rows = []
+    unpack_from = struct.unpack_from
+    offset = len(PGCOPY_HEADER)
+    while True:
+        fields, = unpack_from('>h', data, offset)
+        offset += 2
+        if fields == -1:
+            return rows
+        row = []
+        for i in range(fields):
+            length, = unpack_from('>i', data, offset)
+            offset += 4
+            if i in STRING_FIELDS:
+                row.append(data[offset:offset + length].decode())
+            else:
+                row.append(unpack_from('>q', data, offset)[0])
+            offset += length
+        rows.append(tuple(row))
+
+
+def calibration(rows):
+    """Pure-Python reference work, used to normalize across machines"""
+    total = 0
+    for row in rows:
+        for value in row:
+            total += len(value) if isinstance(value, str) else value
+    return total
+
+
+def build_cases(rows):
+    """{name: (callable, bytes per row or None)}; None when a module is missing"""
+    cases = {}
+    docs = [MongoAdapter.to_document(r) for r in rows]
+    cases['to_document'] = (lambda: [MongoAdapter.to_document(r) for r in rows], None)
+
+    try:
+        import bson
+        from bson.raw_bson import RawBSONDocument
+    except ImportError:
+        for name in ('bson encode', 'bson decode', 'RawBSONDocument', 'bson -> numpy'):
+            cases[name] = None
+    else:
+        encoded = [bson.encode(d) for d in docs]
+        batch = b''.join(encoded)
+        cases['bson encode'] = (lambda: [bson.encode(d) for d in docs], len(batch) / len(rows))
+        cases['bson decode'] = (lambda: bson.decode_all(batch), None)
+        cases['RawBSONDocument'] = (lambda: [RawBSONDocument(b)['EmployeeID'] for b in encoded], None)
+        cases['bson -> numpy'] = (lambda: bson_to_columns([batch]), None)
+
+    try:
+        from psycopg2.extensions import INTEGER, adapt
+    except ImportError:
+        cases['psycopg2 adapt'] = None
+        cases['psycopg2 typecast'] = None
+    else:
+        quoted = b','.join(adapt(r).getquoted() for r in rows)
+        text_rows = [tuple(str(v) for v in r) for r in rows]
+        cases['psycopg2 adapt'] = (lambda: b','.join(adapt(r).getquoted() for r in rows),
+                                   len(quoted) / len(rows))
+        cases['psycopg2 typecast'] = (
+            lambda: [tuple(v if i in STRING_FIELDS else INTEGER(v, None) for i, v in enumerate(r))
+                     for r in text_rows],
+            None)
+
+    text = copy_text(rows)
+    text_bytes = text.encode()
+    binary = copy_binary(rows)
+    cases['copy text encode'] = (lambda: copy_text(rows), len(text_bytes) / len(rows))
+    cases['copy text decode'] = (lambda: parse_copy_text(text), None)
+    cases['copy text -> numpy'] = (lambda: csv_to_columns(text_bytes), None)
+    cases['copy binary encode'] = (lambda: copy_binary(rows), len(binary) / len(rows))
+    cases['copy binary decode'] = (lambda: parse_copy_binary(binary), None)
+    return cases
+
+
+def rows_per_sec(fn, count, warmup, iterations):
+    p50 = measure(fn, warmup, iterations).percentile(50)
+    return count / (p50 / 1e9) if p50 else 0.0
+
+
+def measure_case(fn, rows, warmup, iterations, repeats):
+    """(median rows/sec, median score, score spread, calibrations) over `repeats` repetitions"""
+    def calibrate():
+        return rows_per_sec(lambda: calibration(rows), len(rows), warmup, iterations)
+
+    rates, scores, calibrations = [], [], []
+    for _ in range(repeats):
+        before = calibrate()
+        rate = rows_per_sec(fn, len(rows), warmup, iterations)
+        after = calibrate()
+        rates.append(rate)
+        scores.append(rate / (before * after) ** 0.5)
+        calibrations += [before, after]
+    score = statistics.median(scores)
+    spread = (max(scores) - min(scores)) / score if score else 0.0
+    return statistics.median(rates), score, spread, calibrations
+
+
+def run(count, warmup, iterations, selected=None, repeats=5):
+    """Return {'rows', 'calibration', 'cases': {name: {...}}, 'skipped': [...]}"""
+    rows = sample_rows(count)
+    result = {'rows': len(rows), 'repeats': repeats, 'cases': {}, 'skipped': []}
+    calibrations = []
+    for name, case in build_cases(rows).items():
+        if selected and name not in selected:
+            continue
+        if case is None:
+            result['skipped'].append(name)
+            continue
+        fn, bytes_per_row = case
+        rate, score, spread, case_calibrations = measure_case(fn, rows, warmup, iterations, repeats)
+        calibrations += case_calibrations
+        result['cases'][name] = {'rows_per_sec': rate, 'bytes_per_row': bytes_per_row,
+                                 'score': score, 'spread': spread}
+    result['calibration'] = statistics.median(calibrations) if calibrations else 0.0
+    return result
+
+
+def compare(result, baseline, tolerance):
+    """Return the names of the cases that regressed against the baseline.
+
+    Raises ValueError when the baseline was measured with another row count,
+    since the scores are not comparable then.
+    """
+    if baseline['rows'] != result['rows']:
+        raise ValueError(f"baseline was measured with {baseline['rows']:,} rows per pass, "
+                         f"this run with {result['rows']:,}; rerun with --rows {baseline['rows']}")
+    regressions = []
+    print(f"\n  {'case':<22} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, case in result['cases'].items():
+        before = baseline['cases'].get(name)
+        if before is None:
+            print(f"  {name:<22} {'-':>10} {case['score']:>10.3f}      new")
+            continue
+        change = case['score'] / before['score'] - 1
+        flag = ''
+        if change < -tolerance:
+            regressions.append(name)
+            flag = '  ✗ regression'
+        print(f"  {name:<22} {before['score']:>10.3f} {case['score']:>10.3f} {change:>+8.1%}{flag}")
+    for name in baseline['cases']:
+        if name not in result['cases']:
+            print(f"  {name:<22} not run")
+    return regressions
+
+
+def print_results(result):
+    print(f"\n  {result['rows']:,} rows per pass, calibration {result['calibration']:,.0f} rows/sec")
+    print(f"  {'case':<22} {'rows/sec':>13} {'bytes/row':>10} {'score':>8} {'spread':>8}")
+    for name, case in result['cases'].items():
+        size = f"{case['bytes_per_row']:.1f}" if case['bytes_per_row'] else '-'
+        print(f"  {name:<22} {case['rows_per_sec']:>13,.0f} {size:>10} {case['score']:>8.3f} "
+              f"{case['spread']:>8.1%}")
+    if result['skipped']:
+        print(f"  skipped (module not installed): {', '.join(result['skipped'])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Client-side encode / decode throughput, no server needed")
+    parser.add_argument('--rows', type=int, default=10000, help="rows per pass")
+    parser.add_argument('--cases', nargs='+', help="only these cases")
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=15)
+    parser.add_argument('--repeats', type=int, default=5,
+                        help="independent repetitions per case, each between two calibrations")
+    parser.add_argument('--baseline', metavar='JSON', help="compare against a saved baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed drop in normalized throughput (0.25 = 25%%)")
+    parser.add_argument('--save-baseline', metavar='JSON', help="write this run as the new baseline")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Codec Microbenchmark")
+    print("=" * 60)
+
+    result = run(args.rows, args.warmup, args.iterations, args.cases, args.repeats)
+    print_results(result)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare(result, baseline, args.tolerance)
+        except ValueError as e:
+            print(f"\n✗ Not compared: {e}")
+            sys.exit(2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    print("\n" + "=" * 60)
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+    print("Testing Complete")
+    print("=" * 60)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,168 @@
+"""
+Cold-cache vs. warm-cache measurement
+Whichever dataset ran first used to pay for the cold connection and cold
+caches, which made the 10K table look slowest. Here every (dataset,
+operation) pair gets its own cold start, chosen with --reset:
+
+  reconnect  a brand-new, unpooled connection / client only (client side)
+  evict      reconnect, plus drop the OS page cache (root only) and, on
+             MongoDB, the collection's plan cache. The engines' own caches
+             (CockroachDB's Pebble block cache, MongoDB's WiredTiger cache)
+             stay warm, so this is only cold below the engine
+  restart    reconnect after running the engine's --restart-* command
+             (e.g. a systemctl or cockroach / mongod restart script) and
+             waiting until the engine accepts connections again; the only
+             mode with cold engine caches, so use it for true cold numbers
+
+Then the first --cold-samples operations are recorded as the cold numbers,
+followed by --warmup discarded passes and --iterations steady-state
+measurements as the warm numbers. Both are reported for every operation.
+
+Usage:
+  python ColdWarmBenchmark.py --engines cockroachdb --reset restart \\
+      --restart-cockroachdb "sudo systemctl restart cockroachdb"
+  python ColdWarmBenchmark.py --engines sqlite --load --reset reconnect
+"""
+
+import argparse
+import os
+import subprocess
+import time
+
+from Adapters import ADAPTERS, DATASETS, MongoAdapter, make_operation, open_adapter
+from Histogram import LatencyHistogram
+from LatencyHarness import measure
+from RunBenchmark import load_dataset
+
+OPERATIONS = ['update', 'read', 'query', 'write']
+RESET_MODES = ['reconnect', 'evict', 'restart']
+
+# What each mode leaves cold, printed with the results
+COLD_LAYERS = {
+    'reconnect': "connection only; OS and engine caches warm",
+    'evict': "connection, OS page cache, Mongo plan cache; engine block caches warm",
+    'restart': "connection and engine caches; OS page cache as the restart leaves it",
+}
+
+READY_TIMEOUT = 120
+
+
+def drop_os_caches():
+    """Flush dirty pages and drop the Linux page cache; False without permission"""
+    try:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3\n')
+        return True
+    except OSError:
+        return False
+
+
+def wait_until_ready(engine_name, timeout=READY_TIMEOUT):
+    """Open a fresh connection, retrying until the engine answers"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return open_adapter(engine_name, pooled=False)
+        except Exception:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.5)
+
+
+def cold_adapter(engine_name, dataset, reset, restart_command=None):
+    """Reset the caches the chosen way and return a new, unpooled adapter"""
+    if reset == 'restart':
+        if not restart_command:
+            raise ValueError(f"--reset restart needs --restart-{engine_name}")
+        subprocess.run(restart_command, shell=True, check=True)
+        return wait_until_ready(engine_name)
+
+    if reset == 'evict' and not drop_os_caches():
+        print("  ! could not drop the OS page cache (needs root)")
+    adapter = open_adapter(engine_name, pooled=False)
+    if reset == 'evict' and isinstance(adapter, MongoAdapter):
+        adapter.db.command('planCacheClear', dataset['collection'])
+    return adapter
+
+
+def run_one(engine_name, dataset, operation, reset, restart_command, cold_samples, warmup, iterations):
+    adapter = cold_adapter(engine_name, dataset, reset, restart_command)
+    try:
+        op = make_operation(adapter, operation, dataset)
+        cold = LatencyHistogram()
+        clock = time.perf_counter_ns
+        first = None
+        for _ in range(cold_samples):
+            start = clock()
+            op()
+            elapsed = clock() - start
+            if first is None:
+                first = elapsed
+            cold.record(elapsed)
+        warm = measure(op, warmup, iterations)
+        adapter.cleanup(dataset)
+    finally:
+        adapter.close()
+    return {'operation': operation, 'first': first, 'cold': cold, 'warm': warm}
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"  {'operation':<10} {'first ms':>10} {'cold p50':>10} {'cold max':>10} "
+          f"{'warm p50':>10} {'warm p99':>10} {'cold/warm':>10}")
+    for r in results:
+        cold = r['cold'].summary()
+        warm = r['warm'].summary()
+        ratio = cold['p50'] / warm['p50'] if warm['p50'] else 0
+        print(f"  {r['operation']:<10} {r['first'] / 1e6:>10.3f} {cold['p50']:>10.3f} {cold['max']:>10.3f} "
+              f"{warm['p50']:>10.3f} {warm['p99']:>10.3f} {ratio:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start and steady-state latency, reported separately")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--reset', choices=RESET_MODES, default='reconnect')
+    for name in ADAPTERS:
+        parser.add_argument(f'--restart-{name}', metavar='CMD', help=f"shell command restarting {name}")
+    parser.add_argument('--cold-samples', type=int, default=10, help="operations counted as cold")
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+    if args.reset == 'restart':
+        for engine_name in args.engines:
+            if not getattr(args, f"restart_{engine_name}"):
+                parser.error(f"--reset restart needs --restart-{engine_name}")
+
+    print("=" * 60)
+    print(f"Cold vs. Warm Cache Benchmark (reset: {args.reset})")
+    print(f"Cold: {COLD_LAYERS[args.reset]}")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        restart_command = getattr(args, f"restart_{engine_name}")
+        # Keeps a shared SQLite in-memory database alive between adapters
+        anchor = open_adapter(engine_name, pooled=False) if engine_name == 'sqlite' else None
+        for dataset in datasets:
+            if args.load:
+                loader = anchor or open_adapter(engine_name, pooled=False)
+                load_dataset(loader, dataset)
+                if loader is not anchor:
+                    loader.close()
+            results = []
+            for operation in args.operations:
+                print(f"  {engine_name} {dataset['data_size']} {operation}: {args.reset}...")
+                results.append(run_one(engine_name, dataset, operation, args.reset, restart_command,
+                                       args.cold_samples, args.warmup, args.iterations))
+            print_results(f"{ADAPTERS[engine_name].name} {dataset['data_size']}", results)
+        if anchor is not None:
+            anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,115 @@
+"""
+Columnar fetch benchmark
+Times the read (employeeid range) and query (department filter) tests
+three ways for growing result sizes:
+
+  rows            range_read / filtered_query: one tuple or dict per row
+  rows->columns   the same, then converted to column arrays, which is what
+                  analytics consumers do with them today
+  columnar        adapter.fetch_columns: COPY ... TO STDOUT parsed straight
+                  into NumPy on CockroachDB, raw BSON batches decoded into
+                  NumPy on MongoDB
+
+Before timing, the columnar read is checked against the row read so the
+fast path is known to return the same data.
+
+Usage:
+  python ColumnarBenchmark.py --engines cockroachdb mongodb --limits 100 10000 100000
+  python ColumnarBenchmark.py --engines sqlite --load --datasets 100K
+"""
+
+import argparse
+
+import numpy as np
+
+from Adapters import ADAPTERS, DATASETS, MongoAdapter, open_adapter
+from Columnar import documents_to_columns, rows_to_columns
+from Histogram import summary_header, summary_row
+from LatencyHarness import measure
+from RunBenchmark import load_dataset
+
+DEFAULT_LIMITS = [100, 10000, 100000]
+
+VARIANTS = ['rows', 'rows->columns', 'columnar']
+
+
+def to_columns(adapter, rows):
+    if isinstance(adapter, MongoAdapter):
+        return documents_to_columns(rows)
+    return rows_to_columns(rows)
+
+
+def make_variants(adapter, dataset, operation, limit):
+    """Zero-argument callables for every variant of one operation"""
+    if operation == 'read':
+        def fetch_rows():
+            return adapter.range_read(dataset, 1, limit)
+        options = {'start': 1}
+    else:
+        def fetch_rows():
+            return adapter.filtered_query(dataset, 'Finance', limit)
+        options = {'department': 'Finance'}
+
+    return {
+        'rows': fetch_rows,
+        'rows->columns': lambda: to_columns(adapter, fetch_rows()),
+        'columnar': lambda: adapter.fetch_columns(dataset, limit=limit, **options),
+    }
+
+
+def verify(adapter, dataset, limit):
+    """True when the columnar and row reads of the same range agree"""
+    expected = to_columns(adapter, adapter.range_read(dataset, 1, limit))
+    actual = adapter.fetch_columns(dataset, start=1, limit=limit)
+    return all(np.array_equal(expected[name], actual[name]) for name in expected)
+
+
+def run(adapter, dataset, limits, warmup, iterations):
+    results = []
+    for limit in limits:
+        if not verify(adapter, dataset, limit):
+            print(f"  ✗ {adapter.name} {dataset['data_size']}: columnar result differs at limit {limit:,}")
+        for operation in ('read', 'query'):
+            for variant, op in make_variants(adapter, dataset, operation, limit).items():
+                print(f"  {adapter.name} {dataset['data_size']} {operation} {limit:,} rows: {variant}...")
+                results.append((operation, limit, variant, measure(op, warmup, iterations)))
+    return results
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(summary_header(32))
+    for operation, limit, variant, histogram in results:
+        print(summary_row(f"{operation} {limit:,} {variant}", histogram, 32))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Row-at-a-time vs. columnar result decoding")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=['500K'])
+    parser.add_argument('--limits', nargs='+', type=int, default=DEFAULT_LIMITS)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Columnar Fetch Benchmark")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        adapter = open_adapter(engine_name)
+        try:
+            for dataset in datasets:
+                if args.load:
+                    load_dataset(adapter, dataset)
+                print_results(f"{adapter.name} {dataset['data_size']}",
+                              run(adapter, dataset, args.limits, args.warmup, args.iterations))
+        finally:
+            adapter.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
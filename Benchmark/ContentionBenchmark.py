@@ -0,0 +1,186 @@
+"""
+Contended-update benchmark
+The latency test updates the first Finance row from a single client, so it
+never sees contention. Here N workers each run read-modify-write
+transactions (adapter.increment_keys) over a few employeeids picked by a
+uniform or zipfian chooser, so the hot keys overlap between workers:
+
+  CockroachDB  BEGIN / SELECT / UPDATE / COMMIT, retried on SQLSTATE 40001
+  MongoDB      session + transaction, retried on TransientTransactionError
+               (needs a replica set or sharded cluster)
+  SQLite       BEGIN IMMEDIATE; writers in one process take turns on the
+               adapter's write lock, so only other processes cause retries
+
+The transactions look rows up by employeeid, so an index on it is created
+first (adapter.index_employeeid) and left in place; without it each
+transaction would scan the table, and conflict with every other one.
+
+Failed attempts are retried with jittered exponential backoff up to
+--max-retries times; after that the transaction counts as aborted. Latency
+is measured from the first attempt to the successful commit, so it includes
+every retry and backoff.
+
+Usage:
+  python ContentionBenchmark.py --engines cockroachdb --workers 1 4 16 64 --theta 0.99
+  python ContentionBenchmark.py --engines sqlite --load --workers 1 4 8
+"""
+
+import argparse
+import queue
+import random
+import threading
+import time
+
+from Adapters import ADAPTERS, DATASETS, open_adapter
+from Histogram import LatencyHistogram
+from KeyChoosers import CHOOSERS, make_chooser
+from RunBenchmark import load_dataset
+
+DEFAULT_WORKERS = [1, 4, 16, 64]
+
+# Backoff before retry n is uniform in [0, min(cap, base * 2**n)) seconds
+BACKOFF_BASE = 0.001
+BACKOFF_CAP = 0.1
+
+
+def run_transaction(adapter, dataset, keys, max_retries, rng):
+    """Run one transaction to completion; return (status, retries).
+
+    status is 'committed', 'aborted' (out of retries) or 'error' (a failure
+    that is not worth retrying).
+    """
+    retries = 0
+    while True:
+        try:
+            adapter.increment_keys(dataset, keys)
+            return 'committed', retries
+        except Exception as e:
+            if not adapter.is_retryable(e):
+                return 'error', retries
+            if retries >= max_retries:
+                return 'aborted', retries
+            retries += 1
+            time.sleep(rng.random() * min(BACKOFF_CAP, BACKOFF_BASE * 2 ** retries))
+
+
+def worker(engine_name, dataset, distribution, theta, keys_per_txn, max_retries, duration,
+           worker_id, barrier, results):
+    histogram = LatencyHistogram()
+    counts = {'committed': 0, 'aborted': 0, 'error': 0, 'retries': 0}
+
+    try:
+        adapter = open_adapter(engine_name)
+    except Exception:
+        # Release the other workers instead of leaving them at the barrier
+        barrier.abort()
+        results.put((counts, histogram))
+        raise
+
+    options = {'theta': theta} if distribution == 'zipfian' else {}
+    chooser = make_chooser(distribution, dataset['rows'], seed=worker_id, **options)
+    rng = random.Random(worker_id)
+
+    try:
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        clock = time.perf_counter_ns
+        deadline = clock() + int(duration * 1e9)
+        while clock() < deadline:
+            keys = set()
+            while len(keys) < keys_per_txn:
+                keys.add(chooser.next())
+            start = clock()
+            status, retries = run_transaction(adapter, dataset, list(keys), max_retries, rng)
+            if status == 'committed':
+                histogram.record(clock() - start)
+            counts[status] += 1
+            counts['retries'] += retries
+    finally:
+        adapter.close()
+        results.put((counts, histogram))
+
+
+def run_level(engine_name, dataset, distribution, theta, workers, keys_per_txn, max_retries, duration):
+    barrier = threading.Barrier(workers)
+    results = queue.Queue()
+    threads = [
+        threading.Thread(target=worker, args=(engine_name, dataset, distribution, theta, keys_per_txn,
+                                              max_retries, duration, i, barrier, results))
+        for i in range(workers)
+    ]
+    for t in threads:
+        t.start()
+
+    totals = {'committed': 0, 'aborted': 0, 'error': 0, 'retries': 0}
+    histogram = LatencyHistogram()
+    for _ in threads:
+        counts, worker_histogram = results.get()
+        for name, value in counts.items():
+            totals[name] += value
+        histogram.merge(worker_histogram)
+    for t in threads:
+        t.join()
+
+    return {
+        'distribution': distribution,
+        'workers': workers,
+        'committed_per_sec': totals['committed'] / duration,
+        'histogram': histogram,
+        **totals,
+    }
+
+
+def print_results(title, rows):
+    print(f"\n{title}")
+    print(f"  {'keys':<8} {'workers':>7} {'commits/sec':>12} {'retries':>9} {'retry/txn':>10} "
+          f"{'aborted':>8} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for r in rows:
+        s = r['histogram'].summary()
+        attempts = r['committed'] + r['aborted'] + r['error']
+        per_txn = r['retries'] / attempts if attempts else 0
+        print(f"  {r['distribution']:<8} {r['workers']:>7} {r['committed_per_sec']:>12,.1f} "
+              f"{r['retries']:>9,} {per_txn:>10.2f} {r['aborted']:>8,} {r['error']:>7,} "
+              f"{s['p50']:>9.3f} {s['p99']:>9.3f} {s['max']:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput and retries under contended updates")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--dataset', default='10K')
+    parser.add_argument('--distributions', nargs='+', choices=list(CHOOSERS), default=['uniform', 'zipfian'])
+    parser.add_argument('--theta', type=float, default=0.99, help="zipfian skew")
+    parser.add_argument('--workers', nargs='+', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--keys-per-txn', type=int, default=2)
+    parser.add_argument('--max-retries', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per level")
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV file first")
+    args = parser.parse_args()
+
+    dataset = next(d for d in DATASETS if d['data_size'] == args.dataset)
+
+    print("=" * 60)
+    print("Contended Update Benchmark")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        # Keeps a shared SQLite in-memory database alive between adapters
+        anchor = open_adapter(engine_name)
+        if args.load:
+            load_dataset(anchor, dataset)
+        # Without it every transaction scans, and conflicts, on the whole table
+        anchor.index_employeeid(dataset)
+        rows = []
+        for distribution in args.distributions:
+            for workers in args.workers:
+                print(f"  {anchor.name} {distribution} {workers} workers...")
+                rows.append(run_level(engine_name, dataset, distribution, args.theta, workers,
+                                      args.keys_per_txn, args.max_retries, args.duration))
+        print_results(f"{anchor.name} {dataset['data_size']} (theta {args.theta}, "
+                      f"{args.keys_per_txn} keys per transaction)", rows)
+        anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,87 @@
+"""
+HDR-style latency histogram
+Records integer samples (nanoseconds) into log-linear buckets, so memory stays
+small no matter how many samples are taken while every recorded value keeps
+about `significant_figures` digits of precision.
+"""
+
+import math
+
+# Percentiles printed by every harness in this folder
+REPORT_PERCENTILES = [50, 90, 99, 99.9]
+
+
+class LatencyHistogram:
+    def __init__(self, significant_figures=3):
+        # Smallest power of two that can count 2 * 10^figures distinct values
+        largest_single_unit = 2 * 10 ** significant_figures
+        self.sub_bucket_bits = (largest_single_unit - 1).bit_length()
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _key(self, value):
+        bucket = max(0, value.bit_length() - self.sub_bucket_bits)
+        return bucket, value >> bucket
+
+    @staticmethod
+    def _highest_equivalent(key):
+        bucket, sub = key
+        return ((sub + 1) << bucket) - 1
+
+    def record(self, value, count=1):
+        """Record one sample (an int, usually nanoseconds)"""
+        value = max(0, int(value))
+        key = self._key(value)
+        self.counts[key] = self.counts.get(key, 0) + count
+        self.total += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        """Add every sample of another histogram into this one"""
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, p):
+        """Value at percentile p (0-100), accurate to the bucket precision"""
+        if self.total == 0:
+            return 0
+        target = max(1, math.ceil(p / 100 * self.total))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= target:
+                return min(self._highest_equivalent(key), self.max)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0
+
+    def summary(self, scale=1e6):
+        """Percentiles, mean and max divided by `scale` (default ns -> ms)"""
+        result = {f"p{p:g}": self.percentile(p) / scale for p in REPORT_PERCENTILES}
+        result['max'] = self.max / scale
+        result['mean'] = self.mean() / scale
+        result['count'] = self.total
+        return result
+
+
+def summary_header(label_width=28):
+    columns = [f"p{p:g}" for p in REPORT_PERCENTILES] + ['max']
+    return f"{'':<{label_width}}" + ''.join(f"{c + ' ms':>11}" for c in columns) + f"{'samples':>10}"
+
+
+def summary_row(label, histogram, label_width=28):
+    s = histogram.summary()
+    columns = [f"p{p:g}" for p in REPORT_PERCENTILES] + ['max']
+    return f"{label:<{label_width}}" + ''.join(f"{s[c]:>11.3f}" for c in columns) + f"{s['count']:>10,}"
@@ -0,0 +1,295 @@
+"""
+Index-aware query benchmark
+The tables from ImportingData.py have no secondary indexes, so every
+department filter is a full scan at every dataset size. This runs each
+filter under four index variants:
+
+  none       no secondary index
+  single     department
+  composite  (department, performancescore)
+  covering   department STORING (employeeid, monthlysalary) on CockroachDB,
+             {Department, EmployeeID, MonthlySalary} on MongoDB
+
+For every variant it records the index build time and size, times each query
+and saves the EXPLAIN ANALYZE / explain('executionStats') output next to the
+timing in a JSON file, so scaling can be traced to scans or index lookups.
+
+Usage:
+  python IndexBenchmark.py --engines cockroachdb mongodb --datasets 10K 100K 500K
+  python IndexBenchmark.py --engines sqlite --load       (offline)
+"""
+
+import argparse
+import json
+import os
+import time
+
+from Adapters import ADAPTERS, DATASETS, open_adapter
+from LatencyHarness import measure
+from RunBenchmark import load_dataset
+
+VARIANTS = ['none', 'single', 'composite', 'covering']
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+INDEX_PREFIX = 'bench_idx'
+
+
+class CockroachIndexes:
+    def __init__(self, adapter, dataset):
+        self.cur = adapter.cur
+        self.table = dataset['table']
+
+    def create(self, variant):
+        """Create the variant's index and return its name (None for 'none')"""
+        name = f"{INDEX_PREFIX}_{variant}"
+        if variant == 'single':
+            self.cur.execute(f"CREATE INDEX {name} ON {self.table} (department)")
+        elif variant == 'composite':
+            self.cur.execute(f"CREATE INDEX {name} ON {self.table} (department, performancescore)")
+        elif variant == 'covering':
+            self.cur.execute(f"CREATE INDEX {name} ON {self.table} (department) "
+                             f"STORING (employeeid, monthlysalary)")
+        else:
+            return None
+        return name
+
+    def drop_all(self):
+        for variant in VARIANTS[1:]:
+            self.cur.execute(f"DROP INDEX IF EXISTS {self.table}@{INDEX_PREFIX}_{variant}")
+
+    def size(self, name):
+        """Index size in bytes, from the range statistics"""
+        try:
+            self.cur.execute(f"SELECT sum(range_size) FROM [SHOW RANGES FROM INDEX {self.table}@{name} "
+                             f"WITH DETAILS]")
+            value = self.cur.fetchone()[0]
+            return int(value) if value is not None else None
+        except Exception:
+            # Older versions have no WITH DETAILS
+            return None
+
+    def queries(self):
+        t = self.table
+        return {
+            'department': f"SELECT * FROM {t} WHERE department = 'Finance' LIMIT 50",
+            'department_score': f"SELECT * FROM {t} WHERE department = 'Finance' "
+                                f"AND performancescore = 5 LIMIT 50",
+            'covered': f"SELECT employeeid, monthlysalary FROM {t} WHERE department = 'Finance' LIMIT 50",
+            'update': f"UPDATE {t} SET traininghours = 5 WHERE department = 'Finance' LIMIT 1",
+        }
+
+    def run(self, sql):
+        self.cur.execute(sql)
+        if self.cur.description is not None:
+            self.cur.fetchall()
+
+    def explain(self, sql):
+        self.cur.execute(f"EXPLAIN ANALYZE {sql}")
+        return '\n'.join(row[0] for row in self.cur.fetchall())
+
+    @staticmethod
+    def access_path(plan):
+        return 'full scan' if 'FULL SCAN' in plan else 'index'
+
+
+class MongoIndexes:
+    def __init__(self, adapter, dataset):
+        self.db = adapter.db
+        self.name = dataset['collection']
+        self.collection = adapter.db[self.name]
+
+    def create(self, variant):
+        keys = {
+            'single': [('Department', 1)],
+            'composite': [('Department', 1), ('PerformanceScore', 1)],
+            'covering': [('Department', 1), ('EmployeeID', 1), ('MonthlySalary', 1)],
+        }.get(variant)
+        if keys is None:
+            return None
+        return self.collection.create_index(keys, name=f"{INDEX_PREFIX}_{variant}")
+
+    def drop_all(self):
+        for name in self.collection.index_information():
+            if name.startswith(INDEX_PREFIX):
+                self.collection.drop_index(name)
+
+    def size(self, name):
+        return self.db.command('collStats', self.name)['indexSizes'].get(name)
+
+    def queries(self):
+        finance = {'Department': 'Finance'}
+        return {
+            'department': {'find': self.name, 'filter': finance, 'limit': 50},
+            'department_score': {'find': self.name, 'filter': {**finance, 'PerformanceScore': 5},
+                                 'limit': 50},
+            'covered': {'find': self.name, 'filter': finance, 'limit': 50,
+                        'projection': {'_id': 0, 'EmployeeID': 1, 'MonthlySalary': 1}},
+            'update': {'update': self.name, 'updates': [
+                {'q': finance, 'u': {'$set': {'TrainingHours': 5}}, 'multi': False}
+            ]},
+        }
+
+    def run(self, command):
+        if 'find' in command:
+            list(self.collection.find(command['filter'], command.get('projection'))
+                 .limit(command['limit']))
+        else:
+            update = command['updates'][0]
+            self.collection.update_one(update['q'], update['u'])
+
+    def explain(self, command):
+        result = self.db.command('explain', command, verbosity='executionStats')
+        return json.dumps(result, default=str, indent=2)
+
+    @staticmethod
+    def access_path(plan):
+        if 'COLLSCAN' in plan:
+            return 'full scan'
+        return 'index' if '"FETCH"' in plan else 'covered index'
+
+
+class SQLiteIndexes:
+    def __init__(self, adapter, dataset):
+        self.cur = adapter.cur
+        self.table = dataset['table']
+
+    def create(self, variant):
+        name = f"{INDEX_PREFIX}_{variant}_{self.table}"
+        columns = {
+            'single': 'department',
+            'composite': 'department, performancescore',
+            'covering': 'department, employeeid, monthlysalary',
+        }.get(variant)
+        if columns is None:
+            return None
+        self.cur.execute(f"CREATE INDEX {name} ON {self.table} ({columns})")
+        return name
+
+    def drop_all(self):
+        for variant in VARIANTS[1:]:
+            self.cur.execute(f"DROP INDEX IF EXISTS {INDEX_PREFIX}_{variant}_{self.table}")
+
+    def size(self, name):
+        try:
+            self.cur.execute("SELECT sum(pgsize) FROM dbstat WHERE name = ?", (name,))
+            return self.cur.fetchone()[0]
+        except Exception:
+            # dbstat is an optional compile-time extension
+            return None
+
+    queries = CockroachIndexes.queries
+
+    def _statement(self, sql):
+        # SQLite has no UPDATE ... LIMIT by default
+        if sql.startswith('UPDATE'):
+            return (f"UPDATE {self.table} SET traininghours = 5 WHERE rowid = "
+                    f"(SELECT rowid FROM {self.table} WHERE department = 'Finance' LIMIT 1)")
+        return sql
+
+    def run(self, sql):
+        self.cur.execute(self._statement(sql))
+        self.cur.fetchall()
+
+    def explain(self, sql):
+        self.cur.execute(f"EXPLAIN QUERY PLAN {self._statement(sql)}")
+        return '\n'.join(str(row[-1]) for row in self.cur.fetchall())
+
+    @staticmethod
+    def access_path(plan):
+        if 'COVERING INDEX' in plan:
+            return 'covered index'
+        return 'index' if 'USING INDEX' in plan else 'full scan'
+
+
+INDEXERS = {
+    'cockroachdb': CockroachIndexes,
+    'mongodb': MongoIndexes,
+    'sqlite': SQLiteIndexes,
+}
+
+
+def run(engine_name, dataset, warmup, iterations):
+    adapter = open_adapter(engine_name)
+    indexer = INDEXERS[engine_name](adapter, dataset)
+    results = []
+    try:
+        indexer.drop_all()
+        for variant in VARIANTS:
+            start = time.perf_counter()
+            name = indexer.create(variant)
+            build_seconds = time.perf_counter() - start if name else 0.0
+            size = indexer.size(name) if name else 0
+
+            for query_name, query in indexer.queries().items():
+                print(f"  {adapter.name} {dataset['data_size']} {variant} {query_name}...")
+                histogram = measure(lambda: indexer.run(query), warmup, iterations)
+                plan = indexer.explain(query)
+                summary = histogram.summary()
+                results.append({
+                    'engine': adapter.name,
+                    'dataset': dataset['data_size'],
+                    'variant': variant,
+                    'index': name,
+                    'build_seconds': build_seconds,
+                    'index_bytes': size,
+                    'query': query_name,
+                    'p50_ms': summary['p50'],
+                    'p99_ms': summary['p99'],
+                    'access_path': indexer.access_path(plan),
+                    'plan': plan,
+                })
+            indexer.drop_all()
+    finally:
+        adapter.close()
+    return results
+
+
+def save_results(results, engine_name, dataset, directory=RESULTS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"index_{engine_name}_{dataset['data_size']}.json")
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def print_results(results):
+    print(f"\n  {'variant':<10} {'query':<17} {'build s':>8} {'size KB':>10} {'p50 ms':>9} "
+          f"{'p99 ms':>9}  access path")
+    for r in results:
+        size = f"{r['index_bytes'] / 1024:,.0f}" if r['index_bytes'] is not None else 'n/a'
+        print(f"  {r['variant']:<10} {r['query']:<17} {r['build_seconds']:>8.2f} {size:>10} "
+              f"{r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f}  {r['access_path']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query latency with and without secondary indexes")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    parser.add_argument('--output-dir', default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Index Benchmark")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        # Keeps a shared SQLite in-memory database alive between adapters
+        anchor = open_adapter(engine_name)
+        for dataset in datasets:
+            if args.load:
+                load_dataset(anchor, dataset)
+            results = run(engine_name, dataset, args.warmup, args.iterations)
+            print(f"\n{anchor.name} {dataset['data_size']}")
+            print_results(results)
+            print(f"  plans saved to {save_results(results, engine_name, dataset, args.output_dir)}")
+        anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,73 @@
+"""
+Key choosers shared by the workload harnesses
+Each chooser picks employeeids in 1..item_count (the ids the Datasets files
+use) with its own random.Random, so every worker gets an independent,
+reproducible stream:
+
+  uniform   every id equally likely
+  zipfian   YCSB's zipfian generator (Gray et al.); id 1 is the hottest and
+            theta sets the skew (0.99 is the YCSB default, must not be 1)
+  latest    zipfian over recency: the most recently inserted id is the
+            hottest; `latest` is a callable returning that id, so workers
+            that insert can share it
+"""
+
+import random
+
+
+class UniformChooser:
+    def __init__(self, item_count, seed=None):
+        self.item_count = item_count
+        self.random = random.Random(seed)
+
+    def next(self):
+        return self.random.randint(1, self.item_count)
+
+
+class ZipfianChooser:
+    def __init__(self, item_count, theta=0.99, seed=None):
+        if theta == 1:
+            raise ValueError("theta must not be 1")
+        self.item_count = item_count
+        self.theta = theta
+        self.random = random.Random(seed)
+
+        self.zeta2 = self.zeta(2, theta)
+        self.zetan = self.zeta(item_count, theta)
+        self.alpha = 1.0 / (1.0 - theta)
+        self.eta = (1 - (2.0 / item_count) ** (1 - theta)) / (1 - self.zeta2 / self.zetan)
+
+    @staticmethod
+    def zeta(n, theta):
+        return sum(1.0 / (i ** theta) for i in range(1, n + 1))
+
+    def next(self):
+        u = self.random.random()
+        uz = u * self.zetan
+        if uz < 1.0:
+            return 1
+        if uz < 1.0 + 0.5 ** self.theta:
+            return 2
+        rank = int(self.item_count * (self.eta * u - self.eta + 1) ** self.alpha)
+        return min(rank, self.item_count - 1) + 1
+
+
+class LatestChooser:
+    def __init__(self, item_count, theta=0.99, seed=None, latest=None):
+        self.zipfian = ZipfianChooser(item_count, theta, seed)
+        self.latest = latest or (lambda: item_count)
+
+    def next(self):
+        return max(1, self.latest() - self.zipfian.next() + 1)
+
+
+CHOOSERS = {
+    'uniform': UniformChooser,
+    'zipfian': ZipfianChooser,
+    'latest': LatestChooser,
+}
+
+
+def make_chooser(name, item_count, seed=None, **options):
+    """Create the chooser registered under `name`; options go to its constructor"""
+    return CHOOSERS[name](item_count, seed=seed, **options)
@@ -0,0 +1,160 @@
+"""
+Primary key / shard key strategy benchmark
+The imported tables have no PRIMARY KEY (a hidden sequential rowid) and the
+MongoDB documents use ObjectIds; both send every new row to the end of the
+keyspace. This creates one scratch table / collection per key strategy
+
+  CockroachDB  rowid, employeeid, hash (USING HASH), uuid
+  MongoDB      objectid, employeeid, hashed, uuid  (_id; sharded on _id
+               behind a mongos)
+
+and has N concurrent workers insert batches with globally increasing
+employeeids into it. Each strategy reports rows/sec, batch latency and how
+many ranges / chunks the table was split into before and after the load
+(load-based splits show up here long before size-based ones).
+
+Usage:
+  python KeyStrategyBenchmark.py --engines cockroachdb --workers 16 --duration 30
+  python KeyStrategyBenchmark.py --engines sqlite --workers 4
+"""
+
+import argparse
+import itertools
+import queue
+import threading
+import time
+
+from Adapters import ADAPTERS, TEST_ID_BASE, open_adapter, test_rows
+from Histogram import LatencyHistogram
+
+
+def key_dataset(strategy):
+    """A scratch table / collection definition for one key strategy"""
+    return {"data_size": strategy, "table": f"keybench_{strategy}",
+            "collection": f"KEYBENCH_{strategy.upper()}", "file": None, "key": strategy}
+
+
+def worker(engine_name, dataset, ids, id_lock, batch_size, duration, barrier, results):
+    """Insert batches of ids taken from the shared counter until the deadline"""
+    histogram = LatencyHistogram()
+    rows = 0
+    errors = 0
+
+    try:
+        adapter = open_adapter(engine_name)
+    except Exception:
+        # Release the other workers instead of leaving them at the barrier
+        barrier.abort()
+        results.put((0, 1, histogram))
+        raise
+
+    try:
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        clock = time.perf_counter_ns
+        deadline = clock() + int(duration * 1e9)
+        while clock() < deadline:
+            with id_lock:
+                first_id = next(ids)
+            start = clock()
+            try:
+                adapter.insert_batch(dataset, test_rows(first_id, batch_size))
+            except Exception:
+                errors += 1
+                continue
+            histogram.record(clock() - start)
+            rows += batch_size
+    finally:
+        adapter.close()
+        results.put((rows, errors, histogram))
+
+
+def run_strategy(engine_name, strategy, workers, batch_size, duration, keep=False):
+    dataset = key_dataset(strategy)
+    admin = open_adapter(engine_name)
+    try:
+        admin.create_table(dataset)
+        ranges_before = admin.range_count(dataset)
+
+        ids = itertools.count(TEST_ID_BASE, batch_size)
+        id_lock = threading.Lock()
+        barrier = threading.Barrier(workers)
+        results = queue.Queue()
+        threads = [
+            threading.Thread(target=worker, args=(engine_name, dataset, ids, id_lock, batch_size,
+                                                  duration, barrier, results))
+            for _ in range(workers)
+        ]
+        for t in threads:
+            t.start()
+
+        total_rows = 0
+        total_errors = 0
+        histogram = LatencyHistogram()
+        for _ in threads:
+            rows, errors, worker_histogram = results.get()
+            total_rows += rows
+            total_errors += errors
+            histogram.merge(worker_histogram)
+        for t in threads:
+            t.join()
+
+        ranges_after = admin.range_count(dataset)
+        if not keep:
+            admin.drop_table(dataset)
+    finally:
+        admin.close()
+
+    return {
+        'strategy': strategy,
+        'rows_per_sec': total_rows / duration,
+        'errors': total_errors,
+        'histogram': histogram,
+        'ranges_before': ranges_before,
+        'ranges_after': ranges_after,
+    }
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"  {'strategy':<12} {'rows/sec':>12} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10} "
+          f"{'ranges':>12} {'errors':>7}")
+    for r in results:
+        s = r['histogram'].summary()
+        if r['ranges_after'] is None:
+            ranges = 'n/a'
+        else:
+            ranges = f"{r['ranges_before']} -> {r['ranges_after']}"
+        print(f"  {r['strategy']:<12} {r['rows_per_sec']:>12,.0f} {s['p50']:>10.3f} {s['p99']:>10.3f} "
+              f"{s['max']:>10.3f} {ranges:>12} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent insert throughput per key strategy")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--strategies', nargs='+', help="default: every strategy the engine supports")
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds per strategy")
+    parser.add_argument('--keep', action='store_true', help="keep the scratch tables afterwards")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Key Strategy Benchmark")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        supported = ADAPTERS[engine_name].KEY_STRATEGIES
+        strategies = [s for s in (args.strategies or supported) if s in supported]
+        results = []
+        for strategy in strategies:
+            print(f"  {engine_name} {strategy}: {args.workers} workers, batch {args.batch_size}...")
+            results.append(run_strategy(engine_name, strategy, args.workers, args.batch_size,
+                                        args.duration, args.keep))
+        print_results(f"{ADAPTERS[engine_name].name} ({args.workers} workers)", results)
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
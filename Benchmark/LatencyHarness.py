@@ -0,0 +1,74 @@
+"""
+Repeated-trial latency harness
+Runs the UPDATE from the latency tests many times per dataset and engine:
+a warmup phase that is thrown away, then measured iterations timed with
+perf_counter_ns and recorded in an HDR-style histogram.
+
+A single time.time() sample mostly measures first-call warmup (connection,
+plan cache, page cache), so it cannot be compared across dataset sizes.
+
+Usage:
+  python LatencyHarness.py --warmup 100 --iterations 2000
+  python LatencyHarness.py --engines cockroachdb --datasets 10K 500K
+"""
+
+import argparse
+import time
+
+from Adapters import ADAPTERS, DATASETS, open_adapter
+from Histogram import LatencyHistogram, summary_header, summary_row
+
+
+def measure(operation, warmup=100, iterations=1000):
+    """Call operation() warmup + iterations times, return a histogram in ns"""
+    for _ in range(warmup):
+        operation()
+
+    histogram = LatencyHistogram()
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        start = clock()
+        operation()
+        histogram.record(clock() - start)
+    return histogram
+
+
+def run(adapter_names, datasets, warmup, iterations):
+    results = {}
+    for adapter_name in adapter_names:
+        adapter = open_adapter(adapter_name)
+        try:
+            for dataset in datasets:
+                print(f"  {adapter.name} {dataset['data_size']}: "
+                      f"{warmup} warmup + {iterations} measured updates...")
+                results[(adapter.name, dataset['data_size'])] = measure(
+                    lambda: adapter.point_update(dataset), warmup, iterations
+                )
+        finally:
+            adapter.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Repeated-trial UPDATE latency test")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 50)
+    print("Latency Harness")
+    print("=" * 50)
+
+    results = run(args.engines, datasets, args.warmup, args.iterations)
+
+    print("\n" + summary_header())
+    for (engine_name, data_size), histogram in results.items():
+        print(summary_row(f"{engine_name} ({data_size} DATA)", histogram))
+
+    print("\n" + "=" * 50)
+    print("Testing Complete")
+    print("=" * 50)
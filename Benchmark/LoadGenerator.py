@@ -0,0 +1,172 @@
+"""
+Closed-loop concurrent load generator
+Runs N workers (threads or processes), each with its own connection, that
+repeat one of the scalability-test operations (read / write / query) as fast
+as they can for a fixed duration. Every concurrency level reports ops/sec and
+latency percentiles, so the throughput knee and saturation point of each
+engine show up in one table.
+
+Usage:
+  python LoadGenerator.py --engines cockroachdb --concurrency 1 2 4 8 16 32
+  python LoadGenerator.py --mode process --duration 30 --operations read query
+"""
+
+import argparse
+import multiprocessing
+import queue
+import threading
+import time
+
+from Adapters import ADAPTERS, DATASETS, make_operation, open_adapter
+from Histogram import LatencyHistogram, REPORT_PERCENTILES
+
+OPERATIONS = ['read', 'write', 'query']
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+def worker(engine_name, operation, dataset, duration, worker_id, barrier, results, options=None):
+    """Connect, wait for every other worker, then loop until the deadline"""
+    histogram = LatencyHistogram()
+    ops = 0
+    errors = 0
+
+    try:
+        adapter = open_adapter(engine_name, **(options or {}))
+    except Exception:
+        # Release the other workers instead of leaving them at the barrier
+        barrier.abort()
+        results.put((0, 1, histogram))
+        raise
+    op = make_operation(adapter, operation, dataset, worker_id)
+
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        adapter.close()
+        results.put((0, 0, histogram))
+        return
+
+    clock = time.perf_counter_ns
+    deadline = clock() + int(duration * 1e9)
+    try:
+        while True:
+            start = clock()
+            if start >= deadline:
+                break
+            try:
+                op()
+            except Exception:
+                errors += 1
+                continue
+            histogram.record(clock() - start)
+            ops += 1
+    finally:
+        adapter.close()
+        results.put((ops, errors, histogram))
+
+
+def run_level(engine_name, operation, dataset, concurrency, duration, mode='thread', options=None):
+    """Run one concurrency level and return (ops_per_sec, errors, histogram).
+
+    `options` are adapter options for every worker, or a list of them handed
+    out round-robin (e.g. one url per cluster node).
+    """
+    if not isinstance(options, list):
+        options = [options]
+    if mode == 'process':
+        barrier = multiprocessing.Barrier(concurrency)
+        results = multiprocessing.Queue()
+        spawn = multiprocessing.Process
+    else:
+        barrier = threading.Barrier(concurrency)
+        results = queue.Queue()
+        spawn = threading.Thread
+
+    workers = [
+        spawn(target=worker, args=(engine_name, operation, dataset, duration, i, barrier, results,
+                                   options[i % len(options)]))
+        for i in range(concurrency)
+    ]
+    for w in workers:
+        w.start()
+
+    total_ops = 0
+    total_errors = 0
+    histogram = LatencyHistogram()
+    for _ in workers:
+        ops, errors, worker_histogram = results.get()
+        total_ops += ops
+        total_errors += errors
+        histogram.merge(worker_histogram)
+    for w in workers:
+        w.join()
+
+    return total_ops / duration, total_errors, histogram
+
+
+def find_knee(rows, min_gain=0.10):
+    """Return (knee, saturation) concurrency levels for one list of results.
+
+    The knee is the last level after which doubling the clients adds less than
+    `min_gain` throughput; saturation is the level with the highest ops/sec.
+    """
+    saturation = max(rows, key=lambda r: r['ops_per_sec'])['concurrency']
+    knee = rows[-1]['concurrency']
+    for prev, cur in zip(rows, rows[1:]):
+        if prev['ops_per_sec'] > 0 and cur['ops_per_sec'] < prev['ops_per_sec'] * (1 + min_gain):
+            knee = prev['concurrency']
+            break
+    return knee, saturation
+
+
+def print_results(title, rows):
+    percentiles = [f"p{p:g}" for p in REPORT_PERCENTILES]
+    print(f"\n{title}")
+    print(f"  {'clients':>7} {'ops/sec':>11}" + ''.join(f"{p + ' ms':>11}" for p in percentiles)
+          + f"{'errors':>8}")
+    for r in rows:
+        summary = r['histogram'].summary()
+        print(f"  {r['concurrency']:>7} {r['ops_per_sec']:>11,.1f}"
+              + ''.join(f"{summary[p]:>11.3f}" for p in percentiles) + f"{r['errors']:>8}")
+    knee, saturation = find_knee(rows)
+    print(f"  -> knee at {knee} clients, peak throughput at {saturation} clients")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Closed-loop throughput vs. concurrency test")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--concurrency', nargs='+', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per level")
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread')
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Closed-Loop Load Generator")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        for dataset in datasets:
+            for operation in args.operations:
+                rows = []
+                for concurrency in args.concurrency:
+                    print(f"  {engine_name} {dataset['data_size']} {operation}: "
+                          f"{concurrency} clients for {args.duration:g}s...")
+                    ops_per_sec, errors, histogram = run_level(
+                        engine_name, operation, dataset, concurrency, args.duration, args.mode
+                    )
+                    rows.append({'concurrency': concurrency, 'ops_per_sec': ops_per_sec,
+                                 'errors': errors, 'histogram': histogram})
+                print_results(f"{engine_name} {dataset['data_size']} - {operation}", rows)
+
+            # Remove the rows the write workload added
+            adapter = open_adapter(engine_name)
+            adapter.cleanup(dataset)
+            adapter.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
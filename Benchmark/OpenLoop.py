@@ -0,0 +1,166 @@
+"""
+Open-loop constant-arrival-rate driver
+Schedules operations at a fixed target rate (e.g. 500, 1000, 5000 ops/s)
+regardless of how fast the server answers. Operation i is due at
+start + i / rate; its latency is measured from that intended start time, not
+from when a worker actually got to send it, so time spent queued behind a
+slow server is counted (coordinated-omission correction).
+
+The rate is ramped until p99 breaks the SLO or the engine can no longer keep
+up (it completes fewer ops per second of wall time than the target, counting
+the time to drain its backlog); the last passing rate is the maximum
+sustainable throughput.
+
+Usage:
+  python OpenLoop.py --engines cockroachdb --operation query --slo-ms 50
+  python OpenLoop.py --rates 500 1000 2000 5000 --duration 20 --workers 128
+"""
+
+import argparse
+import itertools
+import threading
+import time
+
+from Adapters import ADAPTERS, DATASETS, make_operation, open_adapter
+from Histogram import LatencyHistogram
+from LoadGenerator import OPERATIONS
+
+DEFAULT_RATES = [100, 250, 500, 1000, 2000, 5000, 10000]
+
+# A rate counts as "kept up" if the ops completed per second of wall time,
+# including draining the backlog after the last one was due, reach at least
+# this share of the target. Every scheduled op is waited for, so comparing
+# counts alone would pass an overloaded engine too.
+MIN_ACHIEVED_SHARE = 0.95
+
+
+def run_rate(engine_name, operation, dataset, rate, duration, workers):
+    """Drive one target rate and return a dict of results.
+
+    `corrected` holds latency from the intended start (what a user sees),
+    `service` holds latency from the actual send (what a closed-loop client
+    would have reported).
+    """
+    adapters = [open_adapter(engine_name) for _ in range(workers)]
+    corrected = [LatencyHistogram() for _ in range(workers)]
+    service = [LatencyHistogram() for _ in range(workers)]
+    errors = [0] * workers
+
+    total_ops = int(rate * duration)
+    interval_ns = 1e9 / rate
+    schedule = itertools.count()
+    start_ns = time.perf_counter_ns() + 50_000_000  # give every thread time to start
+
+    def worker(k):
+        op = make_operation(adapters[k], operation, dataset, k)
+        clock = time.perf_counter_ns
+        while True:
+            i = next(schedule)
+            if i >= total_ops:
+                break
+            intended = start_ns + int(i * interval_ns)
+            now = clock()
+            if now < intended:
+                time.sleep((intended - now) / 1e9)
+            sent = clock()
+            try:
+                op()
+            except Exception:
+                errors[k] += 1
+                continue
+            done = clock()
+            corrected[k].record(done - intended)
+            service[k].record(done - sent)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+
+    for adapter in adapters:
+        adapter.close()
+
+    corrected_total = LatencyHistogram()
+    service_total = LatencyHistogram()
+    for h in corrected:
+        corrected_total.merge(h)
+    for h in service:
+        service_total.merge(h)
+
+    return {
+        'rate': rate,
+        'scheduled': total_ops,
+        'completed': corrected_total.total,
+        'errors': sum(errors),
+        'achieved': corrected_total.total / elapsed if elapsed > 0 else 0,
+        'corrected': corrected_total,
+        'service': service_total,
+    }
+
+
+def ramp(engine_name, operation, dataset, rates, duration, workers, slo_ms):
+    """Try each rate in turn until the p99 SLO is violated"""
+    rows = []
+    sustainable = None
+    for rate in rates:
+        print(f"  {engine_name} {dataset['data_size']} {operation}: {rate:,} ops/s for {duration:g}s...")
+        result = run_rate(engine_name, operation, dataset, rate, duration, workers)
+        p99 = result['corrected'].percentile(99) / 1e6
+        result['passed'] = (p99 <= slo_ms and result['errors'] == 0
+                            and result['achieved'] >= rate * MIN_ACHIEVED_SHARE)
+        rows.append(result)
+        if not result['passed']:
+            break
+        sustainable = rate
+    return rows, sustainable
+
+
+def print_results(title, rows, sustainable, slo_ms):
+    print(f"\n{title}")
+    print(f"  {'target/s':>9} {'achieved/s':>11} {'p50 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9} "
+          f"{'svc p99 ms':>11} {'errors':>7}  SLO")
+    for r in rows:
+        c = r['corrected'].summary()
+        s = r['service'].summary()
+        print(f"  {r['rate']:>9,} {r['achieved']:>11,.1f} {c['p50']:>9.3f} {c['p99']:>9.3f} "
+              f"{c['p99.9']:>9.3f} {s['p99']:>11.3f} {r['errors']:>7}  {'ok' if r['passed'] else 'FAIL'}")
+    if sustainable is None:
+        print(f"  -> no tested rate met p99 <= {slo_ms:g} ms")
+    else:
+        print(f"  -> max sustainable throughput: {sustainable:,} ops/s at p99 <= {slo_ms:g} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Open-loop constant-arrival-rate test")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operation', choices=OPERATIONS + ['update'], default='read')
+    parser.add_argument('--rates', nargs='+', type=int, default=DEFAULT_RATES)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per rate")
+    parser.add_argument('--workers', type=int, default=64,
+                        help="connections available to absorb queued operations")
+    parser.add_argument('--slo-ms', type=float, default=50.0, help="p99 latency target")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Open-Loop Load Test")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        for dataset in datasets:
+            rows, sustainable = ramp(engine_name, args.operation, dataset, sorted(args.rates),
+                                     args.duration, args.workers, args.slo_ms)
+            print_results(f"{engine_name} {dataset['data_size']} - {args.operation}",
+                          rows, sustainable, args.slo_ms)
+            if args.operation == 'write':
+                adapter = open_adapter(engine_name)
+                adapter.cleanup(dataset)
+                adapter.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
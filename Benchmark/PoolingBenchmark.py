@@ -0,0 +1,106 @@
+"""
+Connection pooling and prepared statement benchmark
+Times the same operations three ways per engine:
+
+  connect per op     a new connection / client for every operation, as the
+                     import and test scripts used to do
+  pooled             one pooled connection, statements sent as plain SQL
+  pooled + prepared  pooled connection plus PREPARE / EXECUTE on CockroachDB
+                     (cached collections and filter documents on MongoDB)
+
+The p50 differences between the rows separate connection setup cost and
+per-statement parse / plan cost from execution cost.
+
+Usage:
+  python PoolingBenchmark.py --engines cockroachdb --iterations 500
+  python PoolingBenchmark.py --engines sqlite          (offline, needs --load)
+"""
+
+import argparse
+
+from Adapters import ADAPTERS, DATASETS, make_operation, open_adapter
+from Histogram import summary_header, summary_row
+from LatencyHarness import measure
+from RunBenchmark import load_dataset
+
+OPERATIONS = ['update', 'read', 'query']
+
+VARIANTS = [
+    ('connect per op', {'pooled': False, 'prepared': False}, True),
+    ('pooled', {'pooled': True, 'prepared': False}, False),
+    ('pooled + prepared', {'pooled': True, 'prepared': True}, False),
+]
+
+
+def reconnecting_operation(engine_name, operation, dataset, options):
+    """Open a fresh adapter, run one operation and close it again"""
+    def run():
+        adapter = open_adapter(engine_name, **options)
+        try:
+            make_operation(adapter, operation, dataset)()
+        finally:
+            adapter.close()
+    return run
+
+
+def run(engine_name, dataset, operations, warmup, iterations):
+    """Return {(operation, variant): histogram}"""
+    results = {}
+    for variant, options, reconnect in VARIANTS:
+        adapter = None if reconnect else open_adapter(engine_name, **options)
+        try:
+            for operation in operations:
+                print(f"  {engine_name} {dataset['data_size']} {operation}: {variant}...")
+                if reconnect:
+                    op = reconnecting_operation(engine_name, operation, dataset, options)
+                else:
+                    op = make_operation(adapter, operation, dataset)
+                results[(operation, variant)] = measure(op, warmup, iterations)
+        finally:
+            if adapter is not None:
+                adapter.close()
+    return results
+
+
+def print_results(title, results, operations):
+    print(f"\n{title}")
+    print(summary_header(32))
+    for operation in operations:
+        for variant, _, _ in VARIANTS:
+            print(summary_row(f"{operation} - {variant}", results[(operation, variant)], 32))
+
+    print(f"\n  {'operation':<10} {'connect ms':>11} {'parse/plan ms':>14} {'execute ms':>11}")
+    for operation in operations:
+        fresh, pooled, prepared = (results[(operation, v)].percentile(50) / 1e6 for v, _, _ in VARIANTS)
+        print(f"  {operation:<10} {fresh - pooled:>11.3f} {pooled - prepared:>14.3f} {prepared:>11.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency with and without pooling / preparation")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Pooling / Prepared Statement Benchmark")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        # Keeps a shared SQLite in-memory database alive between adapters
+        anchor = open_adapter(engine_name)
+        for dataset in datasets:
+            if args.load:
+                load_dataset(anchor, dataset)
+            results = run(engine_name, dataset, args.operations, args.warmup, args.iterations)
+            print_results(f"{anchor.name} {dataset['data_size']}", results, args.operations)
+        anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
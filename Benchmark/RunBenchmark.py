@@ -0,0 +1,152 @@
+"""
+Unified benchmark driver
+Runs one workload - the same point update, range read, filtered query and
+batch insert - against every engine through the adapters in Adapters.py, so
+the numbers compare the same logical operations.
+
+The sqlite adapter needs no server and is meant for offline runs:
+  python RunBenchmark.py --adapters sqlite --load --datasets 10K 100K
+
+Against the real engines (data already imported):
+  python RunBenchmark.py --adapters cockroachdb mongodb --iterations 1000
+
+--overhead times each operation through the adapter and through the raw
+SQLite cursor, to check the adapter layer itself adds almost nothing.
+"""
+
+import argparse
+import os
+import time
+
+from Adapters import ADAPTERS, DATASET_DIR, DATASETS, make_operation, open_adapter, read_rows
+from Histogram import summary_header, summary_row
+from LatencyHarness import measure
+
+OPERATIONS = ['update', 'read', 'query', 'write']
+
+
+def load_dataset(adapter, dataset):
+    """Bulk load one dataset file, skipping it if the file is not there"""
+    path = os.path.join(DATASET_DIR, dataset['file'])
+    if not os.path.exists(path):
+        print(f"  ✗ {dataset['file']} not found, skipping load")
+        return 0
+    start = time.perf_counter()
+    count = adapter.bulk_load(dataset, read_rows(path))
+    elapsed = time.perf_counter() - start
+    print(f"  ✓ {adapter.name}: loaded {count:,} rows into {dataset['table']} "
+          f"in {elapsed:.2f}s ({count / elapsed:,.0f} rows/sec)")
+    return count
+
+
+def run(adapter_names, datasets, operations, warmup, iterations, load=False):
+    results = []
+    for adapter_name in adapter_names:
+        adapter = open_adapter(adapter_name)
+        try:
+            for dataset in datasets:
+                if load:
+                    load_dataset(adapter, dataset)
+                for operation in operations:
+                    print(f"  {adapter.name} {dataset['data_size']} {operation}...")
+                    histogram = measure(make_operation(adapter, operation, dataset), warmup, iterations)
+                    results.append((adapter.name, dataset['data_size'], operation, histogram))
+                adapter.cleanup(dataset)
+        finally:
+            adapter.close()
+    return results
+
+
+def measure_overhead(dataset, iterations=20000):
+    """Compare each SQLite operation via the adapter against the raw cursor.
+
+    Returns {operation: (adapter_ns, direct_ns)} using the median of
+    interleaved rounds so both sides see the same cache state.
+    """
+    adapter = open_adapter('sqlite')
+    table = dataset['table']
+    cur = adapter.conn.cursor()
+
+    def direct_update():
+        cur.execute(f"""
+                UPDATE {table} SET traininghours = 5
+                WHERE rowid = (SELECT rowid FROM {table} WHERE department = 'Finance' LIMIT 1)
+            """)
+
+    def direct_read():
+        cur.execute(f"SELECT * FROM {table} LIMIT ?", (100,))
+        return cur.fetchall()
+
+    def direct_query():
+        cur.execute(f"SELECT * FROM {table} WHERE department = ? LIMIT ?", ('Finance', 50))
+        return cur.fetchall()
+
+    pairs = {
+        'update': (make_operation(adapter, 'update', dataset), direct_update),
+        'read': (make_operation(adapter, 'read', dataset), direct_read),
+        'query': (make_operation(adapter, 'query', dataset), direct_query),
+    }
+
+    results = {}
+    rounds = 11
+    per_round = max(1, iterations // rounds)
+    clock = time.perf_counter_ns
+    for name, (via_adapter, direct) in pairs.items():
+        adapter_times, direct_times = [], []
+        for _ in range(rounds):
+            for fn, times in ((via_adapter, adapter_times), (direct, direct_times)):
+                start = clock()
+                for _ in range(per_round):
+                    fn()
+                times.append((clock() - start) / per_round)
+        results[name] = (sorted(adapter_times)[rounds // 2], sorted(direct_times)[rounds // 2])
+
+    cur.close()
+    adapter.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one workload against every engine")
+    parser.add_argument('--adapters', nargs='+', choices=list(ADAPTERS), default=list(ADAPTERS))
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    parser.add_argument('--overhead', action='store_true', help="measure adapter overhead on SQLite")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Unified Benchmark")
+    print("=" * 60)
+
+    # Keep one SQLite connection open so the shared in-memory database
+    # survives between adapters
+    anchor = open_adapter('sqlite') if 'sqlite' in args.adapters or args.overhead else None
+
+    results = run(args.adapters, datasets, args.operations, args.warmup, args.iterations, args.load)
+
+    print("\n" + summary_header(36))
+    for adapter_name, data_size, operation, histogram in results:
+        print(summary_row(f"{adapter_name} {data_size} {operation}", histogram, 36))
+
+    if args.overhead:
+        dataset = datasets[0]
+        if not args.load or 'sqlite' not in args.adapters:
+            load_dataset(anchor, dataset)
+        print(f"\nAdapter overhead (SQLite, {dataset['data_size']})")
+        print(f"  {'operation':<10} {'adapter us':>11} {'direct us':>11} {'overhead us':>12} {'overhead':>9}")
+        for name, (via_adapter, direct) in measure_overhead(dataset).items():
+            extra = via_adapter - direct
+            print(f"  {name:<10} {via_adapter / 1000:>11.2f} {direct / 1000:>11.2f} "
+                  f"{extra / 1000:>12.2f} {extra / direct:>9.1%}")
+
+    if anchor is not None:
+        anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,190 @@
+"""
+Streaming full-scan benchmark
+The read tests fetch LIMIT 100 rows with fetchall() / list(find()), but batch
+jobs scan whole tables, and materializing 500K+ rows that way costs client
+memory in proportion to the table. This scans each table completely:
+
+  fetchall    everything materialized client-side first (the old way)
+  stream N    CockroachDB named (server-side) cursor with itersize N,
+              MongoDB cursor with batch_size N, SQLite fetchmany(N)
+
+and reports rows/sec, time to first row and the peak client RSS the scan
+added. Every configuration runs in a fresh process, and the resident size
+is sampled during the scan (psutil, or /proc/self/statm on Linux) against
+the size just before it; where neither is available the column shows '-'.
+
+SQLite needs a database file here instead of the shared in-memory one,
+because the scans run in other processes.
+
+Usage:
+  python ScanBenchmark.py --engines cockroachdb mongodb --fetch-sizes 100 1000 10000
+  python ScanBenchmark.py --engines sqlite --load --datasets 10K 100K
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from Adapters import ADAPTERS, DATASETS, open_adapter
+from RunBenchmark import load_dataset
+
+DEFAULT_FETCH_SIZES = [100, 1000, 10000, 100000]
+
+
+# Interval between resident size samples during a scan
+SAMPLE_SECONDS = 0.005
+
+# Longest wait for a scan process that has exited to deliver its result
+RESULT_GRACE_SECONDS = 5
+
+
+def current_rss_bytes():
+    """Resident set size of this process now, or None where it cannot be read"""
+    try:
+        import psutil
+    except ImportError:
+        pass
+    else:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class RssSampler(threading.Thread):
+    """Tracks the highest resident size seen until stop()"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = current_rss_bytes()
+        self.done = threading.Event()
+
+    def sample(self):
+        rss = current_rss_bytes()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+    def run(self):
+        while not self.done.wait(SAMPLE_SECONDS):
+            self.sample()
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        self.sample()
+        return self.peak
+
+
+def scan(engine_name, options, dataset, fetch_size, results):
+    """Child process: scan the table once and report what it cost"""
+    adapter = None
+    try:
+        adapter = open_adapter(engine_name, **options)
+        baseline = current_rss_bytes()
+        sampler = RssSampler() if baseline is not None else None
+        if sampler:
+            sampler.start()
+        clock = time.perf_counter
+        start = clock()
+        first_row = None
+        rows = 0
+        for _ in adapter.stream_rows(dataset, fetch_size):
+            if first_row is None:
+                first_row = clock() - start
+            rows += 1
+        elapsed = clock() - start
+        peak = sampler.stop() if sampler else None
+        results.put({
+            'fetch_size': fetch_size,
+            'rows': rows,
+            'seconds': elapsed,
+            'first_row': first_row if first_row is not None else elapsed,
+            'rss_added': max(0, peak - baseline) if peak is not None else None,
+        })
+    except Exception as e:
+        results.put({'fetch_size': fetch_size, 'error': str(e)})
+    finally:
+        if adapter is not None:
+            adapter.close()
+
+
+def wait_result(child, results, fetch_size):
+    """The child's result, or an error once it has exited without one"""
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if child.is_alive():
+                continue
+        try:
+            return results.get(timeout=RESULT_GRACE_SECONDS)
+        except queue.Empty:
+            return {'fetch_size': fetch_size, 'error': f"scan process exited with code {child.exitcode}"}
+
+
+def run(engine_name, dataset, fetch_sizes, options):
+    # spawn, so no child inherits the parent's memory or connections
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for fetch_size in [None] + fetch_sizes:
+        label = 'fetchall' if fetch_size is None else f"stream {fetch_size:,}"
+        print(f"  {engine_name} {dataset['data_size']} {label}...")
+        results_queue = context.Queue()
+        child = context.Process(target=scan, args=(engine_name, options, dataset, fetch_size, results_queue))
+        child.start()
+        result = wait_result(child, results_queue, fetch_size)
+        child.join()
+        results.append(result)
+    return results
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"  {'fetch':<16} {'rows':>10} {'rows/sec':>12} {'first row ms':>13} {'peak RSS MB':>12}")
+    for r in results:
+        label = 'fetchall' if r['fetch_size'] is None else f"stream {r['fetch_size']:,}"
+        if 'error' in r:
+            print(f"  {label:<16} ✗ {r['error']}")
+            continue
+        rate = r['rows'] / r['seconds'] if r['seconds'] > 0 else 0
+        rss = f"{r['rss_added'] / 2 ** 20:.1f}" if r['rss_added'] is not None else '-'
+        print(f"  {label:<16} {r['rows']:>10,} {rate:>12,.0f} {r['first_row'] * 1000:>13.2f} {rss:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-table scans: rows/sec, first row, client memory")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--fetch-sizes', nargs='+', type=int, default=DEFAULT_FETCH_SIZES)
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    parser.add_argument('--sqlite-file', help="SQLite database file (default: a temporary file)")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("Streaming Scan Benchmark")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        options = {}
+        if engine_name == 'sqlite':
+            path = args.sqlite_file or os.path.join(tempfile.mkdtemp(), 'scan.db')
+            options['url'] = f"file:{path}"
+        anchor = open_adapter(engine_name, **options)
+        for dataset in datasets:
+            if args.load:
+                load_dataset(anchor, dataset)
+            results = run(engine_name, dataset, args.fetch_sizes, options)
+            print_results(f"{anchor.name} {dataset['data_size']}", results)
+        anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,249 @@
+"""
+Dataset-size sweep with complexity-curve fitting
+Three hand-picked sizes cannot show how an operation scales. This generates
+log-spaced datasets (10K to 10M rows by default) with
+Datasets/GenerateDataset.py, bulk loads each into a scratch table /
+collection, and times every operation over several trials.
+
+Per operation the trial medians are fitted against three models
+
+  constant   t = a
+  log        t = a + b * ln(n)
+  linear     t = a + b * n
+
+and the model with the lowest BIC is reported with a 95% confidence
+interval on b. An operation is flagged when its best model grows faster
+than EXPECTED_SCALING, the interval on b excludes zero and the fitted
+latency grows by more than MIN_GROWTH across the swept sizes.
+
+Usage:
+  python SizeSweep.py --engines cockroachdb mongodb --trials 5
+  python SizeSweep.py --engines sqlite --sizes 10000 30000 100000 --trials 3 --plot sweep.png
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from Adapters import ADAPTERS, DATASET_DIR, make_operation, open_adapter, read_rows
+from LatencyHarness import measure
+
+sys.path.insert(0, DATASET_DIR)
+from GenerateDataset import dataset_path, generate  # noqa: E402
+
+OPERATIONS = ['update', 'read', 'query', 'write']
+
+# Slowest growth each operation should show; anything steeper is flagged
+EXPECTED_SCALING = {
+    'update': 'constant',   # first Finance row, LIMIT 1
+    'read': 'constant',     # LIMIT 100 from the start of the table
+    'query': 'constant',    # department filter, LIMIT 50
+    'write': 'log',         # 10-row insert, index maintenance at most
+}
+
+MODELS = {
+    'constant': None,
+    'log': np.log,
+    'linear': lambda n: n,
+}
+MODEL_ORDER = list(MODELS)
+
+# Fitted growth from the smallest to the largest size below this is noise
+MIN_GROWTH = 0.2
+
+# Two-sided 95% Student t quantiles by degrees of freedom (1.96 beyond 30)
+T_975 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+         8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042}
+
+
+def default_sizes(low=10_000, high=10_000_000, points=7):
+    """Log-spaced row counts, rounded to 2 significant figures"""
+    sizes = []
+    for n in np.geomspace(low, high, points):
+        digits = int(math.floor(math.log10(n))) - 1
+        sizes.append(int(round(n, -digits)))
+    return sizes
+
+
+def sweep_dataset(rows):
+    path = dataset_path(rows, 'csv')
+    return {"data_size": f"{rows:,}", "table": f"sweep_{rows}", "collection": f"SWEEP_{rows}",
+            "file": os.path.basename(path), "rows": rows}
+
+
+def t_quantile(dof):
+    if dof <= 0:
+        return float('inf')
+    eligible = [d for d in T_975 if d <= dof]
+    return T_975[max(eligible)] if dof <= 30 else 1.96
+
+
+def fit_models(sizes, values):
+    """Fit every model by least squares; return {model: fit dict} plus the best model name"""
+    x = np.asarray(sizes, dtype=float)
+    y = np.asarray(values, dtype=float)
+    n = len(x)
+    fits = {}
+    for name, basis in MODELS.items():
+        columns = [np.ones(n)] if basis is None else [np.ones(n), basis(x)]
+        X = np.column_stack(columns)
+        coef, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+        rss = float(np.sum((y - X @ coef) ** 2))
+        k = X.shape[1]
+        fit = {'coef': coef.tolist(), 'rss': rss,
+               'bic': n * math.log(max(rss, 1e-300) / n) + k * math.log(n)}
+        if k == 2 and n > k:
+            sigma2 = rss / (n - k)
+            se = math.sqrt(sigma2 * np.linalg.inv(X.T @ X)[1, 1])
+            half = t_quantile(n - k) * se
+            fit['slope_ci'] = (coef[1] - half, coef[1] + half)
+        fits[name] = fit
+    best = min(fits, key=lambda m: fits[m]['bic'])
+    return fits, best
+
+
+def predict(fit, model, n):
+    coef = fit['coef']
+    return coef[0] if model == 'constant' else coef[0] + coef[1] * MODELS[model](n)
+
+
+def is_worse(operation, best, fits, sizes):
+    """True when the best model grows faster than expected, significantly and noticeably"""
+    expected = EXPECTED_SCALING[operation]
+    if MODEL_ORDER.index(best) <= MODEL_ORDER.index(expected):
+        return False
+    low, _ = fits[best].get('slope_ci', (0, 0))
+    first = predict(fits[best], best, min(sizes))
+    last = predict(fits[best], best, max(sizes))
+    return low > 0 and last - first > MIN_GROWTH * max(first, 1e-9)
+
+
+def prepare(rows):
+    """Generate the CSV for `rows` unless it is already there"""
+    path = dataset_path(rows, 'csv')
+    if not os.path.exists(path):
+        generate(rows, 'csv')
+    return path
+
+
+def run(engine_name, sizes, operations, trials, warmup, iterations, keep=False):
+    """Return {operation: {rows: [trial p50 in ms, ...]}}"""
+    results = {op: {} for op in operations}
+    adapter = open_adapter(engine_name)
+    try:
+        for rows in sizes:
+            dataset = sweep_dataset(rows)
+            path = prepare(rows)
+            adapter.create_table(dataset)
+            start = time.perf_counter()
+            loaded = adapter.bulk_load(dataset, read_rows(path))
+            print(f"  ✓ {adapter.name}: loaded {loaded:,} rows into {dataset['table']} "
+                  f"in {time.perf_counter() - start:.2f}s")
+
+            for operation in operations:
+                op = make_operation(adapter, operation, dataset)
+                medians = []
+                for _ in range(trials):
+                    medians.append(measure(op, warmup, iterations).percentile(50) / 1e6)
+                results[operation][rows] = medians
+                print(f"    {operation:<7} p50 over {trials} trials: "
+                      + ', '.join(f"{m:.3f}" for m in medians) + " ms")
+
+            if not keep:
+                adapter.drop_table(dataset)
+    finally:
+        adapter.close()
+    return adapter.name, results
+
+
+def analyse(results):
+    """Fit each operation; return {operation: (fits, best, flagged)}"""
+    analysis = {}
+    for operation, by_size in results.items():
+        sizes = [rows for rows, medians in by_size.items() for _ in medians]
+        values = [m for medians in by_size.values() for m in medians]
+        fits, best = fit_models(sizes, values)
+        analysis[operation] = (fits, best, is_worse(operation, best, fits, sizes))
+    return analysis
+
+
+def print_results(title, results, analysis):
+    sizes = sorted({rows for by_size in results.values() for rows in by_size})
+    print(f"\n{title}: median p50 (ms)")
+    print(f"  {'operation':<10}" + ''.join(f"{rows:>12,}" for rows in sizes))
+    for operation, by_size in results.items():
+        print(f"  {operation:<10}" + ''.join(f"{np.median(by_size[rows]):>12.3f}" for rows in sizes))
+
+    print(f"\n  {'operation':<10} {'expected':<9} {'best fit':<9} {'slope (95% CI)':<46} verdict")
+    for operation, (fits, best, flagged) in analysis.items():
+        fit = fits[best]
+        if 'slope_ci' in fit:
+            low, high = fit['slope_ci']
+            unit = 'ms per ln(n)' if best == 'log' else 'ms per row'
+            slope = f"{fit['coef'][1]:.3g} [{low:.3g}, {high:.3g}] {unit}"
+        else:
+            slope = f"{fit['coef'][0]:.3f} ms"
+        verdict = "WORSE THAN EXPECTED" if flagged else "ok"
+        print(f"  {operation:<10} {EXPECTED_SCALING[operation]:<9} {best:<9} {slope:<46} {verdict}")
+
+
+def plot(path, all_results):
+    import matplotlib.pyplot as plt
+
+    operations = list(next(iter(all_results.values()))[0])
+    fig, axes = plt.subplots(1, len(operations), figsize=(5 * len(operations), 4), squeeze=False)
+    for ax, operation in zip(axes[0], operations):
+        for name, (results, analysis) in all_results.items():
+            by_size = results[operation]
+            sizes = sorted(by_size)
+            ax.plot(sizes, [np.median(by_size[rows]) for rows in sizes], 'o-', label=name)
+            fits, best, _ = analysis[operation]
+            x = np.geomspace(sizes[0], sizes[-1], 50)
+            y = np.broadcast_to(predict(fits[best], best, x), x.shape)
+            ax.plot(x, y, '--', alpha=0.5)
+        ax.set_xscale('log')
+        ax.set_xlabel('rows')
+        ax.set_ylabel('p50 latency (ms)')
+        ax.set_title(operation)
+        ax.grid(alpha=0.3, linestyle='--')
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    print(f"\nChart saved to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency vs. dataset size with curve fitting")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--sizes', nargs='+', type=int, default=default_sizes())
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--keep', action='store_true', help="keep the sweep tables afterwards")
+    parser.add_argument('--plot', metavar='PNG', help="save a latency vs. size chart")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Dataset Size Sweep")
+    print("=" * 60)
+    print(f"Sizes: {', '.join(f'{n:,}' for n in args.sizes)}")
+
+    all_results = {}
+    for engine_name in args.engines:
+        name, results = run(engine_name, sorted(args.sizes), args.operations, args.trials,
+                            args.warmup, args.iterations, args.keep)
+        analysis = analyse(results)
+        print_results(name, results, analysis)
+        all_results[name] = (results, analysis)
+
+    if args.plot:
+        plot(args.plot, all_results)
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -0,0 +1,253 @@
+"""
+YCSB-style workload mixes
+Instead of isolated read / write / query steps, every worker draws each
+operation from a weighted mix over the existing dbms* tables and DBMS*
+collections, with keys (employeeids) from a shared key chooser:
+
+  A  update heavy      50% read, 50% update                     zipfian
+  B  read mostly       95% read,  5% update                     zipfian
+  C  read only        100% read                                 zipfian
+  D  read latest       95% read,  5% insert                     latest
+  E  short ranges      95% scan (1-100 rows), 5% insert         zipfian
+  F  read-modify-write 50% read, 50% increment of one key       zipfian
+                       (adapter.increment_keys: read it, write it + 1,
+                       in one transaction)
+
+--distribution overrides the chooser of every mix. Inserted rows get ids
+from TEST_ID_BASE upwards, so adapter.cleanup() removes them afterwards;
+the 'latest' chooser sees them as the newest keys once they are committed.
+Each mix prints one report with total throughput and per-operation latency.
+
+Every keyed operation looks rows up by employeeid, so an index on it is
+created before the first mix (adapter.index_employeeid) and left in place.
+On MongoDB, workload F needs a replica set or sharded cluster for its
+transactions.
+
+On SQLite, writers take turns on the adapter's write lock, so update and
+insert latency there includes waiting for the other writers.
+
+Usage:
+  python Workloads.py --engines cockroachdb mongodb --workloads A B C --workers 16
+  python Workloads.py --engines sqlite --load --workloads A D E --duration 5
+"""
+
+import argparse
+import heapq
+import queue
+import random
+import threading
+import time
+
+from Adapters import ADAPTERS, DATASETS, TEST_ID_BASE, open_adapter, test_rows
+from Histogram import LatencyHistogram, REPORT_PERCENTILES
+from KeyChoosers import CHOOSERS, make_chooser
+from RunBenchmark import load_dataset
+
+WORKLOADS = {
+    'A': {'mix': {'read': 0.5, 'update': 0.5}, 'distribution': 'zipfian'},
+    'B': {'mix': {'read': 0.95, 'update': 0.05}, 'distribution': 'zipfian'},
+    'C': {'mix': {'read': 1.0}, 'distribution': 'zipfian'},
+    'D': {'mix': {'read': 0.95, 'insert': 0.05}, 'distribution': 'latest'},
+    'E': {'mix': {'scan': 0.95, 'insert': 0.05}, 'distribution': 'zipfian'},
+    'F': {'mix': {'read': 0.5, 'rmw': 0.5}, 'distribution': 'zipfian'},
+}
+
+MAX_SCAN_LENGTH = 100
+
+
+class KeySpace:
+    """Maps key ordinals to employeeids and hands out ids for inserts.
+
+    Ordinals 1..rows are the loaded employeeids; ordinal rows + n is the
+    n-th inserted row, stored as TEST_ID_BASE + n - 1. Shared by all workers.
+    Only inserts that committed, with none missing before them, count
+    towards latest(); the id of a failed insert is handed out again.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.inserted = 0
+        self.reserved = 0
+        self.released = []
+        self.committed_ahead = set()
+        self.lock = threading.Lock()
+
+    def key(self, ordinal):
+        return ordinal if ordinal <= self.rows else TEST_ID_BASE + ordinal - self.rows - 1
+
+    def latest(self):
+        return self.rows + self.inserted
+
+    def next_insert(self):
+        with self.lock:
+            if self.released:
+                n = heapq.heappop(self.released)
+            else:
+                self.reserved += 1
+                n = self.reserved
+            return TEST_ID_BASE + n - 1
+
+    def finish_insert(self, employeeid, committed):
+        n = employeeid - TEST_ID_BASE + 1
+        with self.lock:
+            if not committed:
+                heapq.heappush(self.released, n)
+                return
+            self.committed_ahead.add(n)
+            while self.inserted + 1 in self.committed_ahead:
+                self.inserted += 1
+                self.committed_ahead.remove(self.inserted)
+
+
+def make_operations(adapter, dataset, keyspace, chooser, rng):
+    """Zero-argument callables for every operation a mix can name"""
+    def key():
+        return keyspace.key(chooser.next())
+
+    def insert():
+        employeeid = keyspace.next_insert()
+        try:
+            adapter.insert_batch(dataset, test_rows(employeeid, 1))
+        except Exception:
+            keyspace.finish_insert(employeeid, committed=False)
+            raise
+        keyspace.finish_insert(employeeid, committed=True)
+
+    return {
+        'read': lambda: adapter.range_read(dataset, key(), 1),
+        'update': lambda: adapter.point_update(dataset, key()),
+        'insert': insert,
+        'scan': lambda: adapter.range_read(dataset, key(), rng.randint(1, MAX_SCAN_LENGTH)),
+        'rmw': lambda: adapter.increment_keys(dataset, [key()]),
+    }
+
+
+def worker(engine_name, dataset, mix, distribution, theta, keyspace, duration, worker_id,
+           barrier, results):
+    histograms = {name: LatencyHistogram() for name in mix}
+    errors = 0
+
+    try:
+        adapter = open_adapter(engine_name)
+    except Exception:
+        # Release the other workers instead of leaving them at the barrier
+        barrier.abort()
+        results.put((histograms, 1))
+        raise
+
+    options = {}
+    if distribution != 'uniform':
+        options['theta'] = theta
+    if distribution == 'latest':
+        options['latest'] = keyspace.latest
+    chooser = make_chooser(distribution, keyspace.rows, seed=worker_id, **options)
+    rng = random.Random(worker_id)
+    operations = make_operations(adapter, dataset, keyspace, chooser, rng)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    try:
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        clock = time.perf_counter_ns
+        deadline = clock() + int(duration * 1e9)
+        while True:
+            name = rng.choices(names, weights)[0]
+            start = clock()
+            if start >= deadline:
+                break
+            try:
+                operations[name]()
+            except Exception:
+                errors += 1
+                continue
+            histograms[name].record(clock() - start)
+    finally:
+        adapter.close()
+        results.put((histograms, errors))
+
+
+def run_workload(engine_name, dataset, workload, workers, duration, distribution=None, theta=0.99):
+    """Run one mix; return {'ops_per_sec', 'errors', 'histograms': {op: histogram}}"""
+    spec = WORKLOADS[workload]
+    distribution = distribution or spec['distribution']
+    keyspace = KeySpace(dataset['rows'])
+    barrier = threading.Barrier(workers)
+    results = queue.Queue()
+    threads = [
+        threading.Thread(target=worker, args=(engine_name, dataset, spec['mix'], distribution, theta,
+                                              keyspace, duration, i, barrier, results))
+        for i in range(workers)
+    ]
+    for t in threads:
+        t.start()
+
+    histograms = {name: LatencyHistogram() for name in spec['mix']}
+    total_errors = 0
+    for _ in threads:
+        worker_histograms, errors = results.get()
+        for name, histogram in worker_histograms.items():
+            histograms[name].merge(histogram)
+        total_errors += errors
+    for t in threads:
+        t.join()
+
+    total_ops = sum(h.total for h in histograms.values())
+    return {
+        'workload': workload,
+        'distribution': distribution,
+        'ops_per_sec': total_ops / duration,
+        'errors': total_errors,
+        'histograms': histograms,
+    }
+
+
+def print_report(title, result):
+    percentiles = [f"p{p:g}" for p in REPORT_PERCENTILES]
+    print(f"\n{title}: workload {result['workload']} ({result['distribution']} keys)")
+    print(f"  throughput {result['ops_per_sec']:,.1f} ops/sec, {result['errors']} errors")
+    print(f"  {'operation':<10} {'ops':>9}" + ''.join(f"{p + ' ms':>11}" for p in percentiles))
+    for name, histogram in result['histograms'].items():
+        summary = histogram.summary()
+        print(f"  {name:<10} {histogram.total:>9,}"
+              + ''.join(f"{summary[p]:>11.3f}" for p in percentiles))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="YCSB A-F style workload mixes")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--datasets', nargs='+', default=[d['data_size'] for d in DATASETS])
+    parser.add_argument('--workloads', nargs='+', choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--distribution', choices=list(CHOOSERS), help="override every mix's chooser")
+    parser.add_argument('--theta', type=float, default=0.99, help="zipfian / latest skew")
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds per mix")
+    parser.add_argument('--load', action='store_true', help="bulk load the CSV files first")
+    args = parser.parse_args()
+
+    datasets = [d for d in DATASETS if d['data_size'] in args.datasets]
+
+    print("=" * 60)
+    print("YCSB-style Workloads")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        # Keeps a shared SQLite in-memory database alive between adapters
+        anchor = open_adapter(engine_name)
+        for dataset in datasets:
+            if args.load:
+                load_dataset(anchor, dataset)
+            anchor.index_employeeid(dataset)
+            for workload in args.workloads:
+                print(f"  {anchor.name} {dataset['data_size']} workload {workload}...")
+                result = run_workload(engine_name, dataset, workload, args.workers, args.duration,
+                                      args.distribution, args.theta)
+                anchor.cleanup(dataset)
+                print_report(f"{anchor.name} {dataset['data_size']}", result)
+        anchor.close()
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
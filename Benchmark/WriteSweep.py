@@ -0,0 +1,131 @@
+"""
+Write batch-size sweep
+Replaces the fixed "insert 10 rows" write test with a sweep over batch sizes
+(1, 10, 100, 1K, 10K rows per batch) for every insert method an engine offers:
+
+  CockroachDB  multi-row INSERT ... VALUES, COPY ... FROM STDIN
+  MongoDB      insert_many, bulk_write of InsertOne
+  SQLite       executemany (offline stand-in)
+
+each in autocommit mode and inside an explicit transaction. Every setting
+reports rows/sec and per-batch latency; the best batch size per method is
+printed at the end.
+
+MongoDB transactions need a replica set or sharded cluster; on a standalone
+mongod those rows show up as errors.
+
+Usage:
+  python WriteSweep.py --engines cockroachdb mongodb
+  python WriteSweep.py --engines sqlite --batch-sizes 1 10 100 1000 --rows 20000
+"""
+
+import argparse
+import time
+
+from Adapters import ADAPTERS, DATASETS, TEST_ID_BASE, open_adapter, test_rows
+from Histogram import LatencyHistogram
+
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def sweep_one(adapter, dataset, method, transaction, batch_size, target_rows, min_batches, max_seconds):
+    """Insert batches of one size until enough rows or time; return a result dict"""
+    histogram = LatencyHistogram()
+    clock = time.perf_counter_ns
+    next_id = TEST_ID_BASE
+    rows = 0
+    errors = 0
+    batches = max(min_batches, -(-target_rows // batch_size))
+    deadline = clock() + int(max_seconds * 1e9)
+
+    started = clock()
+    for _ in range(batches):
+        batch = test_rows(next_id, batch_size)
+        next_id += batch_size
+        start = clock()
+        try:
+            adapter.insert_batch(dataset, batch, method=method, transaction=transaction)
+        except Exception:
+            errors += 1
+            continue
+        histogram.record(clock() - start)
+        rows += batch_size
+        if clock() >= deadline:
+            break
+    elapsed = (clock() - started) / 1e9
+
+    adapter.cleanup(dataset)
+    return {
+        'method': method,
+        'transaction': transaction,
+        'batch_size': batch_size,
+        'rows': rows,
+        'errors': errors,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else 0,
+        'histogram': histogram,
+    }
+
+
+def run(engine_name, dataset, batch_sizes, target_rows, min_batches, max_seconds):
+    adapter = open_adapter(engine_name)
+    results = []
+    try:
+        for method in adapter.INSERT_METHODS:
+            for transaction in (False, True):
+                for batch_size in batch_sizes:
+                    mode = 'txn' if transaction else 'autocommit'
+                    print(f"  {adapter.name} {method} {mode} batch {batch_size:,}...")
+                    results.append(sweep_one(adapter, dataset, method, transaction, batch_size,
+                                             target_rows, min_batches, max_seconds))
+    finally:
+        adapter.close()
+    return adapter.name, results
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"  {'method':<12} {'mode':<11} {'batch':>7} {'rows/sec':>12} {'p50 ms':>10} "
+          f"{'p99 ms':>10} {'max ms':>10} {'errors':>7}")
+    for r in results:
+        s = r['histogram'].summary()
+        mode = 'txn' if r['transaction'] else 'autocommit'
+        print(f"  {r['method']:<12} {mode:<11} {r['batch_size']:>7,} {r['rows_per_sec']:>12,.0f} "
+              f"{s['p50']:>10.3f} {s['p99']:>10.3f} {s['max']:>10.3f} {r['errors']:>7}")
+
+    print("\n  Best batch size:")
+    for method in dict.fromkeys(r['method'] for r in results):
+        for transaction in (False, True):
+            rows = [r for r in results if r['method'] == method and r['transaction'] == transaction
+                    and r['rows'] > 0]
+            if not rows:
+                continue
+            best = max(rows, key=lambda r: r['rows_per_sec'])
+            mode = 'txn' if transaction else 'autocommit'
+            print(f"    {method:<12} {mode:<11} {best['batch_size']:>7,} rows "
+                  f"({best['rows_per_sec']:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Insert throughput vs. batch size")
+    parser.add_argument('--engines', nargs='+', choices=list(ADAPTERS), default=['cockroachdb', 'mongodb'])
+    parser.add_argument('--dataset', default='10K', help="table / collection to write into")
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=DEFAULT_BATCH_SIZES)
+    parser.add_argument('--rows', type=int, default=50000, help="rows written per setting")
+    parser.add_argument('--min-batches', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=30.0, help="time cap per setting")
+    args = parser.parse_args()
+
+    dataset = next(d for d in DATASETS if d['data_size'] == args.dataset)
+
+    print("=" * 60)
+    print("Write Batch-Size Sweep")
+    print("=" * 60)
+
+    for engine_name in args.engines:
+        name, results = run(engine_name, dataset, args.batch_sizes, args.rows,
+                            args.min_batches, args.max_seconds)
+        print_results(f"{name} ({dataset['data_size']} table)", results)
+
+    print("\n" + "=" * 60)
+    print("Testing Complete")
+    print("=" * 60)
@@ -1,145 +1,412 @@
 """
 SIMPLE CockroachDB Data Import - COMPLETELY FIXED
 Proper connection management to avoid cursor issues
+
+Connections to latencyscalabilitytest come from one pool per process, so
+every step and every file reuses the same warm connections.
+
+Import modes:
+  copy    - stream the CSV through COPY ... FROM STDIN (fastest, default)
+  values  - multi-row INSERT ... VALUES with a configurable batch size
+  insert  - original one INSERT per row (kept for comparison)
+  upsert  - multi-row INSERT ... ON CONFLICT (employeeid) DO UPDATE, so
+            loading a row twice leaves one copy (adds a unique index on
+            employeeid unless the primary key already is one)
+
+Imports are checkpointed: each batch commits together with the byte offset
+it reached in import_checkpoints, so a failed or interrupted import picks
+up after the last committed batch when run again, a finished file is
+skipped, and a file that has grown only loads the appended rows.
+--restart truncates the tables and starts over. A file that changed in
+place (not just appended) or a table already holding rows without a
+checkpoint is only reloaded in upsert mode or with --restart.
+
+Primary key strategies (tables are created with this key):
+  rowid       - no PRIMARY KEY, CockroachDB adds a hidden sequential rowid
+                (original schema)
+  employeeid  - PRIMARY KEY (employeeid)
+  hash        - hash-sharded PRIMARY KEY (employeeid) USING HASH, spreads
+                sequential ids over several ranges (v22.1+)
+  uuid        - extra id UUID PRIMARY KEY DEFAULT gen_random_uuid()
+
+CREATE TABLE IF NOT EXISTS keeps an existing table, so drop the tables
+before switching strategy.
+
+Usage:
+  python ImportingData.py [copy|values|insert|upsert] [batch_size] [rowid|employeeid|hash|uuid] [--restart]
 """
 
 import psycopg2
-import csv
+import psycopg2.extras
+import psycopg2.pool
+import os
+import sys
 import time
+from contextlib import contextmanager
+
+DEFAULT_URL = "postgresql://root@localhost:26257/defaultdb?sslmode=disable"
+DATABASE_URL = "postgresql://root@localhost:26257/latencyscalabilitytest?sslmode=disable"
+
+# Folder holding the shipped CSV files (one level up from this script)
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Datasets')
+
+# Typed single-pass CSV reading shared with MongoDB/ImportingData.py
+sys.path.insert(0, DATASET_DIR)
+from CsvLoader import (  # noqa: E402
+    block_bytes_for, copy_buffer, fingerprint, read_blocks, read_header, to_rows
+)
+
+TABLES = ['dbms', 'dbms01', 'dbms02']
+
+COLUMNS = [
+    'employeeid', 'age', 'department', 'yearsexperience',
+    'performancescore', 'monthlysalary', 'traininghours', 'promotionlast5years'
+]
+
+IMPORT_MODES = ['copy', 'values', 'insert', 'upsert']
+DEFAULT_BATCH_SIZE = 10000
+
+KEY_STRATEGIES = ['rowid', 'employeeid', 'hash', 'uuid']
+
+# One row per loaded byte range of a file: [range_start, range_end) is
+# loaded up to byte_offset
+CHECKPOINT_DDL = """
+    CREATE TABLE IF NOT EXISTS import_checkpoints (
+        filename STRING NOT NULL,
+        table_name STRING NOT NULL,
+        range_start INT NOT NULL,
+        range_end INT NOT NULL,
+        byte_offset INT NOT NULL,
+        rows_loaded INT NOT NULL,
+        fingerprint STRING NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (filename, table_name, range_start)
+    )
+"""
+
+POOL_SIZE = 8
+_pool = None
+_pool_pid = None
+
+
+def resolve_dataset(filename):
+    """Return the path to a CSV, looking in the Datasets folder if needed"""
+    if os.path.exists(filename):
+        return filename
+    return os.path.join(DATASET_DIR, os.path.basename(filename))
+
+
+def get_pool():
+    """The connection pool for this process, created on first use"""
+    global _pool, _pool_pid
+    # A forked worker must not reuse its parent's sockets
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = psycopg2.pool.ThreadedConnectionPool(1, POOL_SIZE, DATABASE_URL)
+        _pool_pid = os.getpid()
+    return _pool
+
 
-print("=" * 60)
-print("CockroachDB Data Import")
-print("=" * 60)
-
-# Step 1: Create database
-print("\nStep 1: Creating database...")
-conn = psycopg2.connect("postgresql://root@localhost:26257/defaultdb?sslmode=disable")
-conn.autocommit = True
-cur = conn.cursor()
-cur.execute("CREATE DATABASE IF NOT EXISTS latencyscalabilitytest")
-print("✓ Database created")
-cur.close()
-conn.close()
-
-# Step 2: Create tables
-print("\nStep 2: Creating tables...")
-conn = psycopg2.connect("postgresql://root@localhost:26257/latencyscalabilitytest?sslmode=disable")
-conn.autocommit = True
-cur = conn.cursor()
-
-tables = ['dbms', 'dbms01', 'dbms02']
-for table in tables:
+@contextmanager
+def pooled_connection(autocommit=False):
+    """Borrow a connection to latencyscalabilitytest and give it back afterwards"""
+    pool = get_pool()
+    conn = pool.getconn()
+    conn.autocommit = autocommit
+    try:
+        yield conn
+    finally:
+        if not conn.closed and not autocommit:
+            # Never hand back a connection with an open transaction
+            conn.rollback()
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def create_database():
+    conn = psycopg2.connect(DEFAULT_URL)
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute("CREATE DATABASE IF NOT EXISTS latencyscalabilitytest")
+    print("✓ Database created")
+    cur.close()
+    conn.close()
+
+
+def table_ddl(table, key='rowid'):
+    """CREATE TABLE statement for one table under a primary key strategy"""
+    if key not in KEY_STRATEGIES:
+        raise ValueError(f"Unknown key strategy '{key}', expected one of {KEY_STRATEGIES}")
+
+    columns = [
+        'employeeid INT', 'age INT', 'department STRING', 'yearsexperience INT',
+        'performancescore INT', 'monthlysalary INT', 'traininghours INT',
+        'promotionlast5years STRING'
+    ]
+    if key == 'employeeid':
+        columns[0] = 'employeeid INT PRIMARY KEY'
+    elif key == 'hash':
+        columns[0] = 'employeeid INT NOT NULL'
+        columns.append('PRIMARY KEY (employeeid) USING HASH')
+    elif key == 'uuid':
+        columns.insert(0, 'id UUID PRIMARY KEY DEFAULT gen_random_uuid()')
+
+    return f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})"
+
+
+def create_tables(tables=TABLES, key='rowid'):
+    with pooled_connection(autocommit=True) as conn:
+        cur = conn.cursor()
+
+        for table in tables:
+            cur.execute(table_ddl(table, key))
+            print(f"✓ Table '{table}' created (key: {key})")
+        cur.execute(CHECKPOINT_DDL)
+
+        cur.close()
+
+
+def ensure_employeeid_key(cur, table_name):
+    """Upserts need a unique employeeid: the primary key, or else a unique index"""
     cur.execute(f"""
-        CREATE TABLE IF NOT EXISTS {table} (
-            employeeid INT,
-            age INT,
-            department STRING,
-            yearsexperience INT,
-            performancescore INT,
-            monthlysalary INT,
-            traininghours INT,
-            promotionlast5years STRING
-        )
+        SELECT index_name FROM [SHOW INDEXES FROM {table_name}]
+        WHERE NOT non_unique AND NOT storing AND NOT implicit
+        GROUP BY index_name
+        HAVING bool_and(column_name = 'employeeid' OR column_name LIKE 'crdb_internal_%shard%')
+           AND bool_or(column_name = 'employeeid')
     """)
-    print(f"✓ Table '{table}' created")
+    if cur.fetchone() is None:
+        print(f"  adding a unique index on {table_name}.employeeid for upserts")
+        cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_employeeid_key ON {table_name} (employeeid)")
 
-cur.close()
-conn.close()
 
-# Step 3: Import data - EACH FILE GETS ITS OWN CONNECTION
-print("\nStep 3: Importing data...")
+def resume_ranges(cur, path, table_name, mode, restart=False):
+    """Byte ranges of `path` still to load into table_name, from its checkpoints.
 
-def import_csv(filename, table_name):
-    print(f"\nImporting {filename} into {table_name}...")
-    
-    # NEW connection for this file
-    conn = psycopg2.connect("postgresql://root@localhost:26257/latencyscalabilitytest?sslmode=disable")
-    cur = conn.cursor()
-    
+    Returns None when there is nothing to resume (the caller plans fresh
+    ranges), otherwise a list of (start, offset, end, rows_loaded) ranges,
+    empty when the table is up to date. Raises ValueError when a reload
+    would duplicate rows.
+    """
+    name = os.path.basename(path)
+    if restart:
+        cur.execute(f"TRUNCATE {table_name}")
+        cur.execute("DELETE FROM import_checkpoints WHERE filename = %s AND table_name = %s",
+                    (name, table_name))
+        return None
+
+    cur.execute("""
+        SELECT range_start, byte_offset, range_end, rows_loaded, fingerprint
+        FROM import_checkpoints
+        WHERE filename = %s AND table_name = %s
+        ORDER BY range_start
+    """, (name, table_name))
+    checkpoints = cur.fetchall()
+    size = os.path.getsize(path)
+
+    if not checkpoints:
+        cur.execute(f"SELECT 1 FROM {table_name} LIMIT 1")
+        if cur.fetchone() is not None and mode != 'upsert':
+            raise ValueError(f"{table_name} already holds rows but has no checkpoint for {name}; "
+                             f"use upsert mode or --restart")
+        return None
+
+    last_end = max(c[2] for c in checkpoints)
+    if any(c[4] != fingerprint(path) for c in checkpoints) or size < last_end:
+        if mode != 'upsert':
+            raise ValueError(f"{name} changed since it was loaded into {table_name}; "
+                             f"use upsert mode or --restart")
+        # Upserts make reading the whole file again safe
+        cur.execute("DELETE FROM import_checkpoints WHERE filename = %s AND table_name = %s",
+                    (name, table_name))
+        return None
+
+    ranges = [c[:4] for c in checkpoints if c[1] < c[2]]
+    if size > last_end:
+        # Rows appended since the last import
+        ranges.append((last_end, last_end, size, 0))
+    return ranges
+
+
+def save_checkpoint(cur, path, table_name, byte_range, offset, rows_loaded, file_fingerprint):
+    start, _, end, _ = byte_range
+    cur.execute("""
+        UPSERT INTO import_checkpoints
+            (filename, table_name, range_start, range_end, byte_offset, rows_loaded, fingerprint, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, now())
+    """, (os.path.basename(path), table_name, start, end, offset, rows_loaded, file_fingerprint))
+
+
+def start_ranges(cur, path, table_name, ranges):
+    """Record every range before loading, so a crash before a range's first
+    batch still leaves it to resume"""
+    file_fingerprint = fingerprint(path)
+    for byte_range in ranges:
+        save_checkpoint(cur, path, table_name, byte_range, byte_range[1], byte_range[3], file_fingerprint)
+
+
+def load_range(conn, path, table_name, byte_range, mode, batch_size, header=None, progress=None):
+    """Load one (start, offset, end, rows_loaded) range from its offset.
+
+    Every batch is committed in the same transaction as its checkpoint, so
+    after a failure the range resumes exactly after the last committed
+    batch. progress(rows, seconds) is called after each batch. Returns the
+    rows loaded by this call.
+    """
+    start, offset, end, loaded = byte_range
+    file_fingerprint = fingerprint(path)
+    if header is None:
+        header = read_header(path)[0]
     count = 0
-    
+    cur = conn.cursor()
     try:
-        with open(filename, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            
-            for row in reader:
-                try:
-                    # Get values (handle any column name variations)
-                    emp_id = row.get('EmployeeID') or row.get(' EmployeeID') or row.get('EmployeeID ')
-                    age = row.get('Age') or row.get(' Age')
-                    dept = row.get('Department') or row.get(' Department')
-                    years = row.get('YearsExperience') or row.get(' YearsExperience')
-                    score = row.get('PerformanceScore') or row.get(' PerformanceScore')
-                    salary = row.get('MonthlySalary') or row.get(' MonthlySalary')
-                    training = row.get('TrainingHours') or row.get(' TrainingHours')
-                    promo = row.get('PromotionLast5Years') or row.get(' PromotionLast5Years')
-                    
-                    # Skip if critical fields are missing
-                    if not emp_id or not dept:
-                        continue
-                    
-                    # Insert the record
-                    cur.execute(f"""
-                        INSERT INTO {table_name} VALUES 
-                        (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        int(emp_id),
-                        int(age) if age else 0,
-                        str(dept).strip(),
-                        int(years) if years else 0,
-                        int(score) if score else 0,
-                        int(salary) if salary else 0,
-                        int(training) if training else 0,
-                        str(promo).strip() if promo else 'No'
-                    ))
-                    
-                    count += 1
-                    
-                    # Commit every 1000 records
-                    if count % 1000 == 0:
-                        conn.commit()
-                        print(f"  {count:,} records imported...")
-                        
-                except Exception as e:
-                    # Skip problematic rows
-                    continue
-        
-        # Final commit
-        conn.commit()
-        print(f"✓ {table_name}: Total {count:,} records imported")
-        
-    except Exception as e:
-        print(f"✗ Error importing {filename}: {e}")
-        
+        for columns, position in read_blocks(path, offset, end, header, block_bytes_for(path, batch_size)):
+            batch = to_rows(columns)
+            batch_start = time.perf_counter()
+            if batch:
+                load_batch(cur, table_name, batch, mode)
+            count += len(batch)
+            save_checkpoint(cur, path, table_name, byte_range, position, loaded + count, file_fingerprint)
+            conn.commit()
+            if progress is not None:
+                progress(len(batch), time.perf_counter() - batch_start)
     finally:
-        # Always close this file's connection
         cur.close()
-        conn.close()
-
-# Import all three datasets - each gets fresh connection
-import_csv('employee_performance_10000.csv', 'dbms')
-import_csv('employee_performance_100000__1_.csv', 'dbms01')  
-import_csv('employee_performance_500000.csv', 'dbms02')
-
-# Verify the import
-print("\n" + "=" * 60)
-print("Verifying import...")
-print("=" * 60)
-
-conn = psycopg2.connect("postgresql://root@localhost:26257/latencyscalabilitytest?sslmode=disable")
-cur = conn.cursor()
-
-for table in tables:
-    cur.execute(f"SELECT COUNT(*) FROM {table}")
-    count = cur.fetchone()[0]
-    print(f"  {table}: {count:,} records")
-
-cur.close()
-conn.close()
-
-print("\n" + "=" * 60)
-print("✓ ALL DONE! Data imported successfully!")
-print("=" * 60)
-print("\nNext steps:")
-print("  1. Run: python simple_latency_final.py")
-print("  2. Run: python simple_scalability_final.py")
+    return count
+
+
+def load_batch(cur, table_name, batch, mode):
+    """Send one batch to the database using the chosen import mode"""
+    if mode == 'copy':
+        cur.copy_expert(
+            f"COPY {table_name} ({', '.join(COLUMNS)}) FROM STDIN WITH CSV",
+            copy_buffer(batch)
+        )
+    elif mode == 'upsert':
+        updates = ', '.join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+        psycopg2.extras.execute_values(
+            cur,
+            f"INSERT INTO {table_name} ({', '.join(COLUMNS)}) VALUES %s "
+            f"ON CONFLICT (employeeid) DO UPDATE SET {updates}",
+            batch,
+            page_size=len(batch)
+        )
+    elif mode == 'values':
+        psycopg2.extras.execute_values(
+            cur,
+            f"INSERT INTO {table_name} ({', '.join(COLUMNS)}) VALUES %s",
+            batch,
+            page_size=len(batch)
+        )
+    else:
+        for record in batch:
+            cur.execute(f"""
+                INSERT INTO {table_name} ({', '.join(COLUMNS)}) VALUES
+                (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, record)
+
+
+def import_csv(filename, table_name, mode='copy', batch_size=DEFAULT_BATCH_SIZE, restart=False):
+    """Import one CSV file from its checkpoints, reporting rows/sec once per batch"""
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode '{mode}', expected one of {IMPORT_MODES}")
+
+    filename = resolve_dataset(filename)
+    print(f"\nImporting {filename} into {table_name} ({mode}, batch size {batch_size:,})...")
+
+    count = 0
+    batches = 0
+    start = time.perf_counter()
+
+    def report(rows, batch_time):
+        nonlocal count, batches
+        count += rows
+        batches += 1
+        print(f"  batch {batches:>4}: {rows:>7,} rows in {batch_time:.3f}s "
+              f"({rows / batch_time if batch_time > 0 else 0:>10,.0f} rows/sec), {count:,} total")
+
+    # Each file borrows its own pooled connection for the whole load
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        try:
+            header, data_start = read_header(filename)
+            ranges = resume_ranges(cur, filename, table_name, mode, restart)
+            if ranges is None:
+                ranges = [(data_start, data_start, os.path.getsize(filename), 0)]
+            elif not ranges:
+                print(f"✓ {table_name}: already up to date with {os.path.basename(filename)}")
+            else:
+                resumed = sum(r[1] - r[0] for r in ranges)
+                print(f"  resuming: {resumed:,} bytes already loaded, "
+                      f"{sum(r[2] - r[1] for r in ranges):,} to go")
+            start_ranges(cur, filename, table_name, ranges)
+            if mode == 'upsert':
+                ensure_employeeid_key(cur, table_name)
+            conn.commit()
+
+            for byte_range in ranges:
+                load_range(conn, filename, table_name, byte_range, mode, batch_size, header, report)
+
+            elapsed = time.perf_counter() - start
+            rate = count / elapsed if elapsed > 0 else 0
+            print(f"✓ {table_name}: Total {count:,} records imported in {elapsed:.2f}s "
+                  f"({rate:,.0f} rows/sec)")
+
+        except Exception as e:
+            conn.rollback()
+            print(f"✗ Error importing {filename}: {e}")
+            print("  Run again to resume after the last committed batch")
+
+        finally:
+            cur.close()
+
+    return count
+
+
+def verify_import(tables=TABLES):
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+
+        for table in tables:
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            count = cur.fetchone()[0]
+            print(f"  {table}: {count:,} records")
+
+        cur.close()
+
+
+if __name__ == "__main__":
+    restart = '--restart' in sys.argv[1:]
+    argv = [arg for arg in sys.argv[1:] if arg != '--restart']
+    mode = argv[0] if len(argv) > 0 else 'copy'
+    batch_size = int(argv[1]) if len(argv) > 1 else DEFAULT_BATCH_SIZE
+    key = argv[2] if len(argv) > 2 else 'rowid'
+
+    print("=" * 60)
+    print("CockroachDB Data Import")
+    print("=" * 60)
+
+    # Step 1: Create database
+    print("\nStep 1: Creating database...")
+    create_database()
+
+    # Step 2: Create tables
+    print("\nStep 2: Creating tables...")
+    create_tables(key=key)
+
+    # Step 3: Import data - EACH FILE GETS ITS OWN POOLED CONNECTION
+    print("\nStep 3: Importing data...")
+    import_csv('employee_performance_10000.csv', 'dbms', mode, batch_size, restart)
+    import_csv('employee_performance_100000__1_.csv', 'dbms01', mode, batch_size, restart)
+    import_csv('employee_performance_500000.csv', 'dbms02', mode, batch_size, restart)
+
+    # Verify the import
+    print("\n" + "=" * 60)
+    print("Verifying import...")
+    print("=" * 60)
+    verify_import()
+
+    print("\n" + "=" * 60)
+    print("✓ ALL DONE! Data imported successfully!")
+    print("=" * 60)
+    print("\nNext steps:")
+    print("  1. Run: python CockroachDBLatencyTest.py")
+    print("  2. Run: python CockroachDBScalabilityTest.py")
@@ -0,0 +1,201 @@
+"""
+PARALLEL CockroachDB Data Import
+Splits each CSV into byte-range shards aligned to line boundaries and loads
+every shard through its own connection in a process pool, so the cluster
+sees many concurrent writers instead of one serial client.
+
+Every shard keeps its own checkpoint (see ImportingData.py), so a re-run
+resumes the unfinished shards with the shard ranges of the first run, and
+loads rows appended to a file since as one more range.
+
+Usage:
+  python ParallelImport.py --workers 8 --batch-size 10000 --mode copy --key hash
+  python ParallelImport.py --mode upsert --restart
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import psycopg2
+
+from ImportingData import (
+    DEFAULT_BATCH_SIZE, IMPORT_MODES, KEY_STRATEGIES, create_database, create_tables,
+    ensure_employeeid_key, load_range, pooled_connection, resolve_dataset, resume_ranges, start_ranges,
+    verify_import
+)
+
+# (filename, table) pairs loaded by default - same as ImportingData.py
+DEFAULT_JOBS = [
+    ('employee_performance_10000.csv', 'dbms'),
+    ('employee_performance_100000__1_.csv', 'dbms01'),
+    ('employee_performance_500000.csv', 'dbms02'),
+]
+
+
+def plan_shards(filename, shard_count):
+    """Split a CSV into at most shard_count (start, end) byte ranges.
+
+    Every range starts at the beginning of a line and ends just after a
+    newline, so no row is split between two shards. The header line is
+    returned separately and is never part of a shard.
+    """
+    size = os.path.getsize(filename)
+
+    with open(filename, 'rb') as f:
+        header_line = f.readline()
+        data_start = f.tell()
+        header = next(csv.reader([header_line.decode('utf-8-sig')]))
+
+        boundaries = [data_start]
+        span = max(1, (size - data_start) // shard_count)
+        for i in range(1, shard_count):
+            pos = data_start + i * span
+            if pos >= size:
+                break
+            # Move forward to the start of the next line
+            f.seek(pos - 1)
+            f.readline()
+            pos = f.tell()
+            if pos > boundaries[-1] and pos < size:
+                boundaries.append(pos)
+        boundaries.append(size)
+
+    shards = [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+    return header, [s for s in shards if s[1] > s[0]]
+
+
+def load_shard(task):
+    """Worker: load one shard through its own connection, return its stats"""
+    shard_id, filename, table_name, header, byte_range, mode, batch_size = task
+    started = time.perf_counter()
+
+    # The worker process keeps its pooled connection between shards
+    with pooled_connection() as conn:
+        count = load_range(conn, filename, table_name, byte_range, mode, batch_size, header)
+
+    return {
+        'shard': shard_id,
+        'table': table_name,
+        'rows': count,
+        'bytes': byte_range[2] - byte_range[1],
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def parallel_import(jobs, workers, mode='copy', batch_size=DEFAULT_BATCH_SIZE, shards_per_worker=4,
+                    restart=False):
+    """Load every (filename, table) job concurrently and print a progress report"""
+    tasks = []
+    for filename, table_name in jobs:
+        path = resolve_dataset(filename)
+        if not os.path.exists(path):
+            print(f"✗ Skipping {filename}: file not found")
+            continue
+        header, shards = plan_shards(path, workers * shards_per_worker)
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            try:
+                ranges = resume_ranges(cur, path, table_name, mode, restart)
+                if ranges is None:
+                    ranges = [(start, start, end, 0) for start, end in shards]
+                    print(f"  {os.path.basename(path)} -> {table_name}: {len(ranges)} shards")
+                elif not ranges:
+                    print(f"  {os.path.basename(path)} -> {table_name}: already up to date")
+                else:
+                    print(f"  {os.path.basename(path)} -> {table_name}: resuming {len(ranges)} shards")
+                start_ranges(cur, path, table_name, ranges)
+                if mode == 'upsert':
+                    ensure_employeeid_key(cur, table_name)
+                conn.commit()
+            except (ValueError, psycopg2.Error) as e:
+                # e.g. no unique employeeid index over duplicate rows in upsert mode
+                conn.rollback()
+                print(f"✗ Skipping {filename}: {e}")
+                continue
+            finally:
+                cur.close()
+
+        for byte_range in ranges:
+            tasks.append((len(tasks), path, table_name, header, byte_range, mode, batch_size))
+
+    total_bytes = sum(t[4][2] - t[4][1] for t in tasks)
+    done_bytes = 0
+    per_table = {}
+    failed = 0
+
+    print(f"\nLoading {len(tasks)} shards with {workers} workers ({mode}, batch size {batch_size:,})...")
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(load_shard, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"✗ Shard {task[0]} of {task[2]} failed: {e}")
+                continue
+
+            done_bytes += result['bytes']
+            stats = per_table.setdefault(result['table'], {'rows': 0, 'shards': 0})
+            stats['rows'] += result['rows']
+            stats['shards'] += 1
+
+            elapsed = time.perf_counter() - start
+            total_rows = sum(s['rows'] for s in per_table.values())
+            print(f"  [{done_bytes / total_bytes:6.1%}] shard {result['shard']:>3} "
+                  f"({result['table']}): {result['rows']:>8,} rows in {result['seconds']:.2f}s | "
+                  f"total {total_rows:,} rows, {total_rows / elapsed:,.0f} rows/sec")
+
+    elapsed = time.perf_counter() - start
+    total_rows = sum(s['rows'] for s in per_table.values())
+
+    print("\n" + "=" * 60)
+    print("PARALLEL IMPORT SUMMARY")
+    print("=" * 60)
+    for table_name, stats in per_table.items():
+        print(f"  {table_name}: {stats['rows']:,} rows from {stats['shards']} shards")
+    print(f"\n  Workers:    {workers}")
+    print(f"  Rows:       {total_rows:,}")
+    print(f"  Time:       {elapsed:.2f}s")
+    print(f"  Throughput: {total_rows / elapsed if elapsed > 0 else 0:,.0f} rows/sec")
+    if failed:
+        print(f"  ✗ Failed shards: {failed}")
+
+    return total_rows, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel sharded CSV import into CockroachDB")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--mode', choices=IMPORT_MODES, default='copy')
+    parser.add_argument('--shards-per-worker', type=int, default=4)
+    parser.add_argument('--key', choices=KEY_STRATEGIES, default='rowid',
+                        help="primary key strategy for new tables")
+    parser.add_argument('--restart', action='store_true',
+                        help="truncate the tables and ignore earlier checkpoints")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CockroachDB Parallel Data Import")
+    print("=" * 60)
+
+    print("\nStep 1: Creating database...")
+    create_database()
+
+    print("\nStep 2: Creating tables...")
+    create_tables(key=args.key)
+
+    print("\nStep 3: Planning shards...")
+    parallel_import(DEFAULT_JOBS, args.workers, args.mode, args.batch_size, args.shards_per_worker,
+                    args.restart)
+
+    print("\n" + "=" * 60)
+    print("Verifying import...")
+    print("=" * 60)
+    verify_import()
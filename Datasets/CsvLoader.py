@@ -0,0 +1,256 @@
+"""
+Single-pass typed CSV loader for the employee_performance files
+The importers used to build a csv.DictReader dict for every row and then
+try up to three spellings of each column name ('Age', ' Age', ...), about
+20 dict lookups and eight int() calls per row before any I/O. Here the
+header is mapped once and the rows are parsed a block of lines at a time
+by NumPy's C reader, into one typed array per column:
+
+  header_index(header)         positions of FIELDS in a header row (names
+                               compared with spaces and a BOM stripped)
+  read_columns(filename)       yield {column: array} per block of lines
+  read_blocks(filename)        the same with the byte offset after each
+                               block, for checkpointed imports
+  iter_rows(filename)          typed tuples in COLUMNS order, one by one
+  read_batches(filename, n)    lists of n typed tuples, ready for
+                               execute_values / COPY / insert_many
+  to_rows(columns)             the tuples of one block
+  to_documents(rows)           MongoDB documents (FIELDS as keys)
+  copy_buffer(rows)            CSV file object for COPY ... FROM STDIN
+  fingerprint(filename)        hash of the start of a file, to tell an
+                               appended file from a replaced one
+
+start / end byte offsets limit reading to one line-aligned shard (see
+CockroachDB/ParallelImport.py); pass the file's header along with them.
+
+The old per-row rules still hold: rows without an EmployeeID or Department,
+or with a value that is not an integer (or does not fit in 64 bits), are
+skipped, other empty numbers become 0 and an empty PromotionLast5Years
+becomes 'No'. As before, only an empty field counts as missing: a
+Department of spaces is kept as '' and a number of spaces skips the row.
+A block the fast reader rejects is parsed again line by line under the
+same rules.
+"""
+
+import csv
+import hashlib
+import io
+
+import numpy as np
+
+FIELDS = [
+    'EmployeeID', 'Age', 'Department', 'YearsExperience',
+    'PerformanceScore', 'MonthlySalary', 'TrainingHours', 'PromotionLast5Years'
+]
+
+# Table column names, in the same order as FIELDS
+COLUMNS = [field.lower() for field in FIELDS]
+
+REQUIRED_FIELDS = {'EmployeeID', 'Department'}
+STRING_FIELDS = {'Department', 'PromotionLast5Years'}
+
+DEFAULT_BLOCK_BYTES = 4 * 2 ** 20
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# Bytes hashed by fingerprint(); appending rows leaves them unchanged
+FINGERPRINT_BYTES = 64 * 1024
+
+# Width of the string columns on the fast path; a value filling it may have
+# been cut short, so its block is parsed again line by line
+STRING_WIDTH = 64
+
+
+def header_index(header):
+    """Position of every FIELDS column in `header`, None for a missing optional one"""
+    names = [name.replace('\ufeff', '').strip() for name in header]
+    index = []
+    for field in FIELDS:
+        if field in names:
+            index.append(names.index(field))
+        elif field in REQUIRED_FIELDS:
+            raise ValueError(f"CSV header has no {field} column: {header}")
+        else:
+            index.append(None)
+    return index
+
+
+def _blocks(f, end, block_bytes):
+    """Yield runs of whole lines from the current position up to byte `end`"""
+    carry = b''
+    while True:
+        size = block_bytes if end is None else min(block_bytes, end - f.tell())
+        data = f.read(size) if size > 0 else b''
+        if not data:
+            if carry.strip():
+                yield carry
+            return
+        data = carry + data
+        cut = data.rfind(b'\n') + 1
+        if cut == 0:
+            carry = data
+            continue
+        carry = data[cut:]
+        yield data[:cut]
+
+
+def parse_record(record, index):
+    """One csv.reader record -> typed tuple in COLUMNS order, or None to skip it"""
+    values = [record[i] if i is not None and i < len(record) else '' for i in index]
+    if not values[0] or not values[2]:
+        return None
+    try:
+        numbers = [int(values[i]) if values[i] else 0 for i in (0, 1, 3, 4, 5, 6)]
+    except ValueError:
+        return None
+    if not all(INT64_MIN <= n <= INT64_MAX for n in numbers):
+        return None
+    employee_id, age, years, score, salary, training = numbers
+    return (employee_id, age, values[2].strip(), years, score, salary, training,
+            values[7].strip() if values[7] else 'No')
+
+
+def _rows_to_columns(rows):
+    columns = {}
+    for i, column in enumerate(COLUMNS):
+        values = [row[i] for row in rows]
+        if FIELDS[i] in STRING_FIELDS:
+            columns[column] = np.array(values, dtype=str) if values else np.empty(0, dtype='U1')
+        else:
+            columns[column] = np.array(values, dtype=np.int64)
+    return columns
+
+
+def _parse_slow(block, index):
+    rows = [parse_record(record, index) for record in csv.reader(io.StringIO(block.decode('utf-8')))]
+    return _rows_to_columns([row for row in rows if row is not None])
+
+
+def _parse_fast(block, index):
+    present = [(field, column, i) for field, column, i in zip(FIELDS, COLUMNS, index) if i is not None]
+    dtype = np.dtype([(column, f'U{STRING_WIDTH}' if field in STRING_FIELDS else np.int64)
+                      for field, column, _ in present])
+    table = np.loadtxt(io.BytesIO(block), delimiter=',', quotechar='"', dtype=dtype,
+                       usecols=[i for _, _, i in present], ndmin=1, encoding='utf-8')
+
+    columns = {}
+    for field, column, _ in present:
+        values = table[column]
+        if field in STRING_FIELDS:
+            if len(values) and np.char.str_len(values).max() >= STRING_WIDTH:
+                raise ValueError(f"{field} value may be longer than {STRING_WIDTH} characters")
+        columns[column] = values
+
+    rows = len(table)
+    # Only an empty field is missing; one of spaces is kept, stripped
+    keep = columns['department'] != ''
+    columns['department'] = np.char.strip(columns['department'])
+    if index[7] is None:
+        columns['promotionlast5years'] = np.full(rows, 'No')
+    else:
+        promotion = columns['promotionlast5years']
+        columns['promotionlast5years'] = np.where(promotion == '', 'No', np.char.strip(promotion))
+    for column in COLUMNS:
+        if column not in columns:
+            columns[column] = np.zeros(rows, dtype=np.int64)
+
+    if not keep.all():
+        columns = {column: values[keep] for column, values in columns.items()}
+    for field, column in zip(FIELDS, COLUMNS):
+        values = columns[column]
+        if field in STRING_FIELDS and len(values):
+            # Shrink to the longest value
+            values = values.astype(f'U{max(1, int(np.char.str_len(values).max()))}')
+        columns[column] = np.ascontiguousarray(values)
+    return columns
+
+
+def parse_block(block, index):
+    """Parse whole CSV lines (bytes, no header) into {column: array}"""
+    if not block.strip():
+        return _rows_to_columns([])
+    try:
+        return _parse_fast(block, index)
+    except (ValueError, OverflowError):
+        # Blank or malformed values somewhere in the block
+        return _parse_slow(block, index)
+
+
+def read_header(filename):
+    """(header fields, byte offset of the first data line)"""
+    with open(filename, 'rb') as f:
+        line = f.readline()
+        return next(csv.reader([line.decode('utf-8-sig')])), f.tell()
+
+
+def read_blocks(filename, start=None, end=None, header=None, block_bytes=DEFAULT_BLOCK_BYTES):
+    """Yield ({column: array}, byte offset after the block) between start and end"""
+    if header is None or start is None:
+        file_header, data_start = read_header(filename)
+        header = header or file_header
+        start = data_start if start is None else start
+    index = header_index(header)
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        position = start
+        for block in _blocks(f, end, block_bytes):
+            position += len(block)
+            yield parse_block(block, index), position
+
+
+def read_columns(filename, start=None, end=None, header=None, block_bytes=DEFAULT_BLOCK_BYTES):
+    """Yield {column: array} for each block of lines between start and end"""
+    for columns, _ in read_blocks(filename, start, end, header, block_bytes):
+        yield columns
+
+
+def block_bytes_for(filename, rows):
+    """Block size holding about `rows` lines, from the line length at the start of the file"""
+    with open(filename, 'rb') as f:
+        f.readline()
+        sample = f.read(FINGERPRINT_BYTES)
+    lines = sample.count(b'\n')
+    line_bytes = len(sample) / lines if lines else 64
+    return max(1024, int(rows * line_bytes))
+
+
+def fingerprint(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read(FINGERPRINT_BYTES)).hexdigest()
+
+
+def to_rows(columns):
+    """Typed tuples in COLUMNS order from one block of columns"""
+    return list(zip(*(columns[column].tolist() for column in COLUMNS)))
+
+
+def to_documents(rows):
+    return [dict(zip(FIELDS, row)) for row in rows]
+
+
+def iter_rows(filename, start=None, end=None, header=None):
+    for columns in read_columns(filename, start, end, header):
+        yield from to_rows(columns)
+
+
+def read_batches(filename, batch_size, start=None, end=None, header=None):
+    """Yield lists of typed tuples, batch_size rows at a time"""
+    pending = []
+    for columns in read_columns(filename, start, end, header):
+        pending.extend(to_rows(columns))
+        taken = 0
+        while len(pending) - taken >= batch_size:
+            yield pending[taken:taken + batch_size]
+            taken += batch_size
+        pending = pending[taken:]
+    if pending:
+        yield pending
+
+
+def copy_buffer(rows):
+    """Render typed rows as an in-memory CSV file for COPY ... FROM STDIN"""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    return buf
@@ -0,0 +1,207 @@
+"""
+Synthetic employee_performance dataset generator
+Produces the same EmployeeID,Age,Department,...,PromotionLast5Years schema as
+the shipped 10K / 100K files, for any number of rows (500K, 1M, 10M, 50M...).
+
+Value distributions match the shipped files, where every column is an
+independent uniform draw:
+  Age                 21 - 59
+  Department          Finance, HR, IT, Marketing, Operations
+  YearsExperience     0 - 34
+  PerformanceScore    1 - 5
+  MonthlySalary       3000 - 14999
+  TrainingHours       0 - 119
+  PromotionLast5Years Yes / No
+
+Rows are generated in NumPy chunks from a fixed seed, so memory use stays
+constant no matter how many rows are written, and the same seed and chunk
+size always give the same file.
+
+An existing file is never replaced without --force, so generating 10000
+or 100000 rows cannot overwrite the shipped originals of that size.
+
+Usage:
+  python GenerateDataset.py 500000 1000000 10000000
+  python GenerateDataset.py 50000000 --format npy --chunk-size 2000000
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+DATASET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HEADER = ('EmployeeID,Age,Department,YearsExperience,PerformanceScore,'
+          'MonthlySalary,TrainingHours,PromotionLast5Years')
+
+DEPARTMENTS = ['Finance', 'HR', 'IT', 'Marketing', 'Operations']
+PROMOTION = ['No', 'Yes']
+
+# column -> (low, high) inclusive, matching the shipped files
+INT_RANGES = {
+    'Age': (21, 59),
+    'YearsExperience': (0, 34),
+    'PerformanceScore': (1, 5),
+    'MonthlySalary': (3000, 14999),
+    'TrainingHours': (0, 119),
+}
+
+# column order and storage type for the columnar (.npy) format
+COLUMN_DTYPES = [
+    ('EmployeeID', np.int64),
+    ('Age', np.int8),
+    ('Department', np.uint8),
+    ('YearsExperience', np.int8),
+    ('PerformanceScore', np.int8),
+    ('MonthlySalary', np.int16),
+    ('TrainingHours', np.int8),
+    ('PromotionLast5Years', np.uint8),
+]
+
+DEFAULT_SEED = 326
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def generate_chunk(rng, first_id, rows):
+    """Return one chunk of the dataset as a dict of NumPy columns.
+
+    Department and PromotionLast5Years are returned as integer codes into
+    DEPARTMENTS and PROMOTION.
+    """
+    chunk = {'EmployeeID': np.arange(first_id, first_id + rows, dtype=np.int64)}
+    chunk['Age'] = rng.integers(*INT_RANGES['Age'], size=rows, endpoint=True)
+    chunk['Department'] = rng.integers(0, len(DEPARTMENTS), size=rows)
+    for name in ('YearsExperience', 'PerformanceScore', 'MonthlySalary', 'TrainingHours'):
+        chunk[name] = rng.integers(*INT_RANGES[name], size=rows, endpoint=True)
+    chunk['PromotionLast5Years'] = rng.integers(0, len(PROMOTION), size=rows)
+    return chunk
+
+
+def generate_chunks(rows, seed=DEFAULT_SEED, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (first_id, chunk) pairs covering `rows` rows"""
+    rng = np.random.default_rng(seed)
+    first_id = 1
+    while first_id <= rows:
+        size = min(chunk_size, rows - first_id + 1)
+        yield first_id, generate_chunk(rng, first_id, size)
+        first_id += size
+
+
+def _lookup_tables():
+    """Pre-rendered ',value' strings for every low-cardinality column.
+
+    Indexing these with a whole column turns formatting into array lookups
+    plus one string concatenation per column, instead of a Python loop per row.
+    """
+    tables = []
+    for name, _ in COLUMN_DTYPES[1:]:
+        if name == 'Department':
+            values = DEPARTMENTS
+            offset = 0
+        elif name == 'PromotionLast5Years':
+            values = PROMOTION
+            offset = 0
+        else:
+            low, high = INT_RANGES[name]
+            values = [str(v) for v in range(low, high + 1)]
+            offset = low
+        suffix = '\n' if name == 'PromotionLast5Years' else ''
+        tables.append((name, offset, np.array([',' + v + suffix for v in values], dtype=object)))
+    return tables
+
+
+def format_csv_chunk(chunk, tables):
+    """Render one chunk as CSV text"""
+    lines = chunk['EmployeeID'].astype(str).astype(object)
+    for name, offset, table in tables:
+        lines = lines + table[chunk[name] - offset]
+    return ''.join(lines.tolist())
+
+
+def write_csv(path, rows, seed=DEFAULT_SEED, chunk_size=DEFAULT_CHUNK_SIZE):
+    tables = _lookup_tables()
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(HEADER + '\n')
+        for first_id, chunk in generate_chunks(rows, seed, chunk_size):
+            f.write(format_csv_chunk(chunk, tables))
+            print(f"  {first_id + len(chunk['EmployeeID']) - 1:,} / {rows:,} rows written...")
+
+
+def write_npy(path, rows, seed=DEFAULT_SEED, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write one memory-mapped .npy file per column plus a schema.json"""
+    os.makedirs(path, exist_ok=True)
+    columns = {
+        name: np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"),
+                                        mode='w+', dtype=dtype, shape=(rows,))
+        for name, dtype in COLUMN_DTYPES
+    }
+
+    for first_id, chunk in generate_chunks(rows, seed, chunk_size):
+        start = first_id - 1
+        end = start + len(chunk['EmployeeID'])
+        for name, column in columns.items():
+            column[start:end] = chunk[name]
+        print(f"  {end:,} / {rows:,} rows written...")
+
+    for column in columns.values():
+        column.flush()
+
+    with open(os.path.join(path, 'schema.json'), 'w') as f:
+        json.dump({
+            'rows': rows,
+            'seed': seed,
+            'columns': [name for name, _ in COLUMN_DTYPES],
+            'categories': {'Department': DEPARTMENTS, 'PromotionLast5Years': PROMOTION},
+        }, f, indent=2)
+
+
+def dataset_path(rows, fmt, directory=DATASET_DIR):
+    suffix = 'csv' if fmt == 'csv' else 'npy'
+    return os.path.join(directory, f"employee_performance_{rows}.{suffix}")
+
+
+def generate(rows, fmt='csv', seed=DEFAULT_SEED, chunk_size=DEFAULT_CHUNK_SIZE, directory=DATASET_DIR,
+             force=False):
+    """Generate one dataset and return its path.
+
+    Raises FileExistsError when the file is already there, unless force=True.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = dataset_path(rows, fmt, directory)
+    if os.path.exists(path) and not force:
+        raise FileExistsError(f"{path} already exists; use --force to overwrite it")
+    print(f"\nGenerating {rows:,} rows -> {path}")
+    start = time.perf_counter()
+
+    if fmt == 'csv':
+        write_csv(path, rows, seed, chunk_size)
+    else:
+        write_npy(path, rows, seed, chunk_size)
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ {rows:,} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic employee_performance datasets")
+    parser.add_argument('rows', type=int, nargs='+', help="row counts to generate")
+    parser.add_argument('--format', choices=['csv', 'npy'], default='csv')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output-dir', default=DATASET_DIR)
+    parser.add_argument('--force', action='store_true', help="overwrite files that already exist")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Employee Performance Dataset Generator")
+    print("=" * 60)
+
+    for rows in args.rows:
+        try:
+            generate(rows, args.format, args.seed, args.chunk_size, args.output_dir, args.force)
+        except FileExistsError as e:
+            print(f"✗ Skipping {rows:,} rows: {e}")
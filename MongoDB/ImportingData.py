@@ -0,0 +1,301 @@
+"""
+SIMPLE MongoDB Data Import
+Streams the Datasets/*.csv files into the DBMS / DBMS01 / DBMS02 collections
+so MongoDB runs are reproducible instead of being filled through Compass.
+
+Rows are converted to typed documents (ints stay ints) and written with
+insert_many(ordered=False) in batches, with several batches in flight at once.
+
+Imports are checkpointed in the import_checkpoints collection: the byte
+offset up to which every batch is confirmed, and how far batches were sent.
+Running the import again continues from the offset, after deleting the
+documents of batches that were sent but never confirmed, so nothing is
+loaded twice; a finished file is skipped and a file that has grown only
+loads the appended rows. --drop starts a collection over.
+
+--upsert writes every document as an upsert keyed on EmployeeID (the _id
+for --id employeeid / hashed, otherwise an index on EmployeeID is added),
+which also allows reloading a changed file or a collection that was filled
+without a checkpoint. Behind a mongos that needs the _id to be the
+EmployeeID.
+
+_id strategies (--id):
+  objectid    - default ObjectIds, always increasing (original behaviour)
+  employeeid  - _id is the EmployeeID; range-sharded on _id behind a mongos
+  hashed      - _id is the EmployeeID; hash-sharded on _id behind a mongos
+  uuid        - random UUID _id
+
+On a standalone mongod or replica set the shard key part is skipped.
+
+Usage:
+  python ImportingData.py --batch-size 5000 --workers 4 --drop --id hashed
+  python ImportingData.py --upsert --id employeeid
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from bson import Binary
+from pymongo import MongoClient, UpdateOne
+
+MONGO_URL = "mongodb://localhost:27017/"
+DATABASE_NAME = "LatencyScalabilityTest"
+
+# Folder holding the shipped CSV files (one level up from this script)
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Datasets')
+
+# Typed single-pass CSV reading shared with CockroachDB/ImportingData.py
+sys.path.insert(0, DATASET_DIR)
+import CsvLoader  # noqa: E402
+
+COLLECTIONS = ['DBMS', 'DBMS01', 'DBMS02']
+
+# Same files as CockroachDB/ImportingData.py so both engines hold the same data
+DEFAULT_JOBS = [
+    ('employee_performance_10000.csv', 'DBMS'),
+    ('employee_performance_100000__1_.csv', 'DBMS01'),
+    ('employee_performance_500000.csv', 'DBMS02'),
+]
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_WORKERS = 4
+
+ID_STRATEGIES = ['objectid', 'employeeid', 'hashed', 'uuid']
+
+CHECKPOINTS = 'import_checkpoints'
+
+
+def resolve_dataset(filename):
+    """Return the path to a CSV, looking in the Datasets folder if needed"""
+    if os.path.exists(filename):
+        return filename
+    return os.path.join(DATASET_DIR, os.path.basename(filename))
+
+
+def assign_id(doc, id_strategy):
+    """Set the document's _id for the chosen strategy (objectid leaves it to the driver)"""
+    if id_strategy in ('employeeid', 'hashed'):
+        doc['_id'] = doc['EmployeeID']
+    elif id_strategy == 'uuid':
+        doc['_id'] = Binary.from_uuid(uuid.uuid4())
+    return doc
+
+
+def shard_collection(client, collection_name, id_strategy):
+    """Shard the collection on _id when connected to a mongos; return True if it was sharded now.
+
+    A collection that is already sharded is left alone; raises ValueError
+    when its shard key does not match the _id strategy.
+    """
+    if id_strategy not in ('employeeid', 'hashed', 'uuid'):
+        return False
+    if client.admin.command('hello').get('msg') != 'isdbgrid':
+        return False
+    key = {'_id': 'hashed'} if id_strategy == 'hashed' else {'_id': 1}
+    namespace = f"{DATABASE_NAME}.{collection_name}"
+    entry = client['config']['collections'].find_one({'_id': namespace})
+    if entry is not None and not entry.get('dropped'):
+        if dict(entry['key']) != key:
+            raise ValueError(f"{collection_name} is already sharded on {dict(entry['key'])}, "
+                             f"not {key}; use --drop to switch --id")
+        return False
+    client.admin.command('enableSharding', DATABASE_NAME)
+    client.admin.command('shardCollection', namespace, key=key)
+    return True
+
+
+def read_batches(filename, batch_size, id_strategy='objectid', start=None):
+    """Yield (typed documents, byte offset after them), about batch_size documents at a time"""
+    block_bytes = CsvLoader.block_bytes_for(filename, batch_size)
+    for columns, position in CsvLoader.read_blocks(filename, start, block_bytes=block_bytes):
+        docs = CsvLoader.to_documents(CsvLoader.to_rows(columns))
+        yield [assign_id(doc, id_strategy) for doc in docs], position
+
+
+def insert_batch(collection, batch):
+    """Insert one batch and return (rows, seconds)"""
+    start = time.perf_counter()
+    if not batch:
+        return 0, 0.0
+    result = collection.insert_many(batch, ordered=False)
+    return len(result.inserted_ids), time.perf_counter() - start
+
+
+def upsert_batch(collection, batch):
+    """Upsert one batch keyed on EmployeeID and return (rows, seconds)"""
+    start = time.perf_counter()
+    if not batch:
+        return 0, 0.0
+    requests = []
+    for doc in batch:
+        doc = dict(doc)
+        _id = doc.pop('_id', None)
+        if _id == doc['EmployeeID']:
+            requests.append(UpdateOne({'_id': _id}, {'$set': doc}, upsert=True))
+        else:
+            update = {'$set': doc}
+            if _id is not None:
+                update['$setOnInsert'] = {'_id': _id}
+            requests.append(UpdateOne({'EmployeeID': doc['EmployeeID']}, update, upsert=True))
+    result = collection.bulk_write(requests, ordered=False)
+    return result.upserted_count + result.matched_count, time.perf_counter() - start
+
+
+def checkpoint_id(filename, collection_name):
+    """_id of the import_checkpoints document for one file and collection"""
+    return f"{os.path.basename(filename)}:{collection_name}"
+
+
+def resume_point(db, filename, collection_name, upsert=False):
+    """(byte offset, documents loaded) to continue filename from.
+
+    Documents of batches sent after the last confirmed one may or may not
+    have been written, so they are deleted first (upserts just overwrite
+    them). Raises ValueError when loading again would duplicate documents.
+    """
+    name = os.path.basename(filename)
+    header, data_start = CsvLoader.read_header(filename)
+    checkpoints = db[CHECKPOINTS]
+    checkpoint = checkpoints.find_one({'_id': checkpoint_id(filename, collection_name)})
+
+    if checkpoint is None:
+        if not upsert and db[collection_name].find_one({}, {'_id': 1}) is not None:
+            raise ValueError(f"{collection_name} already holds documents but has no checkpoint "
+                             f"for {name}; use --upsert or --drop")
+        return data_start, 0
+
+    if (checkpoint['fingerprint'] != CsvLoader.fingerprint(filename)
+            or os.path.getsize(filename) < checkpoint['offset']):
+        if not upsert:
+            raise ValueError(f"{name} changed since it was loaded into {collection_name}; "
+                             f"use --upsert or --drop")
+        checkpoints.delete_one({'_id': checkpoint['_id']})
+        return data_start, 0
+
+    offset = checkpoint['offset']
+    submitted = checkpoint.get('submitted', offset)
+    if submitted > offset and not upsert:
+        ids = [row[0] for row in CsvLoader.iter_rows(filename, offset, submitted, header)]
+        result = db[collection_name].delete_many({'EmployeeID': {'$in': ids}})
+        print(f"  removed {result.deleted_count:,} documents of unconfirmed batches")
+    return offset, checkpoint['rows']
+
+
+def import_csv(client, filename, collection_name, batch_size=DEFAULT_BATCH_SIZE,
+               workers=DEFAULT_WORKERS, drop=False, id_strategy='objectid', upsert=False):
+    """Import one CSV file with up to `workers` batches in flight, resuming from its checkpoint"""
+    if id_strategy not in ID_STRATEGIES:
+        raise ValueError(f"Unknown _id strategy '{id_strategy}', expected one of {ID_STRATEGIES}")
+
+    filename = resolve_dataset(filename)
+    print(f"\nImporting {filename} into {collection_name} "
+          f"(batch size {batch_size:,}, {workers} concurrent batches, _id: {id_strategy}"
+          f"{', upsert' if upsert else ''})...")
+
+    db = client[DATABASE_NAME]
+    collection = db[collection_name]
+    checkpoints = db[CHECKPOINTS]
+    key = {'_id': checkpoint_id(filename, collection_name)}
+    if drop:
+        collection.drop()
+        checkpoints.delete_one(key)
+    write = upsert_batch if upsert else insert_batch
+
+    count = 0
+    batches = 0
+    start = time.perf_counter()
+
+    try:
+        if shard_collection(client, collection_name, id_strategy):
+            print(f"  sharded {collection_name} on _id ({id_strategy})")
+        if upsert and id_strategy not in ('employeeid', 'hashed'):
+            collection.create_index('EmployeeID')
+        offset, loaded = resume_point(db, filename, collection_name, upsert)
+        if offset >= os.path.getsize(filename):
+            print(f"✓ {collection_name}: already up to date with {os.path.basename(filename)}")
+            return 0
+        if loaded:
+            print(f"  resuming after {loaded:,} documents (byte {offset:,})")
+        file_fingerprint = CsvLoader.fingerprint(filename)
+
+        def confirm(future, position):
+            """Wait for the oldest batch and move the checkpoint past it"""
+            nonlocal count, batches
+            rows, seconds = future.result()
+            count += rows
+            batches += 1
+            checkpoints.update_one(key, {'$set': {'offset': position, 'rows': loaded + count,
+                                                  'updated_at': datetime.now(timezone.utc)}})
+            if rows:
+                print(f"  batch {batches:>4}: {rows:>7,} docs in {seconds:.3f}s "
+                      f"({rows / seconds:>10,.0f} docs/sec), {count:,} total")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Oldest first, so the checkpoint only ever covers confirmed batches
+            in_flight = deque()
+            for batch, position in read_batches(filename, batch_size, id_strategy, offset):
+                # Keep at most 2x workers batches in memory at a time
+                if len(in_flight) >= workers * 2:
+                    confirm(*in_flight.popleft())
+                checkpoints.update_one(key, {'$set': {'submitted': position, 'fingerprint': file_fingerprint},
+                                             '$setOnInsert': {'offset': offset, 'rows': loaded}}, upsert=True)
+                in_flight.append((pool.submit(write, collection, batch), position))
+            while in_flight:
+                confirm(*in_flight.popleft())
+
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0
+        print(f"✓ {collection_name}: Total {count:,} documents imported in {elapsed:.2f}s "
+              f"({rate:,.0f} docs/sec)")
+
+    except Exception as e:
+        print(f"✗ Error importing {filename}: {e}")
+        print("  Run again to resume after the last confirmed batch")
+
+    return count
+
+
+def verify_import(client, collections=COLLECTIONS):
+    db = client[DATABASE_NAME]
+    for name in collections:
+        print(f"  {name}: {db[name].count_documents({}):,} documents")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk CSV import into MongoDB")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--drop', action='store_true',
+                        help="drop each collection (and its checkpoint) before loading it")
+    parser.add_argument('--upsert', action='store_true',
+                        help="upsert documents keyed on EmployeeID instead of inserting them")
+    parser.add_argument('--id', choices=ID_STRATEGIES, default='objectid',
+                        help="_id strategy for the loaded documents")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("MongoDB Data Import")
+    print("=" * 60)
+
+    client = MongoClient(MONGO_URL, maxPoolSize=max(100, args.workers))
+
+    for filename, collection_name in DEFAULT_JOBS:
+        import_csv(client, filename, collection_name, args.batch_size, args.workers, args.drop, args.id,
+                   args.upsert)
+
+    print("\n" + "=" * 60)
+    print("Verifying import...")
+    print("=" * 60)
+    verify_import(client)
+
+    client.close()
+
+    print("\n" + "=" * 60)
+    print("✓ ALL DONE! Data imported successfully!")
+    print("=" * 60)